@@ -0,0 +1,388 @@
+"""Differential correctness and cost harness for every search engine in this project.
+
+Enumerates every legal, unfinished position with either mark starting and checks that the library's
+minimax, pruned_minimax, score_moves and pruned_find_best_move, the standalone
+pruned_minimax.pruned_minimax and find_best_move, and the barebones GameTreeNode.find_best_move
+agree on the game value and only ever pick a move from the optimal move set.
+The pvs and mtdf engines are the null-window searches, principal variation search and MTD(f).
+The mate_distance and gametree_mate engines run the same searches with mate-distance scores, and
+must pick one of the moves that wins fastest or loses slowest. The tactics and gametree_tactics
+engines add the threat scan pre-pass, and the summary reports the nodes each variant saves. The nodes visited
+and the time taken by each engine are recorded for every position.
+
+The reference scores come from an independent solver memoized on the base-3 grid index, and
+positions are taken from one game graph per implementation: every position is built once and
+the cached moves of each one lead to the single node of each child, so the timed searches walk
+nodes that already exist instead of building a tree of their own under every position.
+A full run takes about ten seconds. `--quick` checks the positions with X starting, which only
+swap the marks of those with O starting, and leaves out minimax, which visits the full tree
+under every position, for a check in about four.
+
+Run it from this directory with the library installed: `python3 differential.py`
+"""
+
+import argparse
+import contextlib
+import csv
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import gametree
+from tic_tac_toe.logic import minimax as minimax_module
+from tic_tac_toe.logic import mtdf as mtdf_module
+from tic_tac_toe.logic import pruned_minimax as pruned_module
+from tic_tac_toe.logic import pvs as pvs_module
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.models import GameState, Grid, Mark, Move
+
+ENGINES = (
+    "minimax",
+    "pruned_minimax",
+    "score_moves",
+    "pruned_find_best_move",
+    "standalone_pruned_minimax",
+    "standalone_find_best_move",
+    "mate_distance",
+    "tactics",
+    "pvs",
+    "mtdf",
+    "gametree",
+    "gametree_mate",
+    "gametree_tactics",
+)
+
+# the engine each variant is compared with in the node reduction report
+BASELINES = {
+    "score_moves": "pruned_minimax",
+    "standalone_pruned_minimax": "pruned_minimax",
+    "standalone_find_best_move": "pruned_find_best_move",
+    "mate_distance": "pruned_find_best_move",
+    "tactics": "pruned_find_best_move",
+    "pvs": "pruned_find_best_move",
+    "mtdf": "pruned_find_best_move",
+    "gametree_mate": "gametree",
+    "gametree_tactics": "gametree",
+}
+
+# the engines --quick leaves out
+QUICK_SKIPS = ("minimax",)
+
+class Disagreement(Exception):
+    """Raised when an engine disagrees with the reference scores."""
+
+@dataclass
+class Cost:
+    nodes: int = 0
+    seconds: float = 0.0
+
+@dataclass
+class PositionReport:
+    cells: str
+    starting_mark: str
+    value: int
+    optimal_moves: list[int]
+    costs: dict[str, Cost] = field(default_factory=dict)
+
+class NodeCounter:
+    """Counts the calls of a recursive search function by wrapping it where it is looked up."""
+
+    def __init__(self, owner: object, name: str) -> None:
+        self.owner = owner
+        self.name = name
+        self.count = 0
+
+    @contextmanager
+    def counting(self):
+        original = getattr(self.owner, self.name)
+
+        def counted(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        setattr(self.owner, self.name, counted)
+        try:
+            yield self
+        finally:
+            setattr(self.owner, self.name, original)
+
+    def take(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+def legal_positions(starting_marks: str = "XO") -> list[tuple[GameState, gametree.GameTreeNode]]:
+    """Return every unfinished position reachable from the empty board with the given marks starting,
+    as a library GameState paired with the barebones GameTreeNode of the same grid and starting mark."""
+    states = {}
+    frontier = [GameState(Grid(), Mark(mark)) for mark in starting_marks]
+    while frontier:
+        game_state = frontier.pop()
+        key = (game_state.grid.cells, game_state.starting_mark.value)
+        if key not in states:
+            states[key] = game_state
+            frontier.extend(move.after_state for move in game_state.possible_moves)
+    # relink the cached moves to the one state of every child, FULL retention keeps them there
+    for game_state in states.values():
+        moves = [
+            Move(
+                move.mark,
+                move.cell_index,
+                game_state,
+                states[(move.after_state.grid.cells, move.after_state.starting_mark.value)],
+            )
+            for move in game_state.possible_moves
+        ]
+        object.__setattr__(game_state, "_moves", moves)
+
+    nodes = {}
+    frontier = [gametree.GameTreeNode(gametree.Grid(), gametree.Mark(mark)) for mark in starting_marks]
+    while frontier:
+        node = frontier.pop()
+        key = (node.game_state.cells, node.player_to_move.value)
+        if key not in nodes:
+            nodes[key] = node
+            frontier.extend(move.after_state for move in node.possible_moves())
+    for node in nodes.values():
+        node.children = [
+            gametree.Move(
+                move.mark,
+                move.cell_index,
+                node,
+                nodes[(move.after_state.game_state.cells, move.after_state.player_to_move.value)],
+            )
+            for move in node.possible_moves()
+        ]
+
+    keys = sorted(
+        (key for key, game_state in states.items() if not game_state.game_over),
+        key=lambda key: (key[1], -key[0].count(" "), key[0]),
+    )
+    return [(states[key], nodes[key]) for key in keys]
+
+@lru_cache(maxsize=None)
+def solve(index: int, mover: int, mate_distance: bool = False) -> int:
+    """Return the game value of an encoded grid for the side to move, by memoized negamax."""
+    lookup = tables.tables()
+    if winner := lookup.winner[index]:
+        score = tables.CELLS - lookup.x_count[index] - lookup.o_count[index] + 1 if mate_distance else 1
+        return score if winner == mover else -score
+    if lookup.tie[index]:
+        return 0
+    other = tables.NAUGHT if mover == tables.CROSS else tables.CROSS
+    return max(
+        -solve(tables.child_index(index, cell, mover), other, mate_distance)
+        for cell in tables.empty_cells(index)
+    )
+
+def reference_scores(game_state: GameState, mate_distance: bool = False) -> list[int]:
+    mover = tables.mark_digit(game_state.current_mark)
+    other = tables.NAUGHT if mover == tables.CROSS else tables.CROSS
+    return [
+        -solve(tables.child_index(game_state.grid.index, cell, mover), other, mate_distance)
+        for cell in tables.empty_cells(game_state.grid.index)
+    ]
+
+def check_position(
+    game_state: GameState, node: gametree.GameTreeNode, engines: tuple[str, ...], counters: dict
+) -> PositionReport:
+    maximizer = game_state.current_mark
+    moves = game_state.possible_moves
+
+    scores = reference_scores(game_state)
+    value = max(scores)
+    optimal = [move.cell_index for move, score in zip(moves, scores) if score == value]
+    report = PositionReport(game_state.grid.cells, game_state.starting_mark.value, value, optimal)
+
+    mate_scores = reference_scores(game_state, mate_distance=True)
+    mate_value = max(mate_scores)
+    fastest = [move.cell_index for move, score in zip(moves, mate_scores) if score == mate_value]
+
+    if "minimax" in engines:
+        start = time.perf_counter()
+        minimax_scores = [minimax_module.minimax(move, maximizer) for move in moves]
+        report.costs["minimax"] = Cost(counters["minimax"].take(), time.perf_counter() - start)
+        if minimax_scores != scores:
+            raise Disagreement(f"{game_state.grid.cells!r}: minimax scored {minimax_scores}, expected {scores}")
+
+    if "pruned_minimax" in engines:
+        start = time.perf_counter()
+        pruned_scores = [minimax_module.pruned_minimax(move, maximizer) for move in moves]
+        report.costs["pruned_minimax"] = Cost(counters["pruned_minimax"].take(), time.perf_counter() - start)
+        if pruned_scores != scores:
+            raise Disagreement(f"{game_state.grid.cells!r}: pruned_minimax scored {pruned_scores}, expected {scores}")
+
+    if "score_moves" in engines:
+        start = time.perf_counter()
+        scored_moves = minimax_module.score_moves(game_state)
+        report.costs["score_moves"] = Cost(counters["table_minimax"].take(), time.perf_counter() - start)
+        if [score for _, score in scored_moves] != scores:
+            raise Disagreement(f"{game_state.grid.cells!r}: score_moves scored {scored_moves}, expected {scores}")
+
+    if "pruned_find_best_move" in engines:
+        start = time.perf_counter()
+        best_move = minimax_module.pruned_find_best_move(game_state)
+        report.costs["pruned_find_best_move"] = Cost(counters["pruned_minimax"].take(), time.perf_counter() - start)
+        if best_move.cell_index not in optimal:
+            raise Disagreement(f"{game_state.grid.cells!r}: pruned_find_best_move chose {best_move.cell_index}, optimal are {optimal}")
+
+    if "standalone_pruned_minimax" in engines:
+        start = time.perf_counter()
+        standalone_scores = [pruned_module.pruned_minimax(move, maximizer) for move in moves]
+        report.costs["standalone_pruned_minimax"] = Cost(counters["standalone"].take(), time.perf_counter() - start)
+        if standalone_scores != scores:
+            raise Disagreement(
+                f"{game_state.grid.cells!r}: pruned_minimax.pruned_minimax scored {standalone_scores}, expected {scores}"
+            )
+
+    if "standalone_find_best_move" in engines:
+        start = time.perf_counter()
+        best_move = pruned_module.find_best_move(game_state)
+        report.costs["standalone_find_best_move"] = Cost(counters["standalone"].take(), time.perf_counter() - start)
+        if best_move.cell_index not in optimal:
+            raise Disagreement(
+                f"{game_state.grid.cells!r}: pruned_minimax.find_best_move chose {best_move.cell_index}, optimal are {optimal}"
+            )
+
+    if "mate_distance" in engines:
+        start = time.perf_counter()
+        best_move = minimax_module.pruned_find_best_move(game_state, mate_distance=True)
+        report.costs["mate_distance"] = Cost(counters["pruned_minimax"].take(), time.perf_counter() - start)
+        if best_move.cell_index not in fastest:
+            raise Disagreement(f"{game_state.grid.cells!r}: mate distance search chose {best_move.cell_index}, fastest are {fastest}")
+
+    if "tactics" in engines:
+        start = time.perf_counter()
+        best_move = minimax_module.pruned_find_best_move(game_state, tactics=True)
+        report.costs["tactics"] = Cost(counters["pruned_minimax"].take(), time.perf_counter() - start)
+        if best_move.cell_index not in optimal:
+            raise Disagreement(f"{game_state.grid.cells!r}: tactical search chose {best_move.cell_index}, optimal are {optimal}")
+
+    if "pvs" in engines:
+        start = time.perf_counter()
+        best_move = pvs_module.find_best_move(game_state)
+        report.costs["pvs"] = Cost(counters["pvs"].take(), time.perf_counter() - start)
+        if best_move.cell_index not in optimal:
+            raise Disagreement(f"{game_state.grid.cells!r}: principal variation search chose {best_move.cell_index}, optimal are {optimal}")
+
+    if "mtdf" in engines:
+        start = time.perf_counter()
+        # every position starts from an empty memory, like the other engines start from nothing
+        search = mtdf_module.MTDFSearch()
+        best_move = search.find_best_move(game_state)
+        report.costs["mtdf"] = Cost(counters["mtdf"].take(), time.perf_counter() - start)
+        if best_move.cell_index not in optimal or search.memory[game_state].lower != value:
+            raise Disagreement(f"{game_state.grid.cells!r}: MTD(f) chose {best_move.cell_index}, optimal are {optimal}")
+
+    if "gametree" in engines:
+        start = time.perf_counter()
+        score, best_move = node.find_best_move(node, node.current_player())
+        report.costs["gametree"] = Cost(counters["gametree"].take(), time.perf_counter() - start)
+        if score != value or best_move.cell_index not in optimal:
+            raise Disagreement(
+                f"{game_state.grid.cells!r}: GameTreeNode.find_best_move chose {best_move.cell_index} "
+                f"scoring {score}, optimal are {optimal} scoring {value}"
+            )
+
+    if "gametree_mate" in engines:
+        start = time.perf_counter()
+        score, best_move = node.find_best_move(node, node.current_player(), mate_distance=True)
+        report.costs["gametree_mate"] = Cost(counters["gametree"].take(), time.perf_counter() - start)
+        if score != mate_value or best_move.cell_index not in fastest:
+            raise Disagreement(
+                f"{game_state.grid.cells!r}: GameTreeNode.find_best_move with mate distance chose "
+                f"{best_move.cell_index} scoring {score}, fastest are {fastest} scoring {mate_value}"
+            )
+
+    if "gametree_tactics" in engines:
+        start = time.perf_counter()
+        score, best_move = node.find_best_move(node, node.current_player(), tactics=True)
+        report.costs["gametree_tactics"] = Cost(counters["gametree"].take(), time.perf_counter() - start)
+        if score != value or best_move.cell_index not in optimal:
+            raise Disagreement(
+                f"{game_state.grid.cells!r}: GameTreeNode.find_best_move with tactics chose "
+                f"{best_move.cell_index} scoring {score}, optimal are {optimal} scoring {value}"
+            )
+
+    return report
+
+def run(engines: tuple[str, ...], starting_marks: str = "XO") -> list[PositionReport]:
+    counters = {
+        "minimax": NodeCounter(minimax_module, "minimax"),
+        "pruned_minimax": NodeCounter(minimax_module, "pruned_minimax"),
+        "standalone": NodeCounter(pruned_module, "pruned_minimax"),
+        "table_minimax": NodeCounter(minimax_module, "table_minimax"),
+        "pvs": NodeCounter(pvs_module, "principal_variation"),
+        "mtdf": NodeCounter(mtdf_module, "alpha_beta_with_memory"),
+        "gametree": NodeCounter(gametree.GameTreeNode, "find_best_move"),
+    }
+    with contextlib.ExitStack() as stack:
+        for counter in counters.values():
+            stack.enter_context(counter.counting())
+        positions = legal_positions(starting_marks)
+        return [check_position(game_state, node, engines, counters) for game_state, node in positions]
+
+def print_summary(reports: list[PositionReport], engines: tuple[str, ...], top: int) -> None:
+    print(f"{len(reports)} positions, all engines agree\n")
+    print(f"{'engine':<24}{'nodes':>12}{'mean':>10}{'max':>10}{'seconds':>10}  reduction")
+    totals = {
+        engine: sum(report.costs[engine].nodes for report in reports) for engine in engines
+    }
+    for engine in engines:
+        costs = [report.costs[engine] for report in reports]
+        nodes = totals[engine]
+        reduction = ""
+        if (baseline := BASELINES.get(engine)) in totals:
+            change = 1 - nodes / totals[baseline]
+            reduction = f"  {abs(change):.1%} {'fewer' if change >= 0 else 'more'} nodes than {baseline}"
+        print(
+            f"{engine:<24}{nodes:>12}{nodes / len(costs):>10.1f}"
+            f"{max(cost.nodes for cost in costs):>10}{sum(cost.seconds for cost in costs):>10.3f}"
+            f"{reduction}"
+        )
+    for engine in engines:
+        print(f"\nWorst {top} positions for {engine}:")
+        worst = sorted(reports, key=lambda report: report.costs[engine].nodes, reverse=True)[:top]
+        for report in worst:
+            cost = report.costs[engine]
+            print(f"  {report.cells!r} {report.starting_mark} starts  value {report.value:>2}  nodes {cost.nodes:>8}  {cost.seconds * 1000:>9.2f} ms")
+
+def write_csv(reports: list[PositionReport], engines: tuple[str, ...], path: str) -> None:
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["cells", "starting_mark", "value", "optimal_moves"] + [f"{engine}_{column}" for engine in engines for column in ("nodes", "seconds")])
+        for report in reports:
+            row = [report.cells, report.starting_mark, report.value, " ".join(map(str, report.optimal_moves))]
+            for engine in engines:
+                row += [report.costs[engine].nodes, f"{report.costs[engine].seconds:.6f}"]
+            writer.writerow(row)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="check the positions with X starting only, and leave out minimax, which takes most of a run",
+    )
+    parser.add_argument("--top", type=int, default=5, help="number of worst positions to list per engine")
+    parser.add_argument("--csv", dest="csv_path", help="write the per-position costs to this CSV file")
+    args = parser.parse_args()
+    engines = tuple(args.engines)
+    if args.quick:
+        engines = tuple(engine for engine in engines if engine not in QUICK_SKIPS)
+
+    start = time.perf_counter()
+    try:
+        reports = run(engines, "X" if args.quick else "XO")
+    except Disagreement as ex:
+        print(f"Engines disagree at {ex}", file=sys.stderr)
+        sys.exit(1)
+    print_summary(reports, engines, args.top)
+    if args.csv_path:
+        write_csv(reports, engines, args.csv_path)
+    print(f"\nChecked in {(time.perf_counter() - start):.3f} seconds.")
+
+if __name__ == "__main__":
+    main()
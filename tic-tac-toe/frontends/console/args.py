@@ -1,36 +1,79 @@
 import argparse
+import os
 from typing import NamedTuple
 
-from tic_tac_toe.game.players import Player, RandomComputerPlayer, MinimaxComputerPlayer, PrunedMinimaxComputerPlayer
+from tic_tac_toe.game.players import Player, ComputerPlayer, RandomComputerPlayer, MinimaxComputerPlayer, PrunedMinimaxComputerPlayer, PVSComputerPlayer, MTDFComputerPlayer, ThreadedComputerPlayer, LearnedComputerPlayer, TimedComputerPlayer, ConnectFourComputerPlayer, UltimateComputerPlayer
 from tic_tac_toe.logic.models import Mark
 
-from .players import ConsolePlayer
+from .players import ConsolePlayer, ConnectFourConsolePlayer, UltimateConsolePlayer
+from .profiling import PROFILERS
 
 PLAYER_CLASSES = {
     "human": ConsolePlayer,
     "random": RandomComputerPlayer,
     "minimax": MinimaxComputerPlayer,
     "pruned": PrunedMinimaxComputerPlayer,
+    "pvs": PVSComputerPlayer,
+    "mtdf": MTDFComputerPlayer,
+    "threaded": ThreadedComputerPlayer,
+    "learned": LearnedComputerPlayer,
+}
+
+CONNECT_FOUR_PLAYER_CLASSES = {
+    "human": ConnectFourConsolePlayer,
+    "random": RandomComputerPlayer,
+    "alphabeta": ConnectFourComputerPlayer,
+}
+
+ULTIMATE_PLAYER_CLASSES = {
+    "human": UltimateConsolePlayer,
+    "random": RandomComputerPlayer,
+    "alphabeta": UltimateComputerPlayer,
+}
+
+GAMES = {
+    "tic-tac-toe": (PLAYER_CLASSES, "minimax"),
+    "connect-four": (CONNECT_FOUR_PLAYER_CLASSES, "alphabeta"),
+    "ultimate": (ULTIMATE_PLAYER_CLASSES, "alphabeta"),
+}
+
+# command line options passed on to the players that take them
+PLAYER_OPTIONS = {
+    TimedComputerPlayer: ("time_budget",),
+    LearnedComputerPlayer: ("policy",),
+    ThreadedComputerPlayer: ("workers",),
 }
 
 class Args(NamedTuple):
     player1: Player
     player2: Player
     starting_mark: Mark
+    render: bool = True
+    profiler: str | None = None
+    profile_out: str | None = None
+    profile_top: int = 20
+    record_path: str | None = None
+    game: str = "tic-tac-toe"
+    redraw: bool = False
 
 def parse_args() -> Args:
     parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--game",
+        choices=GAMES,
+        default="tic-tac-toe",
+    )
     parser.add_argument(
         "-X",
         dest="player_x",
-        choices=PLAYER_CLASSES.keys(),
+        choices=PLAYER_CLASSES.keys() | CONNECT_FOUR_PLAYER_CLASSES.keys() | ULTIMATE_PLAYER_CLASSES.keys(),
         default="human",
     )
     parser.add_argument(
         "-O",
         dest="player_o",
-        choices=PLAYER_CLASSES.keys(),
-        default="minimax",
+        choices=PLAYER_CLASSES.keys() | CONNECT_FOUR_PLAYER_CLASSES.keys() | ULTIMATE_PLAYER_CLASSES.keys(),
+        help="defaults to minimax for tic-tac-toe and alphabeta for the other games",
     )
     parser.add_argument(
         "--starting",
@@ -39,12 +82,115 @@ def parse_args() -> Args:
         type=Mark,
         default="X",
     )
+    parser.add_argument(
+        "--delay",
+        dest="delay_seconds",
+        type=float,
+        default=None,
+        help="seconds computer players wait before moving",
+    )
+    parser.add_argument(
+        "--time-budget",
+        dest="time_budget",
+        type=float,
+        default=1.0,
+        help="seconds the alphabeta players of connect-four and ultimate search per move",
+    )
+    parser.add_argument(
+        "--threads",
+        dest="workers",
+        type=int,
+        default=4,
+        help="threads the threaded player searches with",
+    )
+    parser.add_argument(
+        "--policy",
+        default="policy.bin",
+        help="policy file of the learned player, as saved by: python3 -m console learn",
+    )
+    parser.add_argument(
+        "--no-render",
+        dest="render",
+        action="store_false",
+        help="don't draw the board, for headless AI vs AI runs",
+    )
+    parser.add_argument(
+        "--redraw",
+        action="store_true",
+        help="clear the screen and redraw the whole board on every move",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profiler",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILERS,
+        help="profile the game deterministically (cprofile) or by sampling (sample)",
+    )
+    parser.add_argument(
+        "--profile-out",
+        dest="profile_out",
+        help="path prefix of the profile output files",
+    )
+    parser.add_argument(
+        "--profile-top",
+        dest="profile_top",
+        type=int,
+        default=20,
+        help="number of hot functions to summarize",
+    )
+    parser.add_argument(
+        "--record",
+        dest="record_path",
+        help="append the game to this game record file",
+    )
     args = parser.parse_args()
 
-    player1 = PLAYER_CLASSES[args.player_x](Mark("X"))
-    player2 = PLAYER_CLASSES[args.player_o](Mark("O"))
+    player_classes, default_player = GAMES[args.game]
+    player_o = args.player_o or default_player
+    for name in (args.player_x, player_o):
+        if name not in player_classes:
+            parser.error(f"{name} can't play {args.game}")
+    if "learned" in (args.player_x, player_o) and not os.path.isfile(args.policy):
+        parser.error(
+            f"the learned player's policy file {args.policy} doesn't exist, "
+            f"train one first with: python3 -m console learn --out {args.policy}"
+        )
+
+    options = {"time_budget": args.time_budget, "policy": args.policy, "workers": args.workers}
+    player1 = make_player(player_classes, args.player_x, Mark("X"), args.delay_seconds, options)
+    player2 = make_player(player_classes, player_o, Mark("O"), args.delay_seconds, options)
 
     if args.starting_mark == "O":
         player1, player2 = player2, player1
 
-    return Args(player1, player2, args.starting_mark)
+    return Args(
+        player1,
+        player2,
+        args.starting_mark,
+        args.render,
+        args.profiler,
+        args.profile_out,
+        args.profile_top,
+        args.record_path,
+        args.game,
+        args.redraw,
+    )
+
+def make_player(
+    player_classes: dict[str, type[Player]],
+    name: str,
+    mark: Mark,
+    delay_seconds: float | None,
+    options: dict[str, object],
+) -> Player:
+    player_class = player_classes[name]
+    kwargs = {
+        key: options[key]
+        for base, keys in PLAYER_OPTIONS.items()
+        if issubclass(player_class, base)
+        for key in keys
+    }
+    if delay_seconds is not None and issubclass(player_class, ComputerPlayer):
+        kwargs["delay_seconds"] = delay_seconds
+    return player_class(mark, **kwargs)
@@ -1,13 +1,70 @@
-from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.engine import ConnectFour, TicTacToe, Ultimate
+from tic_tac_toe.game.players import TimedComputerPlayer
+from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.game.records import GameRecordWriter
+import contextlib
+import importlib
+import sys
 import time
 
 from .args import parse_args
-from .renderers import ConsoleRenderer
+from .profiling import profiled
+from .renderers import (
+    DIFFERENTIAL_RENDERERS,
+    ConnectFourRenderer,
+    ConsoleRenderer,
+    NullRenderer,
+    UltimateRenderer,
+)
+
+# subcommands, imported only when run since some bring in process pools or numpy
+SUBCOMMANDS = ("perft", "learn", "parallel", "prove", "threads", "startup", "trace", "hashing")
+
+# the engine and renderer of every game besides tic-tac-toe
+GAMES = {
+    "connect-four": (ConnectFour, ConnectFourRenderer),
+    "ultimate": (Ultimate, UltimateRenderer),
+}
 
 def main() -> None:
-    player1, player2, starting_mark = parse_args()
-    if type(player1).__name__ == "MinimaxComputerPlayer" and type(player2).__name__ == "MinimaxComputerPlayer":
+    if sys.argv[1:2] and sys.argv[1] in SUBCOMMANDS:
+        importlib.import_module(f".{sys.argv[1]}", __package__).main(sys.argv[2:])
+        return
+    args = parse_args()
+    player1, player2 = args.player1, args.player2
+    if args.render and type(player1).__name__ == "MinimaxComputerPlayer" and type(player2).__name__ == "MinimaxComputerPlayer":
         print("This game is initializing with two minimax AI computer players and will take some time to load the game tree.")
         print("Calculations will begin in 5 seconds and will take approximately 40 seconds to complete.  Please wait...")
         time.sleep(5)
-    TicTacToe(player1, player2, ConsoleRenderer()).play(starting_mark)
+    if args.game in GAMES:
+        engine, renderer_class = GAMES[args.game]
+        if args.record_path:
+            raise SystemExit(f"{args.game} games can't be recorded")
+        renderer = make_renderer(args, renderer_class)
+        with profiled(args.profiler, args.profile_out, args.profile_top):
+            engine(player1, player2, renderer).play(args.starting_mark)
+        report_search_speed(player1, player2)
+        return
+    renderer = make_renderer(args, ConsoleRenderer)
+    with contextlib.ExitStack() as stack:
+        record_writer = None
+        if args.record_path:
+            record_writer = stack.enter_context(GameRecordWriter(args.record_path))
+        with profiled(args.profiler, args.profile_out, args.profile_top):
+            TicTacToe(player1, player2, renderer, record_writer=record_writer).play(args.starting_mark)
+
+def make_renderer(args, redraw_class: type[Renderer]) -> Renderer:
+    if not args.render:
+        return NullRenderer()
+    if args.redraw:
+        return redraw_class()
+    return DIFFERENTIAL_RENDERERS[args.game]()
+
+def report_search_speed(*players) -> None:
+    for player in players:
+        if isinstance(player, TimedComputerPlayer):
+            total = player.total
+            print(
+                f"{player.mark.value} searched {total.nodes:,} nodes in {total.seconds:.2f}s "
+                f"({total.nodes_per_second:,.0f} nodes/s, up to depth {total.depth})"
+            )
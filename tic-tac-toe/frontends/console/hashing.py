@@ -0,0 +1,115 @@
+import argparse
+import random
+import timeit
+
+from tic_tac_toe.logic import zobrist
+from tic_tac_toe.logic.mnk import MNKState
+from tic_tac_toe.logic.models import Mark
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="console hashing",
+        description="Check the Zobrist keys of m,n,k positions for collisions and time lookups keyed on them.",
+    )
+    parser.add_argument(
+        "--boards",
+        nargs="+",
+        default=["7x7", "10x10", "15x15"],
+        help="boards as WIDTHxHEIGHT to play random games on",
+    )
+    parser.add_argument("--games", type=int, default=500, help="random games to play on every board")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = random.Random(args.seed)
+    print(
+        f"{'board':<7} {'positions':>10} {'keys':>10} {'collisions':>10} {'classes':>9} "
+        f"{'sym keys':>9} {'split':>6} {'collisions':>10} {'fields ns':>9} {'key ns':>7}"
+    )
+    failed = False
+    for board in args.boards:
+        width, height = (int(side) for side in board.split("x"))
+        positions = random_positions(width, height, args.games, generator)
+
+        keys: dict[int, tuple[str, Mark]] = {}
+        collisions = 0
+        for game_state in positions:
+            position = (game_state.cells, game_state.starting_mark)
+            if game_state.zobrist != zobrist.board_key(
+                game_state.cell_count,
+                game_state.crosses,
+                game_state.naughts,
+                game_state.starting_mark is Mark.NAUGHT,
+            ):
+                raise SystemExit(f"The key played to {position} isn't the key computed from scratch")
+            collisions += keys.setdefault(game_state.zobrist, position) != position
+
+        # positions that are mirror images of each other are one class and should share a key
+        classes: dict[tuple[str, Mark], int] = {}
+        symmetric_keys: dict[int, tuple[str, Mark]] = {}
+        split = symmetric_collisions = 0
+        for game_state in positions:
+            position = canonical(game_state)
+            split += classes.setdefault(position, game_state.symmetric_zobrist) != game_state.symmetric_zobrist
+            symmetric_collisions += symmetric_keys.setdefault(game_state.symmetric_zobrist, position) != position
+        distinct = {(game_state.cells, game_state.starting_mark) for game_state in positions}
+        failed |= bool(collisions or split or symmetric_collisions)
+
+        print(
+            f"{board:<7} {len(distinct):>10,} {len(keys):>10,} {collisions:>10} {len(classes):>9,} "
+            f"{len(symmetric_keys):>9,} {split:>6} {symmetric_collisions:>10} "
+            f"{lookup_nanoseconds(positions, fields):>9.0f} "
+            f"{lookup_nanoseconds(positions, lambda state: state.zobrist):>7.0f}"
+        )
+    print(
+        "\nsplit counts mirror images keyed apart from their class. "
+        "fields ns and key ns are the nanoseconds of a table lookup keyed on the fields of a position, "
+        "hashed at every lookup as the dataclass hash did, and on its Zobrist key"
+    )
+    if failed:
+        raise SystemExit("Distinct positions share a key or mirror images don't")
+
+def random_positions(width: int, height: int, games: int, generator: random.Random) -> list[MNKState]:
+    """Return every position of random games on a board, without k in a row to end them early."""
+    k = max(width, height)
+    positions = []
+    for _ in range(games):
+        game_state = MNKState(width, height, k, starting_mark=generator.choice([Mark.CROSS, Mark.NAUGHT]))
+        cells = list(range(game_state.cell_count))
+        generator.shuffle(cells)
+        for cell in cells[:generator.randrange(1, len(cells) + 1)]:
+            game_state = game_state.make_move_to(cell).after_state
+            positions.append(game_state)
+    return positions
+
+def canonical(game_state: MNKState) -> tuple[str, Mark]:
+    """Return the least cells string of a position under the symmetries of its board."""
+    cells = game_state.cells
+    images = []
+    for permutation in zobrist.symmetries(game_state.width, game_state.height):
+        image = [" "] * len(cells)
+        for cell, mark in enumerate(cells):
+            image[permutation[cell]] = mark
+        images.append("".join(image))
+    return min(images), game_state.starting_mark
+
+def fields(game_state: MNKState) -> tuple:
+    return (
+        game_state.width,
+        game_state.height,
+        game_state.k,
+        game_state.crosses,
+        game_state.naughts,
+        game_state.starting_mark,
+    )
+
+def lookup_nanoseconds(positions: list[MNKState], key) -> float:
+    """Return the nanoseconds of a dict lookup of a position, computing its key each time."""
+    table = {key(game_state): None for game_state in positions}
+    lookups = positions[:10_000]
+
+    def look_up() -> None:
+        for game_state in lookups:
+            key(game_state) in table
+
+    return min(timeit.repeat(look_up, number=1, repeat=5)) / len(lookups) * 1e9
@@ -0,0 +1,31 @@
+import argparse
+
+from tic_tac_toe.logic.learning import policy_of, save_policy, train
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="console learn")
+    parser.add_argument("--games", type=int, default=200_000, help="self-play games to train on")
+    parser.add_argument("--batch-size", type=int, default=1_024, help="games played at once")
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--report-every", type=int, default=25_000, help="games between progress reports")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default="policy.bin", help="path to save the learned policy to")
+    args = parser.parse_args(argv)
+
+    print(f"{'games':>9} {'games/s':>9} {'epsilon':>7} {'optimal':>8}  vs minimax (W/D/L)")
+    q = env = None
+    for progress, q, env in train(
+        args.games,
+        args.batch_size,
+        args.learning_rate,
+        report_every=args.report_every,
+        seed=args.seed,
+    ):
+        record = progress.record
+        print(
+            f"{progress.games:>9,} {progress.games_per_second:>9,.0f} {progress.epsilon:>7.2f} "
+            f"{progress.optimal_moves:>8.1%}  {record.wins}/{record.draws}/{record.losses}"
+        )
+    if q is not None:
+        save_policy(policy_of(q, env), args.out)
+        print(f"Saved the policy to {args.out}")
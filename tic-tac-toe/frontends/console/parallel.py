@@ -0,0 +1,38 @@
+import argparse
+
+from tic_tac_toe.logic.connect_four import ConnectFourState
+from tic_tac_toe.logic.parallel_search import parallel_best_move
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="console parallel")
+    parser.add_argument("--depth", type=int, default=9, help="plies searched from the root, counting the move to each root column")
+    parser.add_argument("--workers", type=int, default=4, help="processes in the pool")
+    parser.add_argument("--buckets", type=int, default=1 << 18, help="buckets of the shared table, a power of two")
+    parser.add_argument(
+        "--columns",
+        default="",
+        help="columns 1 to 7 played from the empty board before searching, like 4453",
+    )
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error(f"--depth {args.depth}: the search needs at least one ply")
+    if args.buckets < 1 or args.buckets & (args.buckets - 1):
+        parser.error(f"--buckets {args.buckets}: the number of buckets must be a power of two")
+
+    game_state = ConnectFourState()
+    for column in args.columns:
+        game_state = game_state.make_move_to(int(column) - 1).after_state
+
+    print(f"{'tables':<8} {'column':>6} {'score':>6} {'nodes':>10} {'seconds':>8} {'nodes/s':>9} {'hits':>6} {'shared':>7}")
+    seconds = {}
+    for shared in (False, True):
+        result = parallel_best_move(game_state, args.depth, args.workers, shared, args.buckets)
+        name = "shared" if shared else "private"
+        seconds[name] = result.seconds
+        hits = f"{result.hit_rate:.1%}" if shared else "-"
+        shared_hits = f"{result.shared_hit_rate:.1%}" if shared else "-"
+        print(
+            f"{name:<8} {result.column + 1:>6} {result.score:>6} {result.nodes:>10,} "
+            f"{result.seconds:>8.2f} {result.nodes_per_second:>9,.0f} {hits:>6} {shared_hits:>7}"
+        )
+    print(f"The shared table is {seconds['private'] / seconds['shared']:.2f}x the speed of private tables")
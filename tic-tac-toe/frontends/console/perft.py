@@ -0,0 +1,49 @@
+import argparse
+
+from tic_tac_toe.logic.exceptions import InvalidGameState
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.perft import PERFT_MODES, PerftResult
+
+# games from the empty board, with X starting
+KNOWN_GAMES = 255_168
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="console perft")
+    parser.add_argument(
+        "--mode",
+        choices=PERFT_MODES,
+        default="fast",
+        help="walk every move sequence (naive) or every distinct position once (fast)",
+    )
+    parser.add_argument(
+        "--cells",
+        default=" " * 9,
+        help="9 cells of X, O or space to count from, the empty board by default",
+    )
+    parser.add_argument(
+        "--starting",
+        dest="starting_mark",
+        choices=Mark,
+        type=Mark,
+        default="X",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        game_state = GameState(Grid(args.cells), args.starting_mark)
+    except (ValueError, InvalidGameState) as ex:
+        parser.error(f"--cells {args.cells!r}: {ex}")
+    result = PERFT_MODES[args.mode](game_state)
+    print_result(result)
+    if game_state.game_not_started and result.games != KNOWN_GAMES:
+        raise SystemExit(f"Expected {KNOWN_GAMES:,} games from the empty board")
+
+def print_result(result: PerftResult) -> None:
+    print(f"{'ply':>3} {'sequences':>10} {'positions':>9} {'X wins':>8} {'O wins':>8} {'draws':>7}")
+    for row in result.rows:
+        print(
+            f"{row.ply:>3} {row.sequences:>10,} {row.positions:>9,} "
+            f"{row.x_wins:>8,} {row.o_wins:>8,} {row.draws:>7,}"
+        )
+    print(f"{result.games:,} games, {result.moves:,} moves made in {result.seconds:.2f}s "
+          f"({result.moves_per_second:,.0f} moves/s)")
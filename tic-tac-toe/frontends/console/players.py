@@ -1,6 +1,8 @@
 import re
 
 from tic_tac_toe.game.players import Player
+from tic_tac_toe.logic.connect_four import WIDTH, ConnectFourState
+from tic_tac_toe.logic.ultimate import ANY_BOARD, UltimateState
 from tic_tac_toe.logic.exceptions import InvalidMove
 from tic_tac_toe.logic.models import GameState, Move
 
@@ -18,6 +20,54 @@ class ConsolePlayer(Player):
                     print("That cell is already occupied.")
         return None
 
+class ConnectFourConsolePlayer(Player):
+    def get_move(self, game_state: ConnectFourState) -> Move | None:
+        while not game_state.game_over:
+            try:
+                column = int(input(f"{self.mark}'s column: ").strip()) - 1
+            except ValueError:
+                column = -1
+            if not 0 <= column < WIDTH:
+                print(f"Please provide a column from 1 to {WIDTH}")
+                continue
+            try:
+                return game_state.make_move_to(column)
+            except InvalidMove:
+                print("That column is already full.")
+        return None
+
+class UltimateConsolePlayer(Player):
+    def get_move(self, game_state: UltimateState) -> Move | None:
+        while not game_state.game_over:
+            if game_state.active == ANY_BOARD:
+                prompt = f"{self.mark}'s move, on any open board: "
+            else:
+                prompt = f"{self.mark}'s move, on board {game_state.active + 1}: "
+            try:
+                index = ultimate_grid_to_index(input(prompt).strip())
+            except ValueError:
+                print("Please provide coordinates in the form of E5 or 5E")
+            else:
+                try:
+                    return game_state.make_move_to(index)
+                except InvalidMove as ex:
+                    print(f"{ex}.")
+        return None
+
+def ultimate_grid_to_index(grid: str) -> int:
+    
+    # coordinates are on the whole 9 x 9 board, and moves are numbered board by board
+    
+    if re.fullmatch(r"[a-iA-I][1-9]", grid):
+        col, row = grid
+    elif re.fullmatch(r"[1-9][a-iA-I]", grid):
+        row, col = grid
+    else:
+        raise ValueError("Invalid grid coordinates")
+    row, col = int(row) - 1, ord(col.upper()) - ord("A")
+    board = 3 * (row // 3) + col // 3
+    return 9 * board + 3 * (row % 3) + col % 3
+
 def grid_to_index(grid: str) -> int:
     
     # sanitize console inputs from human players so that order of coordinates doesn't matter
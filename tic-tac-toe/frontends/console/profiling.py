@@ -0,0 +1,188 @@
+"""Profiling of whole games, written as a pstats file and as collapsed stacks by either profiler.
+
+cProfile counts every call exactly, and its collapsed stacks are estimated from its caller
+graph by sharing each function's time among its callers. The sampler records whole stacks, so
+its collapsed stacks are exact, and its pstats file counts samples where cProfile counts calls.
+"""
+
+import marshal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+PROFILERS = ("cprofile", "sample")
+
+# a function as pstats keys it, by file, first line and name
+Function = tuple[str, int, str]
+
+# stack shares below this many microseconds are left out of collapsed stacks estimated from cProfile
+MIN_MICROSECONDS = 1.0
+
+def label(function: Function) -> str:
+    filename, line, name = function
+    return f"{name} ({filename}:{line})"
+
+def write_collapsed(stacks: Counter[tuple[Function, ...]], path: str) -> None:
+    # one "outer;inner;leaf count" line per distinct stack, which speedscope and flamegraph.pl read
+    with open(path, "w") as collapsed_file:
+        for stack, count in stacks.most_common():
+            collapsed_file.write(f"{';'.join(map(label, stack))} {count}\n")
+
+def stats_stacks(stats: dict) -> Counter[tuple[Function, ...]]:
+    """Estimate the microseconds spent in every stack from the call graph of pstats statistics.
+
+    cProfile only records which function called which, so a function's time is shared among
+    the stacks it is reached by in proportion to the cumulative time of each call edge, and
+    recursive calls are folded into the frame already on the stack.
+    """
+    callees: defaultdict[Function, list[tuple[Function, float]]] = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees[caller].append((function, cumulative))
+    stacks: Counter[tuple[Function, ...]] = Counter()
+
+    def visit(stack: tuple[Function, ...], seconds: float) -> None:
+        function = stack[-1]
+        _, _, own, cumulative, _ = stats[function]
+        share = min(1.0, seconds / cumulative) if cumulative else 0.0
+        if (microseconds := round(own * share * 1e6)) >= MIN_MICROSECONDS:
+            stacks[stack] += microseconds
+        for callee, edge in callees[function]:
+            if callee not in stack and edge * share * 1e6 >= MIN_MICROSECONDS:
+                visit(stack + (callee,), edge * share)
+
+    for function, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            visit((function,), cumulative)
+    return stacks
+
+class Sampler:
+
+    """Low-overhead statistical profiler that periodically records the main thread's stack."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.seconds = 0.0
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        # the sampling thread needs the GIL to take a sample, so hand it over at least as often
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self.seconds = time.perf_counter() - self._start
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            # collapsed stacks are listed from the outermost frame to the innermost one
+            self.samples[tuple(reversed(stack))] += 1
+
+    def write_collapsed(self, path: str) -> None:
+        write_collapsed(self.samples, path)
+
+    def write_pstats(self, path: str) -> None:
+        """Write the samples as a pstats file, with samples for calls and their share of the time."""
+        total = sum(self.samples.values())
+        seconds = self.seconds / total if total else 0.0
+        own: Counter[Function] = Counter()
+        cumulative: Counter[Function] = Counter()
+        edges: defaultdict[Function, Counter[Function]] = defaultdict(Counter)
+        edge_own: defaultdict[Function, Counter[Function]] = defaultdict(Counter)
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulative[function] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                edges[callee][caller] += count
+            if len(stack) > 1:
+                edge_own[stack[-1]][stack[-2]] += count
+        stats = {
+            function: (
+                count,
+                count,
+                own[function] * seconds,
+                count * seconds,
+                {
+                    caller: (calls, calls, edge_own[function][caller] * seconds, calls * seconds)
+                    for caller, calls in edges[function].items()
+                },
+            )
+            for function, count in cumulative.items()
+        }
+        with open(path, "wb") as pstats_file:
+            marshal.dump(stats, pstats_file)
+
+    def summary(self, top: int) -> str:
+        total = sum(self.samples.values()) or 1
+        own: Counter[Function] = Counter()
+        cumulative: Counter[Function] = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulative[function] += count
+        lines = [f"{'own %':>7}{'total %':>9}  function"]
+        for function, count in own.most_common(top):
+            lines.append(
+                f"{100 * count / total:>7.1f}{100 * cumulative[function] / total:>9.1f}  {label(function)}"
+            )
+        return "\n".join(lines)
+
+@contextmanager
+def profiled(profiler: str | None, out: str | None, top: int) -> Iterator[None]:
+    """Run the body under the chosen profiler, write its pstats and collapsed stacks and print the hot functions."""
+    if profiler is None:
+        yield
+        return
+    out = out or "tic-tac-toe"
+    start = time.perf_counter()
+    if profiler == "cprofile":
+        # imported here, games that aren't profiled don't start any slower
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(f"{out}.pstats")
+            stats = pstats.Stats(profile)
+            write_collapsed(stats_stacks(stats.stats), f"{out}.collapsed")
+            print(
+                f"\nProfiled {time.perf_counter() - start:.3f} seconds, "
+                f"written to {out}.pstats and {out}.collapsed"
+            )
+            stats.sort_stats("tottime").print_stats(top)
+    else:
+        sampler = Sampler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            sampler.write_collapsed(f"{out}.collapsed")
+            sampler.write_pstats(f"{out}.pstats")
+            print(
+                f"\nSampled {time.perf_counter() - start:.3f} seconds, "
+                f"written to {out}.pstats and {out}.collapsed"
+            )
+            print(sampler.summary(top))
@@ -0,0 +1,94 @@
+import argparse
+
+from tic_tac_toe.logic.exceptions import InvalidGameState
+from tic_tac_toe.logic.mnk import MNKState
+from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.proof_number import DRAW, WIN, ProofProgress, prove
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="console prove")
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--height", type=int, default=4)
+    parser.add_argument("-k", type=int, default=4, help="marks in a row that win")
+    parser.add_argument(
+        "--cells",
+        default="",
+        help="cells of X, O or space row by row from the top left to prove, the empty board by default",
+    )
+    parser.add_argument(
+        "--starting",
+        dest="starting_mark",
+        choices=Mark,
+        type=Mark,
+        default="X",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=2_000_000,
+        help="positions kept in the table before unsettled ones are dropped",
+    )
+    parser.add_argument("--report-every", type=int, default=100_000, help="nodes between progress reports")
+    parser.add_argument("--checkpoint", metavar="PATH", help="file to checkpoint the search to")
+    parser.add_argument(
+        "--checkpoint-every",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="seconds between checkpoints, one is also written on Ctrl+C",
+    )
+    parser.add_argument(
+        "--checkpoint-mb",
+        type=float,
+        default=1024.0,
+        help="most megabytes a checkpoint may take, dropping the least useful table entries",
+    )
+    parser.add_argument("--resume", action="store_true", help="carry on from the checkpoint, if there is one")
+    parser.add_argument(
+        "--symmetric",
+        action="store_true",
+        help="key the table on symmetric Zobrist keys, proving mirror images of a position once",
+    )
+    args = parser.parse_args(argv)
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs a --checkpoint")
+
+    cells = args.cells.ljust(args.width * args.height)
+    crosses = sum(1 << cell for cell, mark in enumerate(cells) if mark == "X")
+    naughts = sum(1 << cell for cell, mark in enumerate(cells) if mark == "O")
+    try:
+        game_state = MNKState(args.width, args.height, args.k, crosses, naughts, args.starting_mark)
+    except InvalidGameState as ex:
+        parser.error(str(ex))
+
+    print(f"{'phase':<5} {'proof':>11} {'disproof':>11} {'nodes':>11} {'seconds':>8} {'nodes/s':>8} {'table':>9}")
+    try:
+        result = prove(
+            game_state,
+            args.max_nodes,
+            print_progress,
+            args.report_every,
+            args.checkpoint,
+            args.checkpoint_every,
+            int(args.checkpoint_mb * 1024 * 1024),
+            args.resume,
+            args.symmetric,
+        )
+    except KeyboardInterrupt:
+        if args.checkpoint:
+            print(f"Interrupted, resume from {args.checkpoint} with --resume")
+        else:
+            print("Interrupted")
+        raise SystemExit(130)
+    outcome = {WIN: "wins", DRAW: "draws"}.get(result.value, "loses")
+    print(
+        f"{game_state.current_mark.value} to move {outcome} on the {args.width} x {args.height} board "
+        f"with {args.k} in a row, proven in {result.nodes:,} nodes and {result.seconds:.2f}s "
+        f"({result.nodes_per_second:,.0f} nodes/s, {result.evictions} table evictions)"
+    )
+
+def print_progress(progress: ProofProgress) -> None:
+    print(
+        f"{progress.phase:<5} {progress.proof:>11,} {progress.disproof:>11,} {progress.nodes:>11,} "
+        f"{progress.seconds:>8.1f} {progress.nodes_per_second:>8,.0f} {progress.table_size:>9,}"
+    )
@@ -1,8 +1,11 @@
+import sys
 import textwrap
-from typing import Iterable
+from typing import Callable, Iterable, Sequence, TextIO
 
 from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic.connect_four import HEIGHT, WIDTH, ConnectFourState
 from tic_tac_toe.logic.models import GameState
+from tic_tac_toe.logic.ultimate import ANY_BOARD, UltimateState
 
 class ConsoleRenderer(Renderer):
     def render(self, game_state: GameState) -> None:
@@ -14,13 +17,117 @@ class ConsoleRenderer(Renderer):
             print_solid(game_state.grid.cells)
             if game_state.tie:
                 print("Tie game... \N{neutral face}")
-        
+
+class ConnectFourRenderer(Renderer):
+    def render(self, game_state: ConnectFourState) -> None:
+        clear_screen()
+        if game_state.winner:
+            print_board(game_state.cells, game_state.winning_cells)
+            print(f"{game_state.winner} wins! \N{party popper} \N{confetti ball}")
+        else:
+            print_board(game_state.cells)
+            if game_state.tie:
+                print("Tie game... \N{neutral face}")
+
+class UltimateRenderer(Renderer):
+    def render(self, game_state: UltimateState) -> None:
+        clear_screen()
+        if game_state.winner:
+            print_ultimate(game_state.cells, game_state.winning_cells)
+            print(f"{game_state.winner} wins! \N{party popper} \N{confetti ball}")
+        else:
+            print_ultimate(game_state.cells)
+            if game_state.tie:
+                print("Tie game... \N{neutral face}")
+            elif game_state.active != ANY_BOARD:
+                print(f"Next move on board {game_state.active + 1}")
+
+class DifferentialRenderer(Renderer):
+
+    """Draws the frame of the board once, then rewrites only the cells that changed.
+
+    Every frame goes out in a single write of cursor-addressing sequences, and the status
+    line below the board is rewritten in place, so nothing scrolls or flickers. When the
+    output isn't a terminal, e.g. a log file or a pipe, the moves in between aren't drawn
+    at all and only the final position is printed.
+    """
+
+    def __init__(
+        self,
+        frame: Callable[[Sequence[str]], str],
+        cells: Callable[..., str] = lambda game_state: game_state.cells,
+        blank: str = " ",
+        output: TextIO | None = None,
+    ) -> None:
+        self.frame = frame
+        self.cells = cells
+        self.blank = blank
+        self.output = output or sys.stdout
+        self.drawn: list[str] | None = None
+        self.positions: list[tuple[int, int]] = []
+        self.status_row = 0
+
+    def render(self, game_state) -> None:
+        if not self.output.isatty():
+            if game_state.game_over:
+                self.output.write(self.frame(self.shown(game_state)) + status(game_state))
+                self.output.flush()
+            return
+        shown = self.shown(game_state)
+        if self.drawn is None or game_state.game_not_started or len(shown) != len(self.drawn):
+            self.locate(len(shown))
+            parts = ["\033[H\033[2J", self.frame(shown)]
+        else:
+            parts = [
+                self.at(position, cell)
+                for position, (cell, before) in enumerate(zip(shown, self.drawn))
+                if cell != before
+            ]
+        for position in game_state.winning_cells:
+            parts.append(self.at(position, blink(shown[position])))
+        parts.append(f"\033[{self.status_row};1H\033[J{status(game_state)}")
+        self.output.write("".join(parts))
+        self.output.flush()
+        self.drawn = shown
+
+    def shown(self, game_state) -> list[str]:
+        return [self.blank if cell == " " else cell for cell in self.cells(game_state)]
+
+    def locate(self, count: int) -> None:
+        """Find the screen position of every cell by drawing the frame with placeholders."""
+        placeholders = [chr(0xE000 + position) for position in range(count)]
+        lines = self.frame(placeholders).splitlines()
+        found = {}
+        for row, line in enumerate(lines, start=1):
+            for column, char in enumerate(line, start=1):
+                found[char] = (row, column)
+        self.positions = [found[placeholder] for placeholder in placeholders]
+        self.status_row = len(lines) + 1
+
+    def at(self, position: int, text: str) -> str:
+        row, column = self.positions[position]
+        return f"\033[{row};{column}H{text}"
+
+class NullRenderer(Renderer):
+    def render(self, game_state: GameState) -> None:
+        # headless games draw nothing
+        pass
+
 def clear_screen() -> None:
     print("\033c", end="")
-    
+
 def blink(text: str) -> None:
     return f"\033[5m{text}\033[0m"
 
+def status(game_state) -> str:
+    if game_state.winner:
+        return f"{game_state.winner} wins! \N{party popper} \N{confetti ball}\n"
+    if game_state.tie:
+        return "Tie game... \N{neutral face}\n"
+    if getattr(game_state, "active", ANY_BOARD) != ANY_BOARD:
+        return f"Next move on board {game_state.active + 1}\n"
+    return ""
+
 def print_blinking(cells: Iterable[str], positions: Iterable[int]) -> None:
     mutable_cells = list(cells)
     for position in positions:
@@ -28,16 +135,58 @@ def print_blinking(cells: Iterable[str], positions: Iterable[int]) -> None:
     print_solid(mutable_cells)
 
 def print_solid(cells: Iterable[str]) -> None:
-    print(
-        textwrap.dedent(
-            """\
-             A   B   C
-           ------------
-        1 ┆  {0} │ {1} │ {2}
-          ┆ ───┼───┼───
-        2 ┆  {3} │ {4} │ {5}
-          ┆ ───┼───┼───
-        3 ┆  {6} │ {7} │ {8}
-    """
-        ).format(*cells)
-    )
+    print(grid_frame(list(cells)))
+
+def print_board(cells: Iterable[str], positions: Iterable[int] = ()) -> None:
+    mutable_cells = list(cells)
+    for position in positions:
+        mutable_cells[position] = blink(mutable_cells[position])
+    print(connect_four_frame(mutable_cells), end="")
+
+def print_ultimate(cells: Iterable[str], positions: Iterable[int] = ()) -> None:
+    mutable_cells = [cell if cell != " " else "·" for cell in cells]
+    for position in positions:
+        mutable_cells[position] = blink(mutable_cells[position])
+    print(ultimate_frame(mutable_cells), end="")
+
+def grid_frame(cells: Sequence[str]) -> str:
+    return textwrap.dedent(
+        """\
+         A   B   C
+       ------------
+    1 ┆  {0} │ {1} │ {2}
+      ┆ ───┼───┼───
+    2 ┆  {3} │ {4} │ {5}
+      ┆ ───┼───┼───
+    3 ┆  {6} │ {7} │ {8}
+"""
+    ).format(*cells)
+
+def connect_four_frame(cells: Sequence[str]) -> str:
+    lines = [" " + " ".join(str(column + 1) for column in range(WIDTH))]
+    for row in range(HEIGHT):
+        lines.append("│" + "│".join(cells[row * WIDTH:(row + 1) * WIDTH]) + "│")
+    lines.append("└" + "─┴" * (WIDTH - 1) + "─┘")
+    return "\n".join(lines) + "\n"
+
+def ultimate_frame(cells: Sequence[str]) -> str:
+    # cells come board by board, so rows of the whole board are pieced together from three boards
+    lines = ["    A B C   D E F   G H I"]
+    for row in range(9):
+        if row and row % 3 == 0:
+            lines.append("   ───────┼───────┼───────")
+        board_row, cell_row = divmod(row, 3)
+        parts = []
+        for board_col in range(3):
+            board = 3 * board_row + board_col
+            start = 9 * board + 3 * cell_row
+            parts.append(" ".join(cells[start:start + 3]))
+        lines.append(f" {row + 1}  " + " │ ".join(parts))
+    return "\n".join(lines) + "\n"
+
+# the differential renderer of every game
+DIFFERENTIAL_RENDERERS = {
+    "tic-tac-toe": lambda: DifferentialRenderer(grid_frame, lambda game_state: game_state.grid.cells),
+    "connect-four": lambda: DifferentialRenderer(connect_four_frame),
+    "ultimate": lambda: DifferentialRenderer(ultimate_frame, blank="·"),
+}
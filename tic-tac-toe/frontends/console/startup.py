@@ -0,0 +1,75 @@
+import argparse
+import os
+import select
+import statistics
+import subprocess
+import sys
+import time
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="console startup",
+        description="Time how long a game takes to draw its first board, and which imports it waits for. "
+        "Options not listed here are passed on to the game, e.g. --game connect-four -X human.",
+    )
+    parser.add_argument("--runs", type=int, default=10, help="timed starts to take the median of")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="time to the first board to stay within")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args, game_args = parser.parse_known_args(argv)
+
+    # the first start compiles changed modules and fills the table cache, so it isn't timed
+    first_board(game_args)
+    times = [first_board(game_args)[0] * 1000 for _ in range(args.runs)]
+    imports = parse_importtime(first_board(game_args, importtime=True)[1])
+
+    median = statistics.median(times)
+    print(
+        f"first board after {median:.1f} ms, the median of {args.runs} starts "
+        f"({min(times):.1f} to {max(times):.1f} ms), budget {args.budget_ms:.0f} ms"
+    )
+    print(f"\n{'self ms':>8} {'total ms':>9}  slowest imports, under -X importtime")
+    for module, own, total in sorted(imports, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{own / 1000:>8.1f} {total / 1000:>9.1f}  {module}")
+    print(f"{sum(own for _, own, _ in imports) / 1000:>8.1f} {'':>9}  all {len(imports)} modules")
+    if median > args.budget_ms:
+        raise SystemExit(f"\nThe first board takes {median - args.budget_ms:.1f} ms longer than the budget")
+
+def first_board(game_args: list[str], importtime: bool = False) -> tuple[float, str]:
+    """Start a game and return the seconds until it draws anything, and its import times.
+
+    The game runs in a pseudo-terminal, so it draws the way it does for a player, and is
+    stopped as soon as the first board arrives.
+    """
+    import pty
+
+    controller, terminal = pty.openpty()
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "console", *game_args]
+    start = time.perf_counter()
+    game = subprocess.Popen(
+        command,
+        stdin=terminal,
+        stdout=terminal,
+        stderr=subprocess.PIPE if importtime else subprocess.DEVNULL,
+        env=os.environ | {"PYTHONUNBUFFERED": "1"},
+    )
+    os.close(terminal)
+    try:
+        ready, _, _ = select.select([controller], [], [], 30)
+        seconds = time.perf_counter() - start
+        if not ready:
+            raise SystemExit("The game drew nothing within 30 seconds")
+    finally:
+        game.kill()
+        _, errors = game.communicate()
+        os.close(controller)
+    return seconds, errors.decode() if errors else ""
+
+def parse_importtime(report: str) -> list[tuple[str, int, int]]:
+    """Return the module, self and cumulative microseconds of every import in a -X importtime report."""
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, total, module = line.removeprefix("import time:").split("|")
+        imports.append((module.strip(), int(own), int(total)))
+    return imports
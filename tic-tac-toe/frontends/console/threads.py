@@ -0,0 +1,59 @@
+import argparse
+import sys
+import sysconfig
+import time
+
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.threaded_search import ThreadedSearch
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="console threads")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="thread counts to compare",
+    )
+    parser.add_argument(
+        "--marks",
+        type=int,
+        default=2,
+        help="search every position with up to this many marks, X starting",
+    )
+    args = parser.parse_args(argv)
+
+    positions = positions_up_to(args.marks)
+    # the first pass builds the moves of every position, so the timed passes only search
+    for game_state in positions:
+        ThreadedSearch(1, mate_distance=True).find_best_move(game_state)
+
+    print(f"{interpreter()}, {len(positions)} positions with up to {args.marks} marks")
+    print(f"{'threads':>7} {'seconds':>8} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        for game_state in positions:
+            ThreadedSearch(workers, mate_distance=True).find_best_move(game_state)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(f"{workers:>7} {seconds:>8.3f} {baseline / seconds:>7.2f}x")
+
+def positions_up_to(marks: int) -> list[GameState]:
+    positions = {}
+    frontier = [GameState(Grid(), Mark("X"))]
+    while frontier:
+        game_state = frontier.pop()
+        if game_state.grid.cells in positions or game_state.game_over:
+            continue
+        positions[game_state.grid.cells] = game_state
+        if 9 - game_state.grid.empty_count < marks:
+            frontier.extend(move.after_state for move in game_state.possible_moves)
+    return list(positions.values())
+
+def interpreter() -> str:
+    version = sys.version.split()[0]
+    if sysconfig.get_config_var("Py_GIL_DISABLED"):
+        enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+        return f"Python {version} free-threaded, GIL {'enabled' if enabled else 'disabled'}"
+    return f"Python {version} with the GIL"
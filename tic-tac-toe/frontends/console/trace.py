@@ -0,0 +1,59 @@
+import argparse
+
+from tic_tac_toe.logic import minimax, tracing
+from tic_tac_toe.logic.exceptions import InvalidGameState
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="console trace")
+    parser.add_argument(
+        "--cells",
+        default=" " * 9,
+        help="9 cells of X, O or space to search the best move of, the empty board by default",
+    )
+    parser.add_argument(
+        "--starting",
+        dest="starting_mark",
+        choices=Mark,
+        type=Mark,
+        default="X",
+    )
+    parser.add_argument("--mate-distance", action="store_true", help="score wins by how soon they come")
+    parser.add_argument("--tactics", action="store_true", help="settle positions by their threats first")
+    parser.add_argument("--out", default="search.trace", help="trace file to write")
+    parser.add_argument("--sample", type=float, default=1.0, help="share of the nodes to write, from 0 to 1")
+    parser.add_argument("--max-depth", type=int, help="deepest ply to write")
+    parser.add_argument("--top", type=int, default=10, help="number of heaviest subtrees to list")
+    parser.add_argument(
+        "--read",
+        action="store_true",
+        help="only summarize the trace already in --out, without searching",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.read:
+        try:
+            game_state = GameState(Grid(args.cells), args.starting_mark)
+        except (ValueError, InvalidGameState) as ex:
+            parser.error(f"--cells {args.cells!r}: {ex}")
+        with tracing.tracing(args.out, args.sample, args.max_depth) as tracer:
+            move = minimax.pruned_find_best_move(game_state, args.mate_distance, args.tactics)
+        best = "no move" if move is None else f"cell {move.cell_index}"
+        print(f"pruned_find_best_move picked {best}, {tracer.nodes:,} nodes, {tracer.written:,} written to {args.out}")
+
+    try:
+        reader = tracing.TraceReader(args.out)
+    except (OSError, ValueError) as ex:
+        parser.error(f"--out {args.out!r}: {ex}")
+    with reader as trace:
+        print(f"\n{'depth':>5} {'nodes':>9} {'interior':>9} {'cutoffs':>9} {'rate':>6}")
+        for depth, stats in trace.depths().items():
+            print(
+                f"{depth:>5} {stats.nodes:>9,} {stats.interior:>9,} {stats.cutoffs:>9,} "
+                f"{stats.cutoff_rate:>6.1%}"
+            )
+        print(f"\n{'cells':<11} {'to move':>7} {'visits':>7} {'nodes':>9}  heaviest subtrees")
+        for index, visits, nodes in trace.heaviest(args.top):
+            game_state = tracing.position(index)
+            to_move = "-" if game_state.game_over else game_state.current_mark.value
+            print(f"{game_state.grid.cells!r:<11} {to_move:>7} {visits:>7,} {nodes:>9,}")
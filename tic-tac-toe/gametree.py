@@ -3,7 +3,9 @@
 import enum
 import re
 import random
+import sys
 import time
+import tracemalloc
 
 # declare winning states as a global constant
 # There are 8 game ending states where a win can be determined for either player
@@ -34,6 +36,15 @@ class Mark(str, enum.Enum):
         return Mark.CROSS if self is Mark.NAUGHT else Mark.NAUGHT
     
     
+# cell indices of each winning line, for scanning the lines for threats
+WINNING_LINES = [[i for i, c in enumerate(pattern) if c == "?"] for pattern in WINNING_STATES]
+
+# terminal row of the top row of cells drawn by render_board, below the title and the top border
+BOARD_TOP_ROW = 4
+
+# beyond any score static_evaluation can return, so it bounds the alpha-beta window
+SCORE_BOUND = 10
+
 class GameTree:
     """This is a game tree representing the game of tic-tac-toe. It contains GameTreeNodes which
     represent the states of the game.  The edges between the nodes represent the possible moves
@@ -55,6 +66,13 @@ class GameTree:
         # initialize the root node of the game tree
         self.root = GameTreeNode(Grid(self.STARTING_GRID), Mark("X"))
         self.game_played = [self.root]
+        
+        # seconds spent searching for each move made by play_minimax
+        self.turn_times = []
+        
+        # the cells on screen, so render_board only redraws what changed, and the pause after each frame
+        self.drawn_cells = None
+        self.render_delay = 0.5
 
     def __str__(self):
         game_progress = ""
@@ -69,14 +87,29 @@ class GameTree:
         return str(game_progress)
     
     def render_board(self, game_state):
-        """This method renders the current game board to the console."""
+        """This method renders the current game board to the console.  The frame is drawn once
+        and after that only the cells that changed are rewritten in place, in a single write.
+        Nothing is drawn when the output is not a terminal, such as a log file or a pipe."""
+        
+        if not sys.stdout.isatty():
+            return
         
-        # clear the console, should work for modern Windows, Mac, and Linux terminals 
-        print("\033c", end="")
-        print("Current board state:\n")
-        print(game_state)
+        cells = game_state.game_state.cells
+        if self.drawn_cells is None:
+            # clear the console once, should work for modern Windows, Mac, and Linux terminals
+            frame = "\033c" + "Current board state:\n\n" + str(game_state) + "\n"
+        else:
+            changed = [i for i in range(9) if cells[i] != self.drawn_cells[i]]
+            # a board that hasn't changed since the last frame is not drawn or waited on again
+            if not changed:
+                return
+            frame = "".join(f"\033[{BOARD_TOP_ROW + i // 3};{2 + i % 3}H{cells[i]}" for i in changed)
+            frame += f"\033[{BOARD_TOP_ROW + 4};1H"
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+        self.drawn_cells = cells
         
-        time.sleep(0.5)
+        time.sleep(self.render_delay)
     
     def play_random(self):
         """This method plays a randomized game of tic-tac-toe for testing purposes.  
@@ -121,7 +154,13 @@ class GameTree:
         
             # get the best move for the current player 
             # maximizing player is always X in this implementation and X always moves first
-            _, best_move = game_state.find_best_move(game_state, game_state.current_player())
+            start = time.perf_counter()
+            _, best_move = game_state.find_best_move(game_state, game_state.current_player(), mate_distance = True)
+            self.turn_times.append(time.perf_counter() - start)
+            
+            # keep the subtree already explored under the chosen move for the next turn,
+            # and let go of the sibling subtrees that can no longer be reached
+            game_state.release_children()
             
             # perform the best move to update the game state
             game_state = best_move.after_state
@@ -142,6 +181,9 @@ class Grid:
     
     """Abstracted representation of the game board.  It is represented as a string of 9 spaces"""
     
+    # slots instead of an instance __dict__ keep every node of a full game tree small
+    __slots__ = ("cells",)
+    
     def __init__(self, cells = " " * 9):
         self.cells = cells
 
@@ -167,6 +209,8 @@ class Move:
     """Data class abstraction of a move made in the game. It tracks the current player (mark) making a move,
     the cell index of the move, and the state of the game before and after the move is made."""
     
+    __slots__ = ("mark", "cell_index", "before_state", "after_state")
+    
     def __init__(self, mark, cell_index, before_state, after_state):
         self.mark = mark
         self.cell_index = cell_index
@@ -185,12 +229,28 @@ class GameTreeNode:
     """A node in the game tree represents a certain state of the game.  It tracks the game state,
     and the player who is to move next.  Handles the game logic in this implementation."""
     
+    __slots__ = (
+        "game_state",
+        "player_to_move",
+        "children",
+        "_current_player",
+        "_winner",
+        "_winning_cells",
+        "iteration",
+    )
+    
     def __init__(self, game_state, player_to_move = Mark("X")):
-        # store children as an instance attribute in a list of GameTreeNodes instead of placeholder?
-        # self.children = []
         self.game_state = game_state
         self.player_to_move = player_to_move
         
+        # list of Moves to the child nodes, materialized once by possible_moves()
+        self.children = None
+        
+        # derived state is computed on first use and cached, since the game state never changes
+        self._current_player = None
+        self._winner = _UNKNOWN
+        self._winning_cells = None
+        
         # track iterations of minimax?
         self.iteration = 0
 
@@ -204,10 +264,12 @@ class GameTreeNode:
     # so this can be determined by comparing the number of Xs and Os on the board
     
     def current_player(self):
-        if self.game_state.count_x() == self.game_state.count_o():
-            return self.player_to_move
-        else:
-            return self.player_to_move.other
+        if self._current_player is None:
+            if self.game_state.count_x() == self.game_state.count_o():
+                self._current_player = self.player_to_move
+            else:
+                self._current_player = self.player_to_move.other
+        return self._current_player
     
     # Helper method to determine if the game has not started yet.  This is true if the board is empty.   
     def game_not_started(self):
@@ -216,58 +278,56 @@ class GameTreeNode:
     # Method to determine if the current game state is a winning state.  This is true if the current
     # game state's grid layout matches any of the winning patterns for a player.
     def winner(self):
-        # check to see if the current game state's grid layout matches any of the winning patterns
-        for pattern in WINNING_STATES:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.game_state.cells):
-                    return mark
-                
-    # Helper method to return the winning cells if there is a winner
-    def winning_cells(self):
-        if self.winner() is not None:
+        # the patterns are only matched the first time, the result is cached on the node
+        if self._winner is _UNKNOWN:
+            self._winner = None
+            self._winning_cells = []
+            # check to see if the current game state's grid layout matches any of the winning patterns
             for pattern in WINNING_STATES:
                 for mark in Mark:
                     if re.match(pattern.replace("?", mark), self.game_state.cells):
-                        return [i for i, c in enumerate(pattern) if c == "?"]
-        else:
-            return []
+                        self._winner = mark
+                        self._winning_cells = [i for i, c in enumerate(pattern) if c == "?"]
+                        return self._winner
+        return self._winner
+                
+    # Helper method to return the winning cells if there is a winner
+    def winning_cells(self):
+        self.winner()
+        return list(self._winning_cells)
     
     # Helper method to determine if the game is a draw.  This is true if the board full and not
     # in a winning state.
     def draw_state(self):
-        if self.winner():
-            return False
-        else:
-            if self.game_state.count_empty() == 0:
-                return True
-            else:
-                return False
+        return self.winner() is None and self.game_state.count_empty() == 0
     
     # Helper method to determine if the game is over.  This is true if the board is in a winning state
     # or if there are no more possible moves.  
     def game_finished(self):
-        if self.winner():
-            return True
-        if self.winner() is None:
-            if self.draw_state():
-                return True
-        return False
+        return self.winner() is not None or self.draw_state()
     
     # Method to determine the possible moves from the current game state.  This will return a list of
-    # possible valid moves that can be made.    
+    # possible valid moves that can be made.  The child nodes are only built on the first call and
+    # the same Move objects are returned afterwards, so subtrees explored by a search are kept.
     def possible_moves(self):
-        # initialize an empty list of possible moves
-        moves = []
-        
-        # Valid moves can only be made to empty cells.
-        # If the game is not over, iterate through the grid and add a move for each empty cell.
-        # If the game is finished, this will return an empty list.
-        if not self.game_finished():
-            # print("not finished")
-            blank_cells = re.finditer(r"\s", self.game_state.cells)
-            for match in blank_cells:
-                moves.append(self.move_to(match.start()))
-        return moves
+        if self.children is None:
+            # initialize an empty list of possible moves
+            moves = []
+            
+            # Valid moves can only be made to empty cells.
+            # If the game is not over, iterate through the grid and add a move for each empty cell.
+            # If the game is finished, this will return an empty list.
+            if not self.game_finished():
+                blank_cells = re.finditer(r"\s", self.game_state.cells)
+                for match in blank_cells:
+                    moves.append(self.move_to(match.start()))
+            self.children = moves
+        return list(self.children)
+    
+    # Helper method to drop the materialized children of a node once the game has moved past it,
+    # so the subtrees under moves that were not played can be garbage collected.
+    def release_children(self):
+        self.children = None
     
     # Helper method to make a move to a given cell index.  This will return a Move object that can be
     # used to generate the next game state.
@@ -294,7 +354,9 @@ class GameTreeNode:
                     + self.current_player()
                     # ...followed by the remaining cells.
                     + self.game_state.cells[index + 1 :]
-                )
+                ),
+                # the child keeps the starting player, which decides whose turn it is
+                self.player_to_move,
             )
         )
 
@@ -306,20 +368,53 @@ class GameTreeNode:
     
     # Method to perform static evaluation of the game state.  This is used to determine the score of a
     # terminal node in the game tree.  The score is 1 if the current player is the winner, -1 if the
-    # current player is the loser, and 0 if the game is a draw.
+    # current player is the loser, and 0 if the game is a draw.  With mate distance, a win scores
+    # one more than the number of empty cells it leaves, so faster wins score higher.
         
-    def static_evaluation(self, mark):
+    def static_evaluation(self, mark, mate_distance = False):
         if self.game_finished():
             if self.draw_state():
                 return 0
+            score = self.game_state.count_empty() + 1 if mate_distance else 1
             if self.winner() is mark:
-                return 1
+                return score
             else:
-                return -1
+                return -score
         else:
             return 0
-    
-    def find_best_move(self, game_state, maximizing_player, alpha = -2, beta = 2):
+
+    # Helper method to return the lowest and highest mate distance scores still possible for a mark.
+    # The player to move can at best win with this move and at worst lose with the next one.
+    def score_bounds(self, mark):
+        empty = self.game_state.count_empty()
+        if self.current_player() is mark:
+            return -(empty - 1), empty
+        return -empty, empty - 1
+    
+    # Method to scan the win lines for threats before searching.  Returns a verdict for the current
+    # player, 1 if they can win with this move, -1 if the opponent threatens two lines at once and
+    # only one can be blocked, None otherwise, and the moves still worth searching: the win, or the
+    # block when the opponent threatens one line, since every other move loses right away.
+    def forced_moves(self):
+        moves = self.possible_moves()
+        player = self.current_player()
+        cells = self.game_state.cells
+        wins, blocks = set(), set()
+        for line in WINNING_LINES:
+            marks = [cells[i] for i in line]
+            if marks.count(" ") == 1:
+                if marks.count(player) == 2:
+                    wins.add(line[marks.index(" ")])
+                elif marks.count(player.other) == 2:
+                    blocks.add(line[marks.index(" ")])
+        if wins:
+            return 1, [move for move in moves if move.cell_index in wins][:1]
+        if blocks:
+            verdict = -1 if len(blocks) > 1 else None
+            return verdict, [move for move in moves if move.cell_index in blocks]
+        return None, moves
+    
+    def find_best_move(self, game_state, maximizing_player, alpha = -SCORE_BOUND, beta = SCORE_BOUND, mate_distance = False, tactics = False):
         # uses the minimax algorithm with alpha-beta pruning to determine the best possible move for the current player
         # returns a Move object with a before and after state
         
@@ -330,7 +425,29 @@ class GameTreeNode:
             # debugger
             # print(game_state)
             # time.sleep(0.5)
-            return game_state.static_evaluation(self.current_player()), None
+            return game_state.static_evaluation(self.current_player(), mate_distance), None
+
+        # mate distance pruning: if the window lies outside the scores still possible, the
+        # result is already decided without searching any further
+        if mate_distance:
+            lowest, highest = game_state.score_bounds(maximizing_player)
+            if highest <= alpha:
+                return highest, None
+            if lowest >= beta:
+                return lowest, None
+            alpha, beta = max(alpha, lowest), min(beta, highest)
+
+        # tactical pre-pass: settle the node by its threats, or only search the forced moves
+        moves = game_state.possible_moves()
+        if tactics:
+            verdict, moves = game_state.forced_moves()
+            if verdict is not None:
+                # a win comes with this move and a loss with the next one
+                empty = game_state.game_state.count_empty()
+                score = (empty if verdict == 1 else empty - 1) if mate_distance else 1
+                if game_state.current_player() is not maximizing_player:
+                    verdict = -verdict
+                return verdict * score, moves[0]
         
         best_move = None
         
@@ -338,14 +455,14 @@ class GameTreeNode:
         if game_state.current_player() is maximizing_player:
             
             # initialize best_score to the lowest possible score
-            best_score = -2
+            best_score = -SCORE_BOUND
             
             # iterate through all the possible moves (children) of the current game state
-            for move in game_state.possible_moves():
+            for move in moves:
                 
                 next_state = move.after_state
                 # recursively call find_best_move on the child game state
-                score, _ = self.find_best_move(next_state, maximizing_player, alpha, beta)
+                score, _ = self.find_best_move(next_state, maximizing_player, alpha, beta, mate_distance, tactics)
                 
                 if score > best_score:
                     best_score = score
@@ -360,15 +477,15 @@ class GameTreeNode:
             
         # recursive case with current player as minimizing player
         else: 
-            best_score = 2
+            best_score = SCORE_BOUND
             best_move = None
             
             # iterate through all the possible moves (children) of the current game state
-            for move in game_state.possible_moves():
+            for move in moves:
 
                 next_state = move.after_state
                 # recursively call find_best_move on the child game state
-                score, _ = self.find_best_move(next_state, maximizing_player, alpha, beta)
+                score, _ = self.find_best_move(next_state, maximizing_player, alpha, beta, mate_distance, tactics)
                 
                 if score < best_score:
                     best_score = score
@@ -381,6 +498,9 @@ class GameTreeNode:
                 
             return best_score, best_move
 
+# sentinel for derived node state that has not been computed yet, since None is a valid winner
+_UNKNOWN = object()
+
 # Function main runtime code
 if __name__ == "__main__":
     
@@ -392,13 +512,19 @@ if __name__ == "__main__":
     time.sleep(5)
     
     start = time.time()
+    tracemalloc.start()
     
     # initialize the game tree
     tic_tac_toe = GameTree()
     
     print(tic_tac_toe.play_minimax())
     
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
     end = time.time()
     
+    for turn, turn_time in enumerate(tic_tac_toe.turn_times, start=1):
+        print(f"Turn {turn} search took {turn_time:.3f} seconds.")
+    print(f"Peak memory used by the game tree: {peak_memory / 1024 / 1024:.1f} MiB.")
     print(f"Game completed in {(end - start):.3f} seconds.")
     
\ No newline at end of file
@@ -1,5 +1,7 @@
 from gametree import WINNING_STATES, GameTree, GameTreeNode, Mark, Move, Grid
+import io
 import unittest
+from unittest import mock
 
 class GameTreeTest(unittest.TestCase):
     def test_init_and_properties(self):
@@ -296,6 +298,124 @@ class GameTreeNodeTest(unittest.TestCase):
         assert new_node.static_evaluation(Mark("X")) == 0
         assert new_node.static_evaluation(Mark("O")) == 0
                 
+    def test_mate_distance(self):
+        # X can win right away in cell 2, or later starting from cell 0
+        new_node = GameTreeNode(Grid("     XOOX"))
+        
+        score, best_move = new_node.find_best_move(new_node, Mark("X"))
+        assert score == 1
+        assert best_move.cell_index == 0
+        
+        # with mate distance the immediate win, leaving 4 empty cells, scores highest
+        score, best_move = new_node.find_best_move(new_node, Mark("X"), mate_distance = True)
+        assert score == 5
+        assert best_move.cell_index == 2
+        assert best_move.after_state.static_evaluation(Mark("X"), mate_distance = True) == 5
+        assert best_move.after_state.static_evaluation(Mark("O"), mate_distance = True) == -5
+        
+    def test_forced_moves(self):
+        # X can win in cell 2, which is the only move searched
+        new_node = GameTreeNode(Grid("XX OO    "))
+        verdict, moves = new_node.forced_moves()
+        assert verdict == 1
+        assert [move.cell_index for move in moves] == [2]
+        
+        # O must block X in cell 2
+        new_node = GameTreeNode(Grid("XX  O    "))
+        verdict, moves = new_node.forced_moves()
+        assert verdict is None
+        assert [move.cell_index for move in moves] == [2]
+        
+        # X threatens cells 2 and 6 at once, so O has lost
+        new_node = GameTreeNode(Grid("XX X O O "))
+        verdict, moves = new_node.forced_moves()
+        assert verdict == -1
+        score, best_move = new_node.find_best_move(new_node, Mark("O"), tactics = True)
+        assert score == -1
+        
+        # without threats every move is searched
+        verdict, moves = GameTreeNode(Grid()).forced_moves()
+        assert verdict is None
+        assert len(moves) == 9
+        
+    def test_possible_moves_are_materialized_once(self):
+        new_node = GameTreeNode(Grid("XOX      "))
+        
+        # the children are built on the first call and the same Move objects are returned afterwards
+        moves = new_node.possible_moves()
+        assert new_node.children == moves
+        assert all(first is second for first, second in zip(moves, new_node.possible_moves()))
+        
+        # grandchildren explored through a child are kept with it
+        grandchildren = moves[0].after_state.possible_moves()
+        assert new_node.possible_moves()[0].after_state.possible_moves()[0] is grandchildren[0]
+        
+        # releasing the children drops them, and they are rebuilt on the next call
+        new_node.release_children()
+        assert new_node.children is None
+        assert new_node.possible_moves()[0] is not moves[0]
+        assert len(new_node.possible_moves()) == 6
+        
+    def test_derived_state_is_cached(self):
+        new_node = GameTreeNode(Grid("XXXOO    "))
+        
+        assert new_node.winner() == Mark.CROSS
+        assert new_node.winner() is new_node.winner()
+        
+        # the cached winning cells can't be changed through the returned list
+        new_node.winning_cells().append(3)
+        assert new_node.winning_cells() == [0, 1, 2]
+        assert new_node.game_finished()
+        
+    def test_nodes_use_slots(self):
+        new_node = GameTreeNode(Grid("XOX      "))
+        move = new_node.possible_moves()[0]
+        
+        # nodes, moves and grids keep their attributes in slots instead of an instance __dict__
+        assert not hasattr(new_node, "__dict__")
+        assert not hasattr(move, "__dict__")
+        assert not hasattr(new_node.game_state, "__dict__")
+        
+    def test_minimax_game_reuses_the_explored_subtree(self):
+        game = GameTree()
+        game.render_board = lambda game_state: None
+        
+        assert game.play_minimax() == "This game ended in a draw."
+        
+        # one search time is recorded for every move of the game
+        assert len(game.turn_times) == len(game.game_played) - 1
+        
+        # the children of positions the game has moved past are released
+        assert all(node.children is None for node in game.game_played[:-1])
+        
+    def test_render_board_redraws_only_changed_cells(self):
+        class Terminal(io.StringIO):
+            def isatty(self):
+                return True
+        
+        game = GameTree()
+        game.render_delay = 0
+        with mock.patch("sys.stdout", Terminal()) as terminal:
+            game.render_board(GameTreeNode(Grid(" " * 9)))
+            assert terminal.getvalue().startswith("\033cCurrent board state:")
+            
+            # only the new mark is written, at its row and column
+            terminal.truncate(0)
+            terminal.seek(0)
+            game.render_board(GameTreeNode(Grid("    X    ")))
+            assert terminal.getvalue() == "\033[5;3HX\033[8;1H"
+            
+            # an unchanged board writes nothing
+            terminal.truncate(0)
+            terminal.seek(0)
+            game.render_board(GameTreeNode(Grid("    X    ")))
+            assert terminal.getvalue() == ""
+        
+        # nothing is drawn when the output is not a terminal
+        with mock.patch("sys.stdout", io.StringIO()) as log:
+            GameTree().render_board(GameTreeNode(Grid(" " * 9)))
+            assert log.getvalue() == ""
+        
     # def test_a_random_game(self):
     #     game = GameTree()
     #     game.play_random()
@@ -1,10 +1,13 @@
 from dataclasses import dataclass
-from typing import Callable, TypeAlias
+from typing import Callable, ClassVar, TypeAlias
 
 from tic_tac_toe.game.players import Player
+from tic_tac_toe.game.records import GameRecord, GameRecordWriter, changed_cell
 from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic.connect_four import ConnectFourState
 from tic_tac_toe.logic.exceptions import InvalidMove
 from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.ultimate import UltimateState
 from tic_tac_toe.logic.validators import validate_players
 
 ErrorHandler: TypeAlias = Callable[[Exception], None]
@@ -15,25 +18,61 @@ class TicTacToe:
     player2: Player
     renderer: Renderer
     error_handler: ErrorHandler | None = None
+    record_writer: GameRecordWriter | None = None
+
+    # game records pack tic-tac-toe cells only
+    recordable: ClassVar[bool] = True
 
     def __post_init__(self):
         validate_players(self.player1, self.player2)
+        if self.record_writer and not self.recordable:
+            raise ValueError(f"{type(self).__name__} games can't be recorded")
 
     def play(self, starting_mark: Mark = Mark("X")) -> None:
-        game_state = GameState(Grid(), starting_mark)
+        game_state = self.initial_state(starting_mark)
+        moves = []
         while True:
             self.renderer.render(game_state)
             if game_state.game_over:
                 break
             player = self.get_current_player(game_state)
             try:
-                game_state = player.make_move(game_state)
+                next_state = player.make_move(game_state)
             except InvalidMove as ex:
                 if self.error_handler:
                     self.error_handler(ex)
+            else:
+                if self.record_writer:
+                    moves.append(changed_cell(game_state, next_state))
+                game_state = next_state
+        if self.record_writer:
+            self.record_writer.write(GameRecord.of_game(starting_mark, moves, game_state))
+
+    def initial_state(self, starting_mark: Mark) -> GameState:
+        return GameState(Grid(), starting_mark)
 
     def get_current_player(self, game_state: GameState) -> Player:
         if game_state.current_mark is self.player1.mark:
             return self.player1
         else:
             return self.player2
+
+@dataclass(frozen=True)
+class ConnectFour(TicTacToe):
+
+    """Connect Four, played by the same players and renderers on a 7 x 6 board."""
+
+    recordable: ClassVar[bool] = False
+
+    def initial_state(self, starting_mark: Mark) -> ConnectFourState:
+        return ConnectFourState(starting_mark=starting_mark)
+
+@dataclass(frozen=True)
+class Ultimate(TicTacToe):
+
+    """Ultimate tic-tac-toe, played by the same players and renderers on nine sub-boards."""
+
+    recordable: ClassVar[bool] = False
+
+    def initial_state(self, starting_mark: Mark) -> UltimateState:
+        return UltimateState(starting_mark=starting_mark)
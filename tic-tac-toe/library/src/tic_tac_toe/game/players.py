@@ -1,11 +1,26 @@
+"""Human and computer players.
+
+Every computer player imports its search when it is created, not when this module is, so
+starting a game only imports the searches of the players in it, and not the process and
+thread pools, shared memory or numpy some of the others bring in.
+"""
+
+from __future__ import annotations
+
 import abc
 import random
 import time
+from array import array
+from typing import TYPE_CHECKING
 
+from tic_tac_toe.logic.budget import SearchStats
 from tic_tac_toe.logic.exceptions import InvalidMove
-from tic_tac_toe.logic.minimax import find_best_move, pruned_find_best_move
 from tic_tac_toe.logic.models import GameState, Mark, Move
 
+if TYPE_CHECKING:
+    from tic_tac_toe.logic.connect_four_search import ConnectFourSearch
+    from tic_tac_toe.logic.ultimate_search import UltimateSearch
+
 class Player(metaclass=abc.ABCMeta):
     def __init__(self, mark: Mark) -> None:
         self.mark = mark
@@ -43,9 +58,103 @@ class RandomComputerPlayer(ComputerPlayer):
             return None
 
 class MinimaxComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, delay_seconds: float = 0.25) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.search_tree import SearchTree
+
+        # search results are kept between turns, so later turns only search what is new,
+        # and mate-distance scores make won games end in the fewest moves
+        self.search_tree = SearchTree(mark, pruned=False, mate_distance=True)
+
     def get_computer_move(self, game_state: GameState) -> Move | None:
-        return find_best_move(game_state)
+        return self.search_tree.find_best_move(game_state)
     
 class PrunedMinimaxComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, delay_seconds: float = 0.25) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.search_tree import SearchTree
+
+        self.search_tree = SearchTree(mark, pruned=True, mate_distance=True)
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        return self.search_tree.find_best_move(game_state)
+
+class PVSComputerPlayer(ComputerPlayer):
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        from tic_tac_toe.logic import pvs
+
+        return pvs.find_best_move(game_state, mate_distance=True)
+
+class MTDFComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, delay_seconds: float = 0.25) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.mtdf import MTDFSearch
+
+        # the memory of proven bounds is kept between turns, like the minimax players' search tree
+        self.search = MTDFSearch(mate_distance=True)
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        return self.search.find_best_move(game_state)
+
+class ThreadedComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, delay_seconds: float = 0.25, workers: int = 4) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.threaded_search import ThreadedSearch
+
+        self.search = ThreadedSearch(workers, mate_distance=True)
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        return self.search.find_best_move(game_state)
+
+class LearnedComputerPlayer(ComputerPlayer):
+    def __init__(
+        self, mark: Mark, delay_seconds: float = 0.25, policy: array | str = "policy.bin"
+    ) -> None:
+        super().__init__(mark, delay_seconds)
+        from tic_tac_toe.logic.learning import load_policy
+
+        # a policy trained by tic_tac_toe.logic.learning, or the path it was saved to
+        self.policy = load_policy(policy) if isinstance(policy, str) else policy
+
     def get_computer_move(self, game_state: GameState) -> Move | None:
-        return pruned_find_best_move(game_state)
\ No newline at end of file
+        from tic_tac_toe.logic.learning import NO_MOVE
+
+        cell = self.policy[game_state.index]
+        if game_state.game_over or cell == NO_MOVE:
+            return None
+        return game_state.make_move_to(cell)
+
+class TimedComputerPlayer(ComputerPlayer, metaclass=abc.ABCMeta):
+    def __init__(
+        self, mark: Mark, delay_seconds: float = 0.25, time_budget: float = 1.0
+    ) -> None:
+        super().__init__(mark, delay_seconds)
+        # the transposition table is kept between turns, like the minimax search trees
+        self.search = self.make_search(time_budget)
+        self.total = SearchStats()
+
+    @abc.abstractmethod
+    def make_search(self, time_budget: float):
+        """Return a search that answers find_best_move_to within the time budget."""
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        index = self.search.find_best_move_to(game_state)
+        stats = self.search.stats
+        self.total.nodes += stats.nodes
+        self.total.seconds += stats.seconds
+        self.total.depth = max(self.total.depth, stats.depth)
+        if index is None:
+            return None
+        return game_state.make_move_to(index)
+
+class ConnectFourComputerPlayer(TimedComputerPlayer):
+    def make_search(self, time_budget: float) -> ConnectFourSearch:
+        from tic_tac_toe.logic.connect_four_search import ConnectFourSearch
+
+        return ConnectFourSearch(time_budget)
+
+class UltimateComputerPlayer(TimedComputerPlayer):
+    def make_search(self, time_budget: float) -> UltimateSearch:
+        from tic_tac_toe.logic.ultimate_search import UltimateSearch
+
+        return UltimateSearch(time_budget)
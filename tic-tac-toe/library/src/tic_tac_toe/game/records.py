@@ -0,0 +1,177 @@
+"""Compact, append-only storage for played games.
+
+A record file starts with an 8 byte header followed by fixed-size 6 byte records::
+
+    byte 0      bit 0 starting mark (0 = X, 1 = O), bits 1-2 outcome, bits 3-6 number of moves
+    bytes 1-5   the cell index of each move in turn, one 4 bit nibble per move, low nibble first
+
+Since the first byte of a record holds its starting mark, outcome and length, a reader can
+count or filter games straight from a memory map without unpacking their moves.
+"""
+
+from __future__ import annotations
+
+import enum
+import mmap
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator
+
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+MAGIC = b"TTTR"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+RECORD_SIZE = 6
+MAX_MOVES = 9
+
+class Outcome(enum.IntEnum):
+    UNFINISHED = 0
+    CROSS_WINS = 1
+    NAUGHT_WINS = 2
+    TIE = 3
+
+    @classmethod
+    def of(cls, game_state: GameState) -> "Outcome":
+        if game_state.winner is Mark.CROSS:
+            return cls.CROSS_WINS
+        if game_state.winner is Mark.NAUGHT:
+            return cls.NAUGHT_WINS
+        if game_state.tie:
+            return cls.TIE
+        return cls.UNFINISHED
+
+@dataclass(frozen=True)
+class GameRecord:
+    starting_mark: Mark
+    moves: tuple[int, ...]
+    outcome: Outcome
+
+    def __post_init__(self) -> None:
+        if len(self.moves) > MAX_MOVES or any(not 0 <= move < 9 for move in self.moves):
+            raise ValueError("A game has at most 9 moves to cells 0 through 8")
+
+    @classmethod
+    def of_game(cls, starting_mark: Mark, moves: list[int], final_state: GameState) -> "GameRecord":
+        return cls(starting_mark, tuple(moves), Outcome.of(final_state))
+
+    def pack(self) -> bytes:
+        data = bytearray(RECORD_SIZE)
+        data[0] = (self.starting_mark is Mark.NAUGHT) | self.outcome << 1 | len(self.moves) << 3
+        for ply, move in enumerate(self.moves):
+            data[1 + ply // 2] |= move << 4 * (ply % 2)
+        return bytes(data)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "GameRecord":
+        flags = data[0]
+        moves = tuple(
+            data[1 + ply // 2] >> 4 * (ply % 2) & 0xF for ply in range(flags >> 3 & 0xF)
+        )
+        return cls(Mark.NAUGHT if flags & 1 else Mark.CROSS, moves, Outcome(flags >> 1 & 0b11))
+
+    def replay(self) -> Iterator[GameState]:
+        """Yield every game state of the game, from the empty grid, rebuilding them on demand."""
+        game_state = GameState(Grid(), self.starting_mark)
+        yield game_state
+        for move in self.moves:
+            game_state = game_state.make_move_to(move).after_state
+            yield game_state
+
+    def state_at(self, ply: int) -> GameState:
+        for current_ply, game_state in enumerate(self.replay()):
+            if current_ply == ply:
+                return game_state
+        raise IndexError("The game has fewer moves")
+
+def changed_cell(before: GameState, after: GameState) -> int:
+    """Return the index of the cell a move filled between two consecutive game states."""
+    for index, (cell, other) in enumerate(zip(before.grid.cells, after.grid.cells)):
+        if cell != other:
+            return index
+    raise ValueError("No move was made")
+
+class GameRecordWriter:
+
+    """Buffered, append-only writer of game records."""
+
+    def __init__(self, path: str | os.PathLike, buffer_size: int = 64 * 1024) -> None:
+        self.path = path
+        self._file: BinaryIO = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(HEADER)
+
+    def write(self, record: GameRecord) -> None:
+        self._file.write(record.pack())
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class GameRecordReader:
+
+    """Memory-mapped reader that iterates and filters game records without loading the file."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        with open(path, "rb") as record_file:
+            if record_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a game record file")
+            record_file.seek(0, os.SEEK_END)
+            size = record_file.tell()
+            self._map = mmap.mmap(record_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = (size - len(HEADER)) // RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> GameRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Game record index out of range")
+        offset = len(HEADER) + index * RECORD_SIZE
+        return GameRecord.unpack(self._map[offset : offset + RECORD_SIZE])
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for index in range(self._count):
+            yield self[index]
+
+    def filter(
+        self,
+        outcome: Outcome | None = None,
+        starting_mark: Mark | None = None,
+        moves: int | None = None,
+    ) -> Iterator[GameRecord]:
+        """Yield only the games matching all of the given criteria, checking the flags byte first."""
+        for index in range(self._count):
+            flags = self._map[len(HEADER) + index * RECORD_SIZE]
+            if outcome is not None and flags >> 1 & 0b11 != outcome:
+                continue
+            if starting_mark is not None and bool(flags & 1) != (starting_mark is Mark.NAUGHT):
+                continue
+            if moves is not None and flags >> 3 & 0xF != moves:
+                continue
+            yield self[index]
+
+    def outcomes(self) -> dict[Outcome, int]:
+        counts = dict.fromkeys(Outcome, 0)
+        for index in range(self._count):
+            counts[Outcome(self._map[len(HEADER) + index * RECORD_SIZE] >> 1 & 0b11)] += 1
+        return counts
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "GameRecordReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
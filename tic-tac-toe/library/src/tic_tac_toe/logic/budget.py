@@ -0,0 +1,43 @@
+"""Time budgets for the real-time searches of the larger games.
+
+Those games are far too big to search to the end, so their searches deepen iteratively
+until the budget runs out, reading the clock only every so many nodes.
+"""
+
+import time
+from dataclasses import dataclass
+
+class SearchTimeout(Exception):
+    """Raised inside a search when the time budget has run out."""
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    seconds: float = 0.0
+    depth: int = 0
+    score: int = 0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+class Deadline:
+
+    """Counts the nodes of one search and stops it once its time budget has run out."""
+
+    # the clock is only read every so many nodes
+    CHECK_EVERY = 1024
+
+    def __init__(self, time_budget: float, stats: SearchStats) -> None:
+        self.start = time.perf_counter()
+        self.end = self.start + time_budget
+        self.stats = stats
+
+    def visit(self) -> None:
+        stats = self.stats
+        stats.nodes += 1
+        if stats.nodes % self.CHECK_EVERY == 0 and time.perf_counter() > self.end:
+            raise SearchTimeout
+
+    def stop(self) -> None:
+        self.stats.seconds = time.perf_counter() - self.start
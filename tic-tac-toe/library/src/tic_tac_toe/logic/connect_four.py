@@ -0,0 +1,198 @@
+"""Connect Four on a 7 x 6 board with gravity, represented by bitboards.
+
+Each player's stones are an integer with one bit per cell, laid out column by column
+from the bottom up with one spare bit on top of every column::
+
+     6 13 20 27 34 41 48
+     5 12 19 26 33 40 47
+     4 11 18 25 32 39 46
+     3 10 17 24 31 38 45
+     2  9 16 23 30 37 44
+     1  8 15 22 29 36 43
+     0  7 14 21 28 35 42
+
+The spare row keeps shifted lines from wrapping into the next column, so four in a row
+in any direction is found with a couple of shifts and masks.
+"""
+
+from dataclasses import dataclass
+
+from tic_tac_toe.logic.exceptions import InvalidGameState, InvalidMove, UnknownGameScore
+from tic_tac_toe.logic.models import Mark, Move, derived, set_slot
+
+WIDTH = 7
+HEIGHT = 6
+CELLS = WIDTH * HEIGHT
+COLUMN_HEIGHT = HEIGHT + 1
+
+# columns ordered from the center outwards, the order searches try them in
+CENTER_FIRST = tuple(sorted(range(WIDTH), key=lambda column: abs(WIDTH // 2 - column)))
+
+BOTTOM_ROW = sum(1 << column * COLUMN_HEIGHT for column in range(WIDTH))
+BOARD = BOTTOM_ROW * ((1 << HEIGHT) - 1)
+
+# vertical, horizontal and both diagonal directions as bit shifts
+DIRECTIONS = (1, COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1)
+
+def bottom(column: int) -> int:
+    return 1 << column * COLUMN_HEIGHT
+
+def top(column: int) -> int:
+    return 1 << HEIGHT - 1 + column * COLUMN_HEIGHT
+
+def column_cells(column: int) -> int:
+    return ((1 << HEIGHT) - 1) << column * COLUMN_HEIGHT
+
+def bit(column: int, row: int) -> int:
+    return 1 << column * COLUMN_HEIGHT + row
+
+def cell_index(column: int, row: int) -> int:
+    """Return the index of a cell when the board is read row by row from the top left."""
+    return (HEIGHT - 1 - row) * WIDTH + column
+
+def has_four(stones: int) -> bool:
+    for shift in DIRECTIONS:
+        pairs = stones & stones >> shift
+        if pairs & pairs >> 2 * shift:
+            return True
+    return False
+
+def lines() -> list[int]:
+    """Return the bitmask of every line of four cells on the board."""
+    masks = []
+    for column in range(WIDTH):
+        for row in range(HEIGHT):
+            for d_column, d_row in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_column, end_row = column + 3 * d_column, row + 3 * d_row
+                if 0 <= end_column < WIDTH and 0 <= end_row < HEIGHT:
+                    masks.append(
+                        sum(bit(column + i * d_column, row + i * d_row) for i in range(4))
+                    )
+    return masks
+
+LINES = tuple(lines())
+
+@dataclass(frozen=True, slots=True)
+class ConnectFourState:
+
+    """A Connect Four position, playing the role GameState plays for tic-tac-toe."""
+
+    crosses: int = 0
+    naughts: int = 0
+    starting_mark: Mark = Mark("X")
+
+    mask: int = derived()
+    move_count: int = derived()
+    current_mark: Mark = derived()
+    winner: Mark | None = derived()
+    tie: bool = derived()
+    game_over: bool = derived()
+
+    def __post_init__(self) -> None:
+        validate_connect_four_state(self)
+        set_slot(self, "mask", self.crosses | self.naughts)
+        set_slot(self, "move_count", self.mask.bit_count())
+        set_slot(
+            self,
+            "current_mark",
+            self.starting_mark if self.move_count % 2 == 0 else self.starting_mark.other,
+        )
+        winner = None
+        if has_four(self.crosses):
+            winner = Mark.CROSS
+        elif has_four(self.naughts):
+            winner = Mark.NAUGHT
+        set_slot(self, "winner", winner)
+        set_slot(self, "tie", winner is None and self.move_count == CELLS)
+        set_slot(self, "game_over", winner is not None or self.tie)
+
+    def stones(self, mark: Mark) -> int:
+        return self.crosses if mark is Mark.CROSS else self.naughts
+
+    @property
+    def game_not_started(self) -> bool:
+        return self.move_count == 0
+
+    @property
+    def cells(self) -> str:
+        """The board as 42 cells of X, O or space, row by row from the top left."""
+        cells = [" "] * CELLS
+        for column in range(WIDTH):
+            for row in range(HEIGHT):
+                if self.crosses & bit(column, row):
+                    cells[cell_index(column, row)] = "X"
+                elif self.naughts & bit(column, row):
+                    cells[cell_index(column, row)] = "O"
+        return "".join(cells)
+
+    @property
+    def winning_cells(self) -> list[int]:
+        if self.winner is None:
+            return []
+        stones = self.stones(self.winner)
+        for line in LINES:
+            if stones & line == line:
+                return sorted(
+                    cell_index(column, row)
+                    for column in range(WIDTH)
+                    for row in range(HEIGHT)
+                    if line & bit(column, row)
+                )
+        return []
+
+    def can_play(self, column: int) -> bool:
+        return 0 <= column < WIDTH and not self.mask & top(column)
+
+    @property
+    def possible_moves(self) -> list[Move]:
+        if self.game_over:
+            return []
+        return [self.make_move_to(column) for column in range(WIDTH) if self.can_play(column)]
+
+    def make_move_to(self, column: int) -> Move:
+        if not self.can_play(column):
+            raise InvalidMove("Column is full")
+        stone = (self.mask + bottom(column)) & column_cells(column)
+        row = stone.bit_length() - 1 - column * COLUMN_HEIGHT
+        crosses, naughts = self.crosses, self.naughts
+        if self.current_mark is Mark.CROSS:
+            crosses |= stone
+        else:
+            naughts |= stone
+        return Move(
+            mark=self.current_mark,
+            cell_index=cell_index(column, row),
+            before_state=self,
+            after_state=ConnectFourState(crosses, naughts, self.starting_mark),
+        )
+
+    def evaluate_score(self, mark: Mark) -> int:
+        # perform static evaluation of scores for terminal game states
+        if self.game_over:
+            if self.tie:
+                return 0
+            return 1 if self.winner is mark else -1
+        raise UnknownGameScore("Game is not over yet")
+
+def validate_connect_four_state(game_state: ConnectFourState) -> None:
+    crosses, naughts = game_state.crosses, game_state.naughts
+    if crosses & naughts:
+        raise InvalidGameState("A cell can't hold both marks")
+    if (crosses | naughts) & ~BOARD:
+        raise InvalidGameState("Marks must be on the board")
+    for column in range(WIDTH):
+        stack = (crosses | naughts) >> column * COLUMN_HEIGHT & (1 << HEIGHT) - 1
+        # stones rest on the bottom or on other stones, so every column fills up from the bottom
+        if stack & stack + 1:
+            raise InvalidGameState("Marks must be stacked from the bottom of each column")
+    x_count, o_count = crosses.bit_count(), naughts.bit_count()
+    if abs(x_count - o_count) > 1:
+        raise InvalidGameState("Wrong number of Xs and Os")
+    if x_count > o_count and game_state.starting_mark != "X":
+        raise InvalidGameState("Wrong starting mark")
+    if o_count > x_count and game_state.starting_mark != "O":
+        raise InvalidGameState("Wrong starting mark")
+
+def column_of(move: Move) -> int:
+    """Return the column a Connect Four move was played in."""
+    return move.cell_index % WIDTH
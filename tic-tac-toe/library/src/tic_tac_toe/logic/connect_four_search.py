@@ -0,0 +1,169 @@
+"""Real-time alpha-beta search for Connect Four.
+
+Plain minimax over Connect Four's trillions of positions would never finish, so this search
+works on bare bitboards instead of ConnectFourState objects, negamax style:
+
+- ``current`` holds the stones of the side to move and ``mask`` all stones, so a move is
+  two integer operations and ``current + mask`` is a unique key for the position
+- a transposition table keeps bounds and the best column of every position searched
+- columns are tried best-known first, then from the center outwards
+- iterative deepening stops when the time budget runs out, keeping the best move of the
+  deepest completed iteration, and positions past the horizon get a heuristic score
+"""
+
+from tic_tac_toe.logic.budget import Deadline, SearchStats, SearchTimeout
+from tic_tac_toe.logic.connect_four import (
+    CELLS,
+    CENTER_FIRST,
+    LINES,
+    ConnectFourState,
+    bottom,
+    column_cells,
+    has_four,
+    top,
+)
+from tic_tac_toe.logic.shared_table import SharedTable
+
+# wins score above any heuristic score, and sooner wins score higher
+WIN_SCORE = 10_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# weights of a line of four holding only one side's stones, by the number of those stones
+LINE_WEIGHTS = (0, 1, 4, 16, 0)
+
+class ConnectFourSearch:
+
+    """Alpha-beta search with a transposition table, kept between the moves of a game."""
+
+    def __init__(
+        self,
+        time_budget: float = 1.0,
+        max_table_size: int = 1_000_000,
+        table: SharedTable | None = None,
+    ) -> None:
+        self.time_budget = time_budget
+        self.max_table_size = max_table_size
+        # a private dict, unless the table is shared with searches in other processes
+        self.table: dict[int, tuple[int, int, int, int]] | SharedTable = {} if table is None else table
+        self.stats = SearchStats()
+        self._deadline = Deadline(0.0, self.stats)
+
+    def find_best_move_to(self, game_state: ConnectFourState) -> int | None:
+        """Return the column to play, as passed to ConnectFourState.make_move_to."""
+        current = game_state.stones(game_state.current_mark)
+        mask = game_state.mask
+        columns = [column for column in CENTER_FIRST if game_state.can_play(column)]
+        if game_state.game_over or not columns:
+            return None
+
+        self.stats = SearchStats()
+        self._deadline = Deadline(self.time_budget, self.stats)
+        # a shared table has a fixed size and replaces its own entries
+        if isinstance(self.table, dict) and len(self.table) > self.max_table_size:
+            self.table.clear()
+
+        best_column = columns[0]
+        moves = game_state.move_count
+        try:
+            for depth in range(1, CELLS - moves + 1):
+                score, column = self.search_root(current, mask, moves, depth, columns)
+                best_column = column
+                self.stats.depth, self.stats.score = depth, score
+                # a proven result can't change with more depth
+                if abs(score) > WIN_SCORE // 2:
+                    break
+        except SearchTimeout:
+            pass
+        self._deadline.stop()
+        return best_column
+
+    def search_root(
+        self, current: int, mask: int, moves: int, depth: int, columns: list[int]
+    ) -> tuple[int, int]:
+        entry = self.table.get(current + mask)
+        if entry and entry[3] in columns:
+            columns = [entry[3]] + [column for column in columns if column != entry[3]]
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_column = columns[0]
+        for column in columns:
+            score = -self.negamax(*play(current, mask, column), moves + 1, depth - 1, -beta, -alpha)
+            if score > alpha:
+                alpha, best_column = score, column
+        return alpha, best_column
+
+    def negamax(self, current: int, mask: int, moves: int, depth: int, alpha: int, beta: int) -> int:
+        self._deadline.visit()
+
+        # the opponent just moved, so only they can have won
+        if has_four(current ^ mask):
+            return -(WIN_SCORE - moves)
+        if moves == CELLS:
+            return 0
+        if depth == 0:
+            return evaluate(current, mask)
+
+        alpha_before = alpha
+        key = current + mask
+        best_column = -1
+        entry = self.table.get(key)
+        if entry:
+            entry_depth, flag, value, best_column = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        # a win on this move can't be beaten, so look for one before searching anything
+        for column in CENTER_FIRST:
+            if not mask & top(column) and has_four(current | new_stone(mask, column)):
+                return WIN_SCORE - moves - 1
+
+        best_score = -WIN_SCORE * 2
+        for column in ordered_columns(best_column):
+            if mask & top(column):
+                continue
+            score = -self.negamax(*play(current, mask, column), moves + 1, depth - 1, -beta, -alpha)
+            if score > best_score:
+                best_score, best_column = score, column
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_before:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, flag, best_score, best_column)
+        return best_score
+
+def new_stone(mask: int, column: int) -> int:
+    """Return the bit of the stone a move in a column would place."""
+    return (mask + bottom(column)) & column_cells(column)
+
+def play(current: int, mask: int, column: int) -> tuple[int, int]:
+    """Return the position after the side to move plays a column, from the opponent's side."""
+    return current ^ mask, mask | mask + bottom(column)
+
+def ordered_columns(best_column: int) -> tuple[int, ...]:
+    if best_column < 0:
+        return CENTER_FIRST
+    return (best_column,) + tuple(column for column in CENTER_FIRST if column != best_column)
+
+def evaluate(current: int, mask: int) -> int:
+    """Score a position for the side to move by the lines of four each side can still fill."""
+    opponent = current ^ mask
+    score = 0
+    for line in LINES:
+        if not line & opponent:
+            score += LINE_WEIGHTS[(line & current).bit_count()]
+        elif not line & current:
+            score -= LINE_WEIGHTS[(line & opponent).bit_count()]
+    return score
@@ -0,0 +1,172 @@
+"""Opt-in counters for the hot paths of tic_tac_toe.logic.models.
+
+Nothing here runs unless it is enabled, either for a block of code::
+
+    with instrumentation.counting() as counters:
+        find_best_move(game_state)
+    print(counters.report())
+
+or for the whole process by setting the ``TIC_TAC_TOE_COUNTERS`` environment variable
+to ``1`` (report on stderr at exit) or to the path of a file to write the report to.
+Enabling wraps the model methods, validators and derived-value slots in place and
+disabling puts the originals back, so the disabled path is the unmodified code.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+ENVIRONMENT_VARIABLE = "TIC_TAC_TOE_COUNTERS"
+
+@dataclass
+class Counter:
+    calls: int = 0
+    seconds: float = 0.0
+    # only derived values are reused, for everything else this stays 0
+    reuses: int = 0
+
+@dataclass
+class Counters:
+    counters: dict[str, Counter] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Counter:
+        if name not in self.counters:
+            self.counters[name] = Counter()
+        return self.counters[name]
+
+    def report(self) -> str:
+        lines = [f"{'hot path':<36}{'calls':>10}{'reuses':>10}{'seconds':>10}{'us/call':>10}"]
+        for name, counter in sorted(
+            self.counters.items(), key=lambda item: item[1].seconds, reverse=True
+        ):
+            per_call = counter.seconds / counter.calls * 1e6 if counter.calls else 0.0
+            lines.append(
+                f"{name:<36}{counter.calls:>10}{counter.reuses:>10}"
+                f"{counter.seconds:>10.3f}{per_call:>10.2f}"
+            )
+        return "\n".join(lines)
+
+class CountingSlot:
+    """Stands in for the slot of a derived value, counting its computations and reuses.
+
+    Derived values are stored once, in __post_init__, and only read afterwards, so every
+    store is a computation and every later read a reuse. Reads made while a __post_init__
+    runs, like game_over reading winner and tie, are part of a computation and not counted.
+    The time spent computing them is part of the __post_init__ counters.
+    """
+
+    def __init__(self, member: Any, counter: Counter) -> None:
+        self.member = member
+        self.counter = counter
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        if not _initializing:
+            self.counter.reuses += 1
+        return self.member.__get__(instance, owner)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        self.counter.calls += 1
+        self.member.__set__(instance, value)
+
+# the number of __post_init__ calls running, nested when one builds another object
+_initializing = 0
+
+def initializing(function: Callable) -> Callable:
+    """Wrap a __post_init__ so the derived values read while it runs aren't counted as reuses."""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        global _initializing
+        _initializing += 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _initializing -= 1
+    return wrapper
+
+def counted(function: Callable, counter: Counter) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counter.seconds += time.perf_counter() - start
+            counter.calls += 1
+    return wrapper
+
+_active: Counters | None = None
+_originals: list[tuple[Any, str, Any]] = []
+
+def enable(counters: Counters | None = None) -> Counters:
+    """Start counting, wrapping the hot paths in place."""
+    global _active
+    from tic_tac_toe.logic import models
+
+    if _active is not None:
+        return _active
+    _active = counters = counters or Counters()
+
+    def patch(owner: Any, name: str, replacement: Any) -> None:
+        _originals.append((owner, name, vars(owner)[name]))
+        setattr(owner, name, replacement)
+
+    patch(models.Grid, "__post_init__", initializing(counted(models.Grid.__post_init__, counters["Grid.__post_init__"])))
+    patch(models, "validate_grid", counted(models.validate_grid, counters["validate_grid"]))
+    patch(
+        models.GameState,
+        "__post_init__",
+        initializing(counted(models.GameState.__post_init__, counters["GameState.__post_init__"])),
+    )
+    patch(models, "validate_game_state", counted(models.validate_game_state, counters["validate_game_state"]))
+    patch(models.GameState, "make_move_to", counted(models.GameState.make_move_to, counters["GameState.make_move_to"]))
+    patch(models.GameState, "generate_moves", counted(models.GameState.generate_moves, counters["possible_moves materialized"]))
+
+    # winner evaluations are counted as the computations of the winner slot
+    for cls in (models.Grid, models.GameState):
+        for derived in fields(cls):
+            if not derived.init and not derived.name.startswith("_"):
+                name = derived.name
+                patch(cls, name, CountingSlot(vars(cls)[name], counters[f"{cls.__name__}.{name}"]))
+    return counters
+
+def disable() -> Counters | None:
+    """Stop counting and restore the original hot paths."""
+    global _active
+    counters, _active = _active, None
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+    return counters
+
+@contextmanager
+def counting() -> Iterator[Counters]:
+    counters = enable()
+    try:
+        yield counters
+    finally:
+        disable()
+
+def enable_from_environment() -> None:
+    """Count for the whole process and dump the report at exit, if asked to by the environment."""
+    destination = os.environ.get(ENVIRONMENT_VARIABLE)
+    if not destination or destination == "0":
+        return
+    counters = enable()
+
+    def dump() -> None:
+        if destination == "1":
+            print(counters.report(), file=sys.stderr)
+        else:
+            with open(destination, "w") as report_file:
+                print(counters.report(), file=report_file)
+
+    atexit.register(dump)
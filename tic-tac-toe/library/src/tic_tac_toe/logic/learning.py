@@ -0,0 +1,239 @@
+"""Tabular self-play Q-learning over the encoded positions of the lookup tables.
+
+Training never builds a GameState: thousands of games are played at once as a NumPy
+array of state indices, the same indices ``GameState.index`` holds (the grid index, offset
+by the starting mark), and every ply is a handful of batched array operations:
+
+- moves are chosen epsilon-greedily from a Q table of shape (states, 9 cells)
+- Q values are scored for the player to move, so the target of a move is the reward
+  of a finished game (1 for the win, 0 for a draw) or minus the opponent's best Q value
+- exploration decays linearly as training proceeds
+
+The learned policy is the best cell of every state, saved as a compact ``array`` of
+bytes (39,366 of them) that a player can load and look moves up in without NumPy.
+
+NumPy is an optional dependency, needed only for training and evaluation::
+
+    python3 -m pip install "library/[learning]"
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+from tic_tac_toe.logic import tables
+
+if TYPE_CHECKING:
+    import numpy as np
+
+STATES = 2 * tables.GRID_COUNT
+NO_MOVE = -1
+
+class Environment(NamedTuple):
+    # next state for every state and cell, or NO_MOVE when the cell can't be played
+    children: np.ndarray
+    terminal: np.ndarray
+    # reward of reaching a state for the player who just moved into it
+    reward: np.ndarray
+    # game-theoretic value of every state for the player to move
+    value: np.ndarray
+    # legal, unfinished states reachable from the empty board with either starting mark
+    reachable: np.ndarray
+
+class Progress(NamedTuple):
+    games: int
+    seconds: float
+    epsilon: float
+    optimal_moves: float
+    record: Record
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+class Record(NamedTuple):
+    wins: int
+    draws: int
+    losses: int
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+def require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            'Training needs NumPy, install it with: python3 -m pip install "library/[learning]"'
+        ) from None
+    return numpy
+
+def environment() -> Environment:
+    """Build the transition and reward arrays of every encoded state."""
+    np = require_numpy()
+    lookup = tables.tables()
+    grids = np.arange(tables.GRID_COUNT)
+    states = np.arange(STATES)
+    grid_of = states % tables.GRID_COUNT
+
+    winner = np.frombuffer(lookup.winner, dtype=np.int8)[grid_of]
+    tie = np.frombuffer(lookup.tie, dtype=np.int8)[grid_of].astype(bool)
+    legal = np.frombuffer(lookup.legality, dtype=np.int8) == tables.LEGAL
+    mover = np.frombuffer(lookup.current_mark, dtype=np.int8).astype(np.int64)
+    terminal = (winner != tables.EMPTY) | tie
+    reward = (winner != tables.EMPTY).astype(np.float32)
+
+    powers = np.array(tables.POWERS)
+    digits = grids[:, None] // powers % 3
+    empty = (digits == tables.EMPTY)[grid_of]
+    playable = empty & (legal & ~terminal)[:, None]
+    children = np.where(playable, states[:, None] + powers * mover[:, None], NO_MOVE)
+
+    marks = (digits != tables.EMPTY).sum(axis=1)[grid_of]
+    value = solve(children, terminal, reward, marks)
+    reachable = reachable_states(children) & ~terminal
+    return Environment(children, terminal, reward, value, reachable)
+
+def solve(
+    children: np.ndarray, terminal: np.ndarray, reward: np.ndarray, marks: np.ndarray
+) -> np.ndarray:
+    """Compute minimax values by retrograde analysis, from full boards back to empty ones."""
+    np = require_numpy()
+    value = np.zeros(STATES, dtype=np.int8)
+    # the player to move in a won position is the one who lost it
+    value[terminal] = -reward[terminal]
+    for count in range(tables.CELLS - 1, -1, -1):
+        layer = np.flatnonzero((marks == count) & ~terminal)
+        moves = children[layer]
+        scores = np.where(moves >= 0, -value[moves], -2)
+        value[layer] = scores.max(axis=1)
+    return value
+
+def reachable_states(children: np.ndarray) -> np.ndarray:
+    np = require_numpy()
+    reachable = np.zeros(STATES, dtype=bool)
+    frontier = np.array([0, tables.GRID_COUNT])
+    while frontier.size:
+        reachable[frontier] = True
+        frontier = np.unique(children[frontier])
+        frontier = frontier[frontier >= 0]
+    return reachable
+
+def train(
+    games: int = 200_000,
+    batch_size: int = 1_024,
+    learning_rate: float = 0.5,
+    start_epsilon: float = 1.0,
+    end_epsilon: float = 0.05,
+    report_every: int = 50_000,
+    seed: int | None = None,
+) -> Iterator[tuple[Progress, np.ndarray, Environment]]:
+    """Train by self-play, yielding the progress and Q table every ``report_every`` games."""
+    np = require_numpy()
+    env = environment()
+    rng = np.random.default_rng(seed)
+    q = np.zeros((STATES, tables.CELLS), dtype=np.float32)
+    roots = np.array([0, tables.GRID_COUNT])
+    batch = rng.choice(roots, batch_size)
+    rows = np.arange(batch_size)
+
+    finished = 0
+    next_report = report_every
+    training_seconds = 0.0
+    start = time.perf_counter()
+    while finished < games:
+        epsilon = start_epsilon + (end_epsilon - start_epsilon) * min(finished / games, 1.0)
+        moves = env.children[batch]
+        playable = moves >= 0
+        # random noise breaks ties between equal Q values and picks the exploring moves
+        noise = rng.random(moves.shape)
+        greedy = np.where(playable, q[batch] + noise * 1e-3, -np.inf).argmax(axis=1)
+        explore = np.where(playable, noise, -1.0).argmax(axis=1)
+        cells = np.where(rng.random(batch_size) < epsilon, explore, greedy)
+
+        after = moves[rows, cells]
+        replies = env.children[after]
+        best_reply = np.where(replies >= 0, q[after], -np.inf).max(axis=1)
+        done = env.terminal[after]
+        target = np.where(done, env.reward[after], -np.where(done, 0, best_reply))
+        q[batch, cells] += learning_rate * (target - q[batch, cells])
+
+        finished += int(done.sum())
+        batch = np.where(done, rng.choice(roots, batch_size), after)
+        if finished >= next_report or finished >= games:
+            next_report += report_every
+            training_seconds += time.perf_counter() - start
+            policy = policy_of(q, env)
+            progress = Progress(
+                finished,
+                training_seconds,
+                float(epsilon),
+                optimal_move_rate(policy, env),
+                against_minimax(policy, env),
+            )
+            yield progress, q, env
+            # evaluating isn't training, so it doesn't count against the throughput
+            start = time.perf_counter()
+
+def policy_of(q: np.ndarray, env: Environment) -> array:
+    """Return the best playable cell of every state, or NO_MOVE where there is none."""
+    np = require_numpy()
+    playable = env.children >= 0
+    best = np.where(playable, q, -np.inf).argmax(axis=1)
+    best[~playable.any(axis=1)] = NO_MOVE
+    return array("b", best.astype(np.int8).tobytes())
+
+def optimal_move_rate(policy: array, env: Environment) -> float:
+    """Return the share of reachable positions where the policy keeps the minimax value."""
+    np = require_numpy()
+    states = np.flatnonzero(env.reachable)
+    cells = np.frombuffer(policy, dtype=np.int8)[states]
+    after = env.children[states, cells]
+    return float((-env.value[after] == env.value[states]).mean())
+
+def against_minimax(policy: array, env: Environment) -> Record:
+    """Play the policy against every line a minimax player could choose, as both marks.
+
+    A minimax player picks one of the moves with the best minimax value, so following
+    each of them in turn covers every game MinimaxComputerPlayer could play.
+    """
+    children = env.children.tolist()
+    value = env.value.tolist()
+    terminal = env.terminal.tolist()
+    reward = env.reward.tolist()
+    wins = draws = losses = 0
+
+    def play(state: int, learner_to_move: bool) -> None:
+        nonlocal wins, draws, losses
+        if learner_to_move:
+            after = [children[state][policy[state]]]
+        else:
+            after = [child for child in children[state] if child >= 0 and -value[child] == value[state]]
+        for child in after:
+            if terminal[child]:
+                if not reward[child]:
+                    draws += 1
+                elif learner_to_move:
+                    wins += 1
+                else:
+                    losses += 1
+            else:
+                play(child, not learner_to_move)
+
+    for root in (0, tables.GRID_COUNT):
+        play(root, True)
+        play(root, False)
+    return Record(wins, draws, losses)
+
+def save_policy(policy: array, path: str) -> None:
+    with open(path, "wb") as file:
+        policy.tofile(file)
+
+def load_policy(path: str) -> array:
+    policy = array("b")
+    with open(path, "rb") as file:
+        policy.fromfile(file, STATES)
+    return policy
@@ -1,56 +1,198 @@
 from functools import partial
 
-from tic_tac_toe.logic.models import GameState, Mark, Move
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Mark, Move
+from tic_tac_toe.logic.search_tree import SearchResult
+from tic_tac_toe.logic.tactics import scan, verdict_score
 
-def find_best_move(game_state: GameState) -> Move | None:
+def find_best_move(
+    game_state: GameState, mate_distance: bool = False, tactics: bool = False
+) -> Move | None:
     maximizer: Mark = game_state.current_mark
-    bound_minimax = partial(minimax, maximizer=maximizer)
-    return max(game_state.possible_moves, key=bound_minimax)
+    bound_minimax = partial(
+        minimax, maximizer=maximizer, mate_distance=mate_distance, tactics=tactics
+    )
+    moves = scan(game_state).moves if tactics else game_state.possible_moves
+    return max(moves, key=bound_minimax)
 
-def pruned_find_best_move(game_state: GameState) -> Move | None:
+def pruned_find_best_move(
+    game_state: GameState, mate_distance: bool = False, tactics: bool = False
+) -> Move | None:
     maximizer: Mark = game_state.current_mark
-    bound_minimax = partial(pruned_minimax, maximizer=maximizer)
-    return max(game_state.possible_moves, key=bound_minimax)
+    # nothing beats a proven win, or with mate distance, a win on this move
+    win = game_state.score_bounds(maximizer)[1] if mate_distance else 1
+    best_move, best_score = None, -SCORE_BOUND
+    # the moves a threat forces are the only ones that can be best
+    moves = scan(game_state).moves if tactics else game_state.possible_moves
+    for move in moves:
+        # the best score so far is the lower bound of the window, so a move that can't beat it
+        # is cut off as soon as that is proven; it can only tie, and ties keep the first move
+        score = pruned_minimax(
+            move, maximizer, alpha=best_score, mate_distance=mate_distance, tactics=tactics
+        )
+        if score > best_score:
+            best_move, best_score = move, score
+            if best_score == win:
+                break
+    return best_move
+
+def score_moves(
+    game_state: GameState, mate_distance: bool = False, tactics: bool = False
+) -> list[tuple[Move, int]]:
+    """Return every possible move with its exact score in one pass, e.g. for hints.
+
+    Each move is searched with alpha-beta pruning over the full window, which keeps its score
+    exact, and all of them share one table of the score bounds proven for every position, so
+    a position reached under several root moves is only searched again when its bounds
+    don't settle the window it is reached with.
+    """
+    maximizer: Mark = game_state.current_mark
+    table: dict[GameState, SearchResult] = {}
+    return [
+        (move, table_minimax(move, maximizer, table, mate_distance=mate_distance, tactics=tactics))
+        for move in game_state.possible_moves
+    ]
+
+def table_minimax(
+    move: Move,
+    maximizer: Mark,
+    table: dict[GameState, SearchResult],
+    alpha: int = -SCORE_BOUND,
+    beta: int = SCORE_BOUND,
+    mate_distance: bool = False,
+    tactics: bool = False,
+) -> int:
+    """pruned_minimax that stores the score bounds it proves for every position in a table."""
+    game_state = move.after_state
+    if game_state.game_over:
+        return game_state.evaluate_score(maximizer, mate_distance)
+
+    # the bounds proven by earlier searches either settle the window or narrow it
+    result = table.get(game_state)
+    if result is None:
+        result = table[game_state] = SearchResult()
+    # an exact score inside the window would narrow it to nothing, so it is returned as well
+    if result.lower >= beta or result.exact:
+        return result.lower
+    if result.upper <= alpha:
+        return result.upper
+    alpha, beta = max(alpha, result.lower), min(beta, result.upper)
+
+    if mate_distance:
+        lowest, highest = game_state.score_bounds(maximizer)
+        if highest <= alpha:
+            return highest
+        if lowest >= beta:
+            return lowest
+        alpha, beta = max(alpha, lowest), min(beta, highest)
+    # the window the score is proven for, before the search narrows it
+    window = (alpha, beta)
+
+    moves = game_state.possible_moves
+    if tactics:
+        verdict, moves = scan(game_state)
+        if verdict is not None:
+            result.lower = result.upper = verdict_score(game_state, verdict, maximizer, mate_distance)
+            return result.lower
+
+    if game_state.current_mark is maximizer:
+        best_score = -SCORE_BOUND
+        for possible_move in moves:
+            score = table_minimax(possible_move, maximizer, table, alpha, beta, mate_distance, tactics)
+            best_score = max(score, best_score)
+            alpha = max(alpha, best_score)
+            if beta <= alpha:
+                break
+    else:
+        best_score = SCORE_BOUND
+        for possible_move in moves:
+            score = table_minimax(possible_move, maximizer, table, alpha, beta, mate_distance, tactics)
+            best_score = min(score, best_score)
+            beta = min(beta, best_score)
+            if beta <= alpha:
+                break
+
+    # a score outside the window only bounds the value, one inside it is exact
+    if best_score <= window[0]:
+        result.upper = min(result.upper, best_score)
+    elif best_score >= window[1]:
+        result.lower = max(result.lower, best_score)
+    else:
+        result.lower = result.upper = best_score
+    return best_score
 
 def minimax(
-    move: Move, maximizer: Mark, choose_highest_score: bool = False
+    move: Move,
+    maximizer: Mark,
+    choose_highest_score: bool = False,
+    mate_distance: bool = False,
+    tactics: bool = False,
 ) -> int:
     """The minimax algorithm is used to determine the best possible move for a player in a zero-sum game."""
     
     # base case, return score if a terminal node has been reached
     if move.after_state.game_over:
-        return move.after_state.evaluate_score(maximizer)
+        return move.after_state.evaluate_score(maximizer, mate_distance)
+
+    # settle the position by its threats, or search only the moves they force
+    moves = move.after_state.possible_moves
+    if tactics:
+        verdict, moves = scan(move.after_state)
+        if verdict is not None:
+            return verdict_score(move.after_state, verdict, maximizer, mate_distance)
     
     #recursive case, maximizer's turn
     if move.after_state.current_mark is maximizer:
-        best_score = -2
-        for possible_move in move.after_state.possible_moves:
-            score = minimax(possible_move, maximizer, not choose_highest_score)
+        best_score = -SCORE_BOUND
+        for possible_move in moves:
+            score = minimax(possible_move, maximizer, not choose_highest_score, mate_distance, tactics)
             best_score = max(score, best_score)
         return best_score
     
     #recursive case, not maximizer's turn
     else:            
-        best_score = 2
-        for possible_move in move.after_state.possible_moves:
-            score = minimax(possible_move, maximizer, not choose_highest_score)
+        best_score = SCORE_BOUND
+        for possible_move in moves:
+            score = minimax(possible_move, maximizer, not choose_highest_score, mate_distance, tactics)
             best_score = min(score, best_score)
         return best_score
     
 def pruned_minimax(
-    move: Move, maximizer: Mark, alpha: int = -2, beta: int = 2, choose_highest_score: bool = False
+    move: Move,
+    maximizer: Mark,
+    alpha: int = -SCORE_BOUND,
+    beta: int = SCORE_BOUND,
+    choose_highest_score: bool = False,
+    mate_distance: bool = False,
+    tactics: bool = False,
 ) -> int:
     """This version of the minimax algorthim uses alpha-beta pruning to reduce the number of nodes that need to be evaluated."""
     
     # base case, return score if a terminal node has been reached
     if move.after_state.game_over:
-        return move.after_state.evaluate_score(maximizer)
+        return move.after_state.evaluate_score(maximizer, mate_distance)
+
+    # mate-distance pruning: no score can beat a win on this move or fall below a loss on the
+    # next one, so when the window lies outside those bounds the search is already decided
+    if mate_distance:
+        lowest, highest = move.after_state.score_bounds(maximizer)
+        if highest <= alpha:
+            return highest
+        if lowest >= beta:
+            return lowest
+        alpha, beta = max(alpha, lowest), min(beta, highest)
+
+    # settle the position by its threats, or search only the moves they force
+    moves = move.after_state.possible_moves
+    if tactics:
+        verdict, moves = scan(move.after_state)
+        if verdict is not None:
+            return verdict_score(move.after_state, verdict, maximizer, mate_distance)
     
     #recursive case, maximizer's turn
     if move.after_state.current_mark is maximizer:
-        best_score = -2
-        for possible_move in move.after_state.possible_moves:
-            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score)
+        best_score = -SCORE_BOUND
+        for possible_move in moves:
+            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score, mate_distance, tactics)
             best_score = max(score, best_score)
             alpha = max(alpha, best_score)
             if beta <= alpha:
@@ -59,9 +201,9 @@ def pruned_minimax(
     
     #recursive case, not maximizer's turn
     else:            
-        best_score = 2
-        for possible_move in move.after_state.possible_moves:
-            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score)
+        best_score = SCORE_BOUND
+        for possible_move in moves:
+            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score, mate_distance, tactics)
             best_score = min(score, best_score)
             beta = min(beta, best_score)
             if beta <= alpha:
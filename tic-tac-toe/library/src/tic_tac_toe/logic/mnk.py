@@ -0,0 +1,167 @@
+"""The m,n,k-game: tic-tac-toe on a board of any size, won by k marks in a row.
+
+Tic-tac-toe is the 3,3,3-game. Each player's marks are an integer with one bit per cell,
+row by row from the top left, so the cell indices are the same as those of GameState and a
+move is setting one bit. The lines of k cells of each board size are built once as
+bitmasks, so a player has won when any line mask is covered by their marks.
+
+States hash by their Zobrist key, which a move updates with one XOR, see zobrist.py.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from tic_tac_toe.logic import zobrist
+from tic_tac_toe.logic.exceptions import InvalidGameState, InvalidMove, UnknownGameScore
+from tic_tac_toe.logic.models import Mark, Move, derived, set_slot
+
+@lru_cache(maxsize=None)
+def lines(width: int, height: int, k: int) -> tuple[int, ...]:
+    """Return the bitmask of every line of k cells on a board."""
+    masks = []
+    for row in range(height):
+        for column in range(width):
+            for d_column, d_row in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+                end_column, end_row = column + (k - 1) * d_column, row + (k - 1) * d_row
+                if 0 <= end_column < width and 0 <= end_row < height:
+                    masks.append(sum(
+                        1 << (row + i * d_row) * width + column + i * d_column for i in range(k)
+                    ))
+    return tuple(masks)
+
+@lru_cache(maxsize=None)
+def cell_lines(width: int, height: int, k: int) -> tuple[tuple[int, ...], ...]:
+    """Return the lines through every cell, so a move only has to check its own lines."""
+    return tuple(
+        tuple(line for line in lines(width, height, k) if line >> cell & 1)
+        for cell in range(width * height)
+    )
+
+def has_line(marks: int, line_masks: tuple[int, ...]) -> bool:
+    return any(marks & line == line for line in line_masks)
+
+@dataclass(frozen=True, slots=True)
+class MNKState:
+
+    """An m,n,k-game position, playing the role GameState plays for tic-tac-toe."""
+
+    width: int = 4
+    height: int = 4
+    k: int = 4
+    crosses: int = 0
+    naughts: int = 0
+    starting_mark: Mark = Mark("X")
+    # the Zobrist key of the position, computed from the marks unless a move passes it on
+    zobrist: int | None = field(default=None, repr=False, compare=False)
+
+    move_count: int = derived()
+    current_mark: Mark = derived()
+    winner: Mark | None = derived()
+    tie: bool = derived()
+    game_over: bool = derived()
+
+    def __post_init__(self) -> None:
+        validate_mnk_state(self)
+        if self.zobrist is None:
+            set_slot(self, "zobrist", zobrist.board_key(
+                self.cell_count, self.crosses, self.naughts, self.starting_mark is Mark.NAUGHT
+            ))
+        set_slot(self, "move_count", (self.crosses | self.naughts).bit_count())
+        set_slot(
+            self,
+            "current_mark",
+            self.starting_mark if self.move_count % 2 == 0 else self.starting_mark.other,
+        )
+        line_masks = lines(self.width, self.height, self.k)
+        winner = None
+        if has_line(self.crosses, line_masks):
+            winner = Mark.CROSS
+        elif has_line(self.naughts, line_masks):
+            winner = Mark.NAUGHT
+        set_slot(self, "winner", winner)
+        set_slot(self, "tie", winner is None and self.move_count == self.cell_count)
+        set_slot(self, "game_over", winner is not None or self.tie)
+
+    def __hash__(self) -> int:
+        return self.zobrist
+
+    @property
+    def symmetric_zobrist(self) -> int:
+        """The least key of the position under the symmetries of the board, shared by its mirror images."""
+        return min(zobrist.symmetric_keys(
+            self.width, self.height, self.crosses, self.naughts, self.starting_mark is Mark.NAUGHT
+        ))
+
+    @property
+    def cell_count(self) -> int:
+        return self.width * self.height
+
+    @property
+    def game_not_started(self) -> bool:
+        return self.move_count == 0
+
+    @property
+    def cells(self) -> str:
+        """The board as cells of X, O or space, row by row from the top left."""
+        return "".join(
+            "X" if self.crosses >> cell & 1 else "O" if self.naughts >> cell & 1 else " "
+            for cell in range(self.cell_count)
+        )
+
+    def stones(self, mark: Mark) -> int:
+        return self.crosses if mark is Mark.CROSS else self.naughts
+
+    @property
+    def possible_moves(self) -> list[Move]:
+        if self.game_over:
+            return []
+        taken = self.crosses | self.naughts
+        return [
+            self.make_move_to(cell) for cell in range(self.cell_count) if not taken >> cell & 1
+        ]
+
+    def make_move_to(self, index: int) -> Move:
+        if not 0 <= index < self.cell_count or (self.crosses | self.naughts) >> index & 1:
+            raise InvalidMove("Cell is not empty")
+        crosses, naughts = self.crosses, self.naughts
+        key = self.zobrist
+        if self.current_mark is Mark.CROSS:
+            crosses |= 1 << index
+            key ^= zobrist.cell_keys(self.cell_count)[index][zobrist.CROSS]
+        else:
+            naughts |= 1 << index
+            key ^= zobrist.cell_keys(self.cell_count)[index][zobrist.NAUGHT]
+        return Move(
+            mark=self.current_mark,
+            cell_index=index,
+            before_state=self,
+            after_state=MNKState(
+                self.width, self.height, self.k, crosses, naughts, self.starting_mark, key
+            ),
+        )
+
+    def evaluate_score(self, mark: Mark) -> int:
+        # perform static evaluation of scores for terminal game states
+        if self.game_over:
+            if self.tie:
+                return 0
+            return 1 if self.winner is mark else -1
+        raise UnknownGameScore("Game is not over yet")
+
+def validate_mnk_state(game_state: MNKState) -> None:
+    if game_state.width < 1 or game_state.height < 1:
+        raise InvalidGameState("The board must have at least one cell")
+    if not 1 <= game_state.k <= max(game_state.width, game_state.height):
+        raise InvalidGameState("The line length must fit on the board")
+    crosses, naughts = game_state.crosses, game_state.naughts
+    if crosses & naughts:
+        raise InvalidGameState("A cell can't hold both marks")
+    if (crosses | naughts) >> game_state.cell_count:
+        raise InvalidGameState("Marks must be on the board")
+    x_count, o_count = crosses.bit_count(), naughts.bit_count()
+    if abs(x_count - o_count) > 1:
+        raise InvalidGameState("Wrong number of Xs and Os")
+    if x_count > o_count and game_state.starting_mark != "X":
+        raise InvalidGameState("Wrong starting mark")
+    if o_count > x_count and game_state.starting_mark != "O":
+        raise InvalidGameState("Wrong starting mark")
@@ -1,8 +1,8 @@
 import enum
-import re
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
+from typing import Any
 
+from tic_tac_toe.logic import retention, tables
 from tic_tac_toe.logic.exceptions import InvalidMove, UnknownGameScore
 from tic_tac_toe.logic.validators import validate_game_state, validate_grid
 
@@ -27,7 +27,20 @@ class Mark(str, enum.Enum):
     def other(self) -> "Mark":
         return Mark.CROSS if self is Mark.NAUGHT else Mark.NAUGHT
 
-@dataclass(frozen=True)
+# beyond any score evaluate_score can return, so it bounds search windows
+SCORE_BOUND = tables.CELLS + 1
+
+# marks indexed by their digit in the lookup tables, where 0 is an empty cell
+MARKS = (None, Mark.CROSS, Mark.NAUGHT)
+
+# frozen dataclasses can only fill in their derived slots by bypassing their own __setattr__
+set_slot = object.__setattr__
+
+def derived() -> Any:
+    """A slot for a value derived from the other fields, computed once in __post_init__."""
+    return field(init=False, repr=False, compare=False)
+
+@dataclass(frozen=True, slots=True)
 class Grid:
     
     """A representation of the game board."""
@@ -35,22 +48,20 @@ class Grid:
     # initialize the grid with 9 empty cells
     cells: str = " " * 9
 
-    def __post_init__(self) -> None:
-        validate_grid(self)
-
-    @cached_property
-    def x_count(self) -> int:
-        return self.cells.count("X")
+    index: int = derived()
+    x_count: int = derived()
+    o_count: int = derived()
+    empty_count: int = derived()
 
-    @cached_property
-    def o_count(self) -> int:
-        return self.cells.count("O")
-
-    @cached_property
-    def empty_count(self) -> int:
-        return self.cells.count(" ")
-
-@dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        index = validate_grid(self)
+        lookup = tables.tables()
+        set_slot(self, "index", index)
+        set_slot(self, "x_count", lookup.x_count[index])
+        set_slot(self, "o_count", lookup.o_count[index])
+        set_slot(self, "empty_count", tables.CELLS - self.x_count - self.o_count)
+
+@dataclass(frozen=True, slots=True)
 class Move:
     
     """Representation of moves made in game which make up the edges in our game tree."""
@@ -60,7 +71,7 @@ class Move:
     before_state: "GameState"
     after_state: "GameState"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GameState:
     
     """Representation of game states that make up the nodes in our game tree"""
@@ -68,56 +79,73 @@ class GameState:
     grid: Grid
     starting_mark: Mark = Mark("X")
 
+    # position of this state in the per-starting-mark lookup tables
+    index: int = derived()
+    current_mark: Mark = derived()
+    winner: Mark | None = derived()
+    tie: bool = derived()
+    game_over: bool = derived()
+
+    # possible moves kept according to the retention policy, see tic_tac_toe.logic.retention
+    _moves: list["Move"] | None = derived()
+    _weak_moves: object = derived()
+
     def __post_init__(self) -> None:
+        set_slot(self, "index", tables.offset(tables.mark_digit(self.starting_mark)) + self.grid.index)
         validate_game_state(self)
+        lookup = tables.tables()
+        set_slot(self, "current_mark", MARKS[lookup.current_mark[self.index]])
+        set_slot(self, "winner", MARKS[lookup.winner[self.grid.index]])
+        set_slot(self, "tie", bool(lookup.tie[self.grid.index]))
+        set_slot(self, "game_over", self.winner is not None or self.tie)
+        set_slot(self, "_moves", None)
+        set_slot(self, "_weak_moves", None)
+
+    # pickles and copies leave out the cached moves, which would bring the whole subtree along
+    def __getstate__(self) -> tuple[Grid, Mark]:
+        return self.grid, self.starting_mark
+
+    def __setstate__(self, state: tuple[Grid, Mark]) -> None:
+        grid, starting_mark = state
+        set_slot(self, "grid", grid)
+        set_slot(self, "starting_mark", starting_mark)
+        self.__post_init__()
+
+    # the index tells every grid and starting mark apart, so it is a perfect hash and a
+    # cheaper comparison than the generated ones, which compare the grid and the mark
+    def __hash__(self) -> int:
+        return self.index
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not GameState:
+            return NotImplemented
+        return self.index == other.index
 
-    @cached_property
-    def current_mark(self) -> Mark:
-        if self.grid.x_count == self.grid.o_count:
-            return self.starting_mark
-        else:
-            return self.starting_mark.other
-
-    @cached_property
+    @property
     def game_not_started(self) -> bool:
         return self.grid.empty_count == 9
 
-    @cached_property
-    def game_over(self) -> bool:
-        return self.winner is not None or self.tie
-
-    @cached_property
-    def tie(self) -> bool:
-        return self.winner is None and self.grid.empty_count == 0
-
-    @cached_property
-    def winner(self) -> Mark | None:
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return mark
-        return None
-
-    @cached_property
+    @property
     def winning_cells(self) -> list[int]:
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return [
-                        match.start() for match in re.finditer(r"\?", pattern)
-                    ]
-        return []
-
-    @cached_property
+        line = tables.tables().winning_line[self.grid.index]
+        if line == tables.NO_LINE:
+            return []
+        return list(tables.WIN_LINES[line])
+
+    @property
     def possible_moves(self) -> list[Move]:
+        # how long the moves stay cached is up to the configured retention policy
+        return retention.retained_moves(self, GameState.generate_moves)
+
+    def generate_moves(self) -> list[Move]:
         
         # initialize an empty list of possible moves
         moves = []
         
         # if the game is not over, iterate through the grid and add a move for each empty cell
         if not self.game_over:
-            for match in re.finditer(r"\s", self.grid.cells):
-                moves.append(self.make_move_to(match.start()))
+            for index in tables.empty_cells(self.grid.index):
+                moves.append(self.make_move_to(index))
         return moves
 
     def make_move_to(self, index: int) -> Move:
@@ -141,13 +169,29 @@ class GameState:
             ),
         )
         
-    def evaluate_score(self, mark: Mark) -> int:
+    def evaluate_score(self, mark: Mark, mate_distance: bool = False) -> int:
         # perform static evaluation of scores for terminal game states
         if self.game_over:
             if self.tie:
                 return 0
+            # with mate distance, a win scores higher the more cells it leaves empty,
+            # so faster wins score higher and slower losses score less low
+            score = self.grid.empty_count + 1 if mate_distance else 1
             if self.winner is mark:
-                return 1
+                return score
             else:
-                return -1
-        raise UnknownGameScore("Game is not over yet")
\ No newline at end of file
+                return -score
+        raise UnknownGameScore("Game is not over yet")
+
+    def score_bounds(self, mark: Mark) -> tuple[int, int]:
+        """Return the lowest and highest mate-distance scores still possible for a mark."""
+        empty = self.grid.empty_count
+        # the player to move can at best win with this move and at worst lose with the next one
+        if self.current_mark is mark:
+            return -(empty - 1), empty
+        return -empty, empty - 1
+
+# counting the hot paths above is opt-in, see tic_tac_toe.logic.instrumentation
+from tic_tac_toe.logic import instrumentation  # noqa: E402
+
+instrumentation.enable_from_environment()
@@ -0,0 +1,102 @@
+"""MTD(f), a game value found by null-window probes alone.
+
+Each probe asks whether the value is at least some ``beta`` with the null window
+``(beta - 1, beta)``, and its fail-soft result narrows the bounds on the value until they
+meet. A probe on its own would search the same positions over and over, so every search
+stores the bounds it proves for each position in a memory that later probes, and later
+turns, start from. Without mate distance the value is -1, 0 or 1, so it takes at most a
+couple of probes from a first guess of 0.
+
+It is written negamax style, scoring every position for the player to move.
+"""
+
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Move
+from tic_tac_toe.logic.search_tree import SearchResult
+
+class MTDFSearch:
+
+    """MTD(f) with a memory of score bounds kept between the moves of a game."""
+
+    def __init__(self, mate_distance: bool = False) -> None:
+        self.mate_distance = mate_distance
+        self.memory: dict[GameState, SearchResult] = {}
+
+    def find_best_move(self, game_state: GameState) -> Move | None:
+        if game_state.game_over:
+            return None
+        value = mtdf(game_state, self.memory, self.mate_distance)
+        # the first move whose score is proven to reach the value is a best move
+        for move in ordered_moves(game_state, self.memory.get(game_state)):
+            after = -alpha_beta_with_memory(
+                move.after_state, -value, -value + 1, self.memory, self.mate_distance
+            )
+            if after >= value:
+                return move
+        return None
+
+def mtdf(
+    game_state: GameState,
+    memory: dict[GameState, SearchResult],
+    mate_distance: bool = False,
+    first_guess: int = 0,
+) -> int:
+    """Return the value of a position for the player to move."""
+    value = first_guess
+    lower, upper = -SCORE_BOUND, SCORE_BOUND
+    while lower < upper:
+        beta = value + 1 if value == lower else value
+        value = alpha_beta_with_memory(game_state, beta - 1, beta, memory, mate_distance)
+        if value < beta:
+            upper = value
+        else:
+            lower = value
+    return value
+
+def alpha_beta_with_memory(
+    game_state: GameState,
+    alpha: int,
+    beta: int,
+    memory: dict[GameState, SearchResult],
+    mate_distance: bool = False,
+) -> int:
+    """Fail-soft alpha-beta that stores the bounds it proves for every position."""
+    result = memory.get(game_state)
+    if result is None:
+        result = memory[game_state] = SearchResult()
+    if result.lower >= beta:
+        return result.lower
+    if result.upper <= alpha:
+        return result.upper
+    alpha, beta = max(alpha, result.lower), min(beta, result.upper)
+
+    if game_state.game_over:
+        result.lower = result.upper = game_state.evaluate_score(
+            game_state.current_mark, mate_distance
+        )
+        return result.lower
+
+    best_score = -SCORE_BOUND
+    window_alpha = alpha
+    for move in ordered_moves(game_state, result):
+        score = -alpha_beta_with_memory(move.after_state, -beta, -window_alpha, memory, mate_distance)
+        if score > best_score:
+            best_score, result.best_move = score, move.cell_index
+        window_alpha = max(window_alpha, score)
+        if best_score >= beta:
+            break
+
+    # a score outside the window only bounds the value, one inside it is exact
+    if best_score <= alpha:
+        result.upper = best_score
+    elif best_score >= beta:
+        result.lower = best_score
+    else:
+        result.lower = result.upper = best_score
+    return best_score
+
+def ordered_moves(game_state: GameState, result: SearchResult | None) -> list[Move]:
+    """Return the possible moves with the best one found by an earlier probe first."""
+    moves = game_state.possible_moves
+    if result is None or result.best_move is None:
+        return moves
+    return sorted(moves, key=lambda move: move.cell_index != result.best_move)
@@ -0,0 +1,116 @@
+"""Connect Four search split by root move over a pool of processes.
+
+Every root column is searched by its own task, deepening one ply at a time up to a fixed
+depth so the results are comparable between runs. The workers either keep their own
+private transposition tables, or all read and write one SharedTable, so a position one
+worker has searched is a table hit for the others.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from tic_tac_toe.logic.budget import Deadline, SearchStats
+from tic_tac_toe.logic.connect_four import CENTER_FIRST, ConnectFourState
+from tic_tac_toe.logic.connect_four_search import WIN_SCORE, ConnectFourSearch, play
+from tic_tac_toe.logic.shared_table import SharedTable
+
+@dataclass
+class ParallelResult:
+    column: int
+    score: int
+    nodes: int
+    seconds: float
+    probes: int = 0
+    hits: int = 0
+    shared_hits: int = 0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def shared_hit_rate(self) -> float:
+        """The share of lookups answered by an entry another worker wrote."""
+        return self.shared_hits / self.probes if self.probes else 0.0
+
+# the search of each worker process, kept between its tasks like any per-process cache
+_search: ConnectFourSearch | None = None
+
+def start_worker(table_name: str | None, buckets: int) -> None:
+    global _search
+    table = SharedTable(buckets, name=table_name) if table_name else None
+    _search = ConnectFourSearch(table=table)
+
+def search_column(
+    current: int, mask: int, moves: int, column: int, depth: int
+) -> tuple[int, int, int, int, int, int]:
+    """Score one root column, returning it with its score, nodes and table lookups."""
+    search = _search
+    table = search.table
+    lookups = table_counts(table)
+    search.stats = SearchStats()
+    search._deadline = Deadline(math.inf, search.stats)
+    after = play(current, mask, column)
+    for iteration in range(depth):
+        score = -search.negamax(*after, moves + 1, iteration, -WIN_SCORE * 2, WIN_SCORE * 2)
+        if abs(score) > WIN_SCORE // 2:
+            break
+    probes, hits, shared_hits = (now - before for now, before in zip(table_counts(table), lookups))
+    return column, score, search.stats.nodes, probes, hits, shared_hits
+
+def table_counts(table) -> tuple[int, int, int]:
+    if isinstance(table, SharedTable):
+        return table.probes, table.hits, table.shared_hits
+    return 0, 0, 0
+
+def parallel_best_move(
+    game_state: ConnectFourState,
+    depth: int,
+    workers: int = 4,
+    shared: bool = True,
+    buckets: int = 1 << 18,
+) -> ParallelResult:
+    """Search every root column to a fixed depth in a process pool and pick the best one.
+
+    The depth counts the move to the root column, so each column's own search is one ply shallower.
+    """
+    columns = [column for column in CENTER_FIRST if game_state.can_play(column)]
+    if game_state.game_over or not columns:
+        raise ValueError("There are no moves to search")
+    if depth < 1:
+        raise ValueError("The search needs at least one ply")
+    current = game_state.stones(game_state.current_mark)
+    start = time.perf_counter()
+    table = SharedTable(buckets) if shared else None
+    try:
+        with ProcessPoolExecutor(
+            workers,
+            initializer=start_worker,
+            initargs=(table.name if table else None, buckets),
+        ) as pool:
+            results = list(pool.map(
+                search_column,
+                *zip(*[(current, game_state.mask, game_state.move_count, column, depth) for column in columns]),
+            ))
+    finally:
+        if table:
+            table.close()
+
+    result = ParallelResult(columns[0], -WIN_SCORE * 2, 0, time.perf_counter() - start)
+    # columns come back center first, so ties keep the column nearest the center
+    for column, score, nodes, probes, hits, shared_hits in results:
+        if score > result.score:
+            result.column, result.score = column, score
+        result.nodes += nodes
+        result.probes += probes
+        result.hits += hits
+        result.shared_hits += shared_hits
+    return result
@@ -0,0 +1,108 @@
+"""Perft: count every move sequence reachable from a game state, ply by ply.
+
+Each ply reports the move sequences of that length, the distinct positions they reach,
+and how many of those sequences end the game in a win for X, a win for O or a draw.
+From the empty board the finished games must add up to the well-known 255,168
+(131,184 X wins, 77,904 O wins and 46,080 draws), which makes perft a correctness check
+for move generation as well as a throughput benchmark for ``make_move_to``.
+
+- ``naive`` walks ``possible_moves`` depth first, making every move of every sequence
+- ``fast`` goes layer by layer, expanding each distinct position once and carrying the
+  number of sequences that reach it, so it makes one move per edge of the game graph
+"""
+
+import time
+from collections import Counter
+from typing import Callable, NamedTuple
+
+from tic_tac_toe.logic.models import GameState, Mark
+from tic_tac_toe.logic.retention import Retention, RetentionPolicy, retention_policy
+
+class PerftRow(NamedTuple):
+    ply: int
+    sequences: int
+    positions: int
+    x_wins: int
+    o_wins: int
+    draws: int
+
+class PerftResult(NamedTuple):
+    rows: list[PerftRow]
+    moves: int
+    seconds: float
+
+    @property
+    def games(self) -> int:
+        return sum(row.x_wins + row.o_wins + row.draws for row in self.rows)
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.seconds if self.seconds else 0.0
+
+def naive_perft(game_state: GameState) -> PerftResult:
+    sequences: Counter[int] = Counter()
+    outcomes: Counter[tuple[int, Mark | None]] = Counter()
+    positions: dict[int, set[int]] = {}
+    moves = 0
+
+    def visit(state: GameState, ply: int) -> None:
+        nonlocal moves
+        sequences[ply] += 1
+        positions.setdefault(ply, set()).add(state.index)
+        if state.game_over:
+            outcomes[ply, state.winner] += 1
+            return
+        for move in state.possible_moves:
+            moves += 1
+            visit(move.after_state, ply + 1)
+
+    start = time.perf_counter()
+    # caching the moves would keep the whole game tree alive and skip the moves being counted
+    with retention_policy(RetentionPolicy(Retention.NONE)):
+        visit(game_state, 0)
+    seconds = time.perf_counter() - start
+
+    rows = [
+        row(ply, sequences[ply], len(positions[ply]), outcomes)
+        for ply in sorted(sequences)
+    ]
+    return PerftResult(rows, moves, seconds)
+
+def fast_perft(game_state: GameState) -> PerftResult:
+    rows = []
+    moves = 0
+    start = time.perf_counter()
+    layer = {game_state: 1}
+    ply = 0
+    while layer:
+        outcomes: Counter[tuple[int, Mark | None]] = Counter()
+        next_layer: dict[GameState, int] = {}
+        for state, count in layer.items():
+            if state.game_over:
+                outcomes[ply, state.winner] += count
+                continue
+            for move in state.generate_moves():
+                moves += 1
+                after = move.after_state
+                next_layer[after] = next_layer.get(after, 0) + count
+        rows.append(row(ply, sum(layer.values()), len(layer), outcomes))
+        layer = next_layer
+        ply += 1
+    return PerftResult(rows, moves, time.perf_counter() - start)
+
+def row(
+    ply: int, sequences: int, positions: int, outcomes: Counter[tuple[int, Mark | None]]
+) -> PerftRow:
+    return PerftRow(
+        ply,
+        sequences,
+        positions,
+        outcomes[ply, Mark.CROSS],
+        outcomes[ply, Mark.NAUGHT],
+        outcomes[ply, None],
+    )
+
+PERFT_MODES: dict[str, Callable[[GameState], PerftResult]] = {
+    "naive": naive_perft,
+    "fast": fast_perft,
+}
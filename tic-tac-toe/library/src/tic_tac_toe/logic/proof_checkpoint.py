@@ -0,0 +1,132 @@
+"""Compact checkpoint files of a proof-number search, to resume a long proof after a stop.
+
+A checkpoint holds everything a search needs to carry on where it stopped: the board and
+position being proven, the phase, the statistics so far and the table of proof and
+disproof numbers, including those of the positions on the path being searched. It is laid
+out as a header followed by three flat arrays, in little-endian byte order::
+
+    header      magic, version, board width, height and k, phase, whether the keys are
+                symmetric, entry count, nodes, evictions and seconds so far, and the key
+                of the position proven
+    keys        the Zobrist key of every table entry, 8 bytes each
+    phi         the phi of every entry, 4 bytes each
+    delta       the delta of every entry, 4 bytes each
+
+Every part is read back as one ``array``, so a table of millions of entries loads in well
+under a second. A checkpoint is written to a temporary file first and then renamed over
+the last one, so a crash while writing leaves the last complete checkpoint in place.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+
+MAGIC = b"TTTP"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBBB?xxQQQdQ")
+
+@dataclass
+class ProofCheckpoint:
+    width: int
+    height: int
+    k: int
+    # the key of the position proven
+    root: int
+    phase: int
+    nodes: int
+    evictions: int
+    seconds: float
+    # whether the keys are the symmetric ones
+    symmetric: bool = False
+    table: dict[int, tuple[int, int]] = field(default_factory=dict)
+
+# the bytes of the key, phi and delta of a table entry
+ENTRY_SIZE = 16
+
+def write_checkpoint(path: str | os.PathLike, checkpoint: ProofCheckpoint, max_bytes: int) -> int:
+    """Write a checkpoint within a size budget, returning the number of entries written.
+
+    A table too big for the budget keeps its settled entries, whose numbers took the most
+    work, and the most recently stored of the rest, the same entries a full table keeps.
+    """
+    room = (max_bytes - HEADER.size) // ENTRY_SIZE
+    if room < 0:
+        raise ValueError("The checkpoint budget is smaller than a checkpoint header")
+
+    table = checkpoint.table
+    keys = list(table)
+    if len(keys) > room:
+        unsettled = [key for key in keys if 0 not in table[key]]
+        dropped = set(unsettled[:len(keys) - room])
+        keys = [key for key in keys if key not in dropped][-room:] if room else []
+
+    arrays = (
+        array("Q", keys),
+        array("I", (table[key][0] for key in keys)),
+        array("I", (table[key][1] for key in keys)),
+    )
+    if sys.byteorder == "big":
+        for values in arrays:
+            values.byteswap()
+
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(
+            MAGIC,
+            VERSION,
+            checkpoint.width,
+            checkpoint.height,
+            checkpoint.k,
+            checkpoint.phase,
+            checkpoint.symmetric,
+            len(keys),
+            checkpoint.nodes,
+            checkpoint.evictions,
+            checkpoint.seconds,
+            checkpoint.root,
+        ))
+        for values in arrays:
+            values.tofile(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return len(keys)
+
+def read_checkpoint(path: str | os.PathLike) -> ProofCheckpoint:
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a proof checkpoint")
+    (
+        _, version, width, height, k, phase, symmetric, count, nodes, evictions, seconds, root
+    ) = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"{path} is a checkpoint of another version")
+    offset = HEADER.size
+    if len(data) != offset + count * ENTRY_SIZE:
+        raise ValueError(f"{path} is a truncated checkpoint")
+
+    keys = array("Q", data[offset:offset + 8 * count])
+    offset += 8 * count
+    phi = array("I", data[offset:offset + 4 * count])
+    delta = array("I", data[offset + 4 * count:])
+    if sys.byteorder == "big":
+        for values in (keys, phi, delta):
+            values.byteswap()
+
+    return ProofCheckpoint(
+        width,
+        height,
+        k,
+        root,
+        phase,
+        nodes,
+        evictions,
+        seconds,
+        symmetric,
+        dict(zip(keys, zip(phi, delta))),
+    )
@@ -0,0 +1,405 @@
+"""Depth-first proof-number search (df-pn), proving m,n,k-game positions won, lost or drawn.
+
+Minimax looks at every move equally hard. Proof-number search instead keeps, for every
+position, how many unproven positions below it would still have to be settled to prove
+it (the proof number) or to disprove it (the disproof number), and always works on the
+position that is cheapest to settle. A forced win is found without looking at the moves
+that can't matter, which is what proves larger boards.
+
+It proves one goal at a time, for one side, the attacker: first whether the player to move
+wins, and if not, whether the opponent does. A position that is neither is a draw.
+
+Numbers are kept negamax style, for the player to move in each position: ``phi`` is the
+cost of proving that player reaches their goal, ``delta`` of disproving it. For the
+attacker that goal is winning, for the defender it is keeping the attacker from winning.
+A position's phi is the least delta of its children and its delta the sum of their phis.
+
+The search is depth-first with thresholds, so it only keeps a table of the numbers of the
+positions it has seen, keyed on their Zobrist keys, which every move updates with an XOR.
+With ``symmetric`` the keys are the symmetric ones, so mirror images share their numbers
+and are only proven once, see zobrist.py. The table is bounded by ``max_nodes``: when it
+is full, the least recently stored half of the unsettled positions are dropped, which only
+costs searching them again.
+
+A long proof can write checkpoints to a file every ``checkpoint_every`` seconds and when it
+is interrupted, and start again from the last one, see proof_checkpoint.py.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from tic_tac_toe.logic import zobrist
+from tic_tac_toe.logic.mnk import MNKState, cell_lines, lines
+from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.proof_checkpoint import ProofCheckpoint, read_checkpoint, write_checkpoint
+
+# the largest number a checkpoint stores in its 4 bytes
+INFINITY = (1 << 32) - 1
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+# the goals proven, in order: the player to move wins, then the opponent does
+PHASES = ("win", "loss")
+
+# nodes between looking at the clock for a checkpoint
+CHECKPOINT_CHECK_NODES = 4096
+
+@dataclass
+class ProofProgress:
+    phase: str
+    proof: int
+    disproof: int
+    nodes: int
+    seconds: float
+    table_size: int
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+@dataclass
+class ProofResult:
+    # WIN, DRAW or LOSS, for the player to move
+    value: int
+    nodes: int
+    seconds: float
+    evictions: int = 0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+class ProofNumberSearch:
+
+    """df-pn over the bitboards of one m,n,k-game board size."""
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        k: int,
+        max_nodes: int = 2_000_000,
+        report: Callable[[ProofProgress], None] | None = None,
+        report_every: int = 100_000,
+        checkpoint_path: str | os.PathLike | None = None,
+        checkpoint_every: float = 300.0,
+        checkpoint_bytes: int = 1 << 30,
+        symmetric: bool = False,
+    ) -> None:
+        self.width, self.height = width, height
+        self.cells = width * height
+        self.full = (1 << self.cells) - 1
+        self.k = k
+        self.lines = lines(width, height, k)
+        self.cell_lines = cell_lines(width, height, k)
+        self.symmetric = symmetric
+        # the Zobrist numbers of an X and an O on every cell, under every symmetry if symmetric
+        if symmetric:
+            self.numbers = zobrist.symmetric_cell_keys(width, height)
+        else:
+            self.numbers = tuple(((cross,), (naught,)) for cross, naught in zobrist.cell_keys(self.cells))
+        self.max_nodes = max_nodes
+        self.report = report
+        self.report_every = report_every
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_bytes = checkpoint_bytes
+
+        self.table: dict[int, tuple[int, int]] = {}
+        # the children and their numbers of every position on the path being searched
+        self.frames: list[tuple[list, list[tuple[int, int]]]] = []
+        self.phase = PHASES[0]
+        self.root = 0
+        self.root_numbers = (1, 1)
+        self.nodes = 0
+        self.evictions = 0
+        self.start = time.perf_counter()
+        self.next_checkpoint = self.start + checkpoint_every
+
+    def keys(self, game_state: MNKState) -> tuple[int, ...]:
+        """Return the Zobrist keys of a position, under every symmetry if the search is symmetric."""
+        if self.symmetric:
+            return zobrist.symmetric_keys(
+                self.width,
+                self.height,
+                game_state.crosses,
+                game_state.naughts,
+                game_state.starting_mark is Mark.NAUGHT,
+            )
+        return (game_state.zobrist,)
+
+    def prove(
+        self,
+        game_state: MNKState,
+        attacker_to_move: bool,
+        table: dict[int, tuple[int, int]] | None = None,
+    ) -> tuple[int, int]:
+        """Search a position until its goal is proven or disproven, returning phi and delta.
+
+        A table saved from an earlier search of the same goal carries on where it stopped.
+        """
+        self.table = {} if table is None else table
+        self.frames.clear()
+        keys = self.keys(game_state)
+        self.root = min(keys)
+        self.root_numbers = (1, 1)
+        mark = game_state.current_mark
+        # a root threshold of infinity is only reached once the goal is settled
+        return self.mid(
+            game_state.stones(mark),
+            game_state.stones(mark.other),
+            keys,
+            zobrist.CROSS if mark is Mark.CROSS else zobrist.NAUGHT,
+            attacker_to_move,
+            INFINITY,
+            INFINITY,
+            0,
+        )
+
+    def mid(
+        self,
+        mover: int,
+        other: int,
+        keys: tuple[int, ...],
+        mover_mark: int,
+        attacker_to_move: bool,
+        phi_threshold: int,
+        delta_threshold: int,
+        depth: int,
+    ) -> tuple[int, int]:
+        """Search a position until its phi or delta reaches its threshold.
+
+        The marks of the player to move and of the other player are bitboards, and the
+        player to move's mark is zobrist.CROSS or zobrist.NAUGHT.
+        """
+        self.visit()
+        children = self.children(mover, other, keys, mover_mark, attacker_to_move)
+        table = self.table
+        # the numbers of the children are also kept here, so a child's progress isn't lost
+        # when the table evicts it while this position is still being searched
+        numbers = [settled or table.get(key, (1, 1)) for key, _, _, _, settled in children]
+        self.frames.append((children, numbers))
+        while True:
+            phi, delta = INFINITY, 0
+            best = 0
+            best_phi = second_delta = INFINITY
+            for index, (key, _, _, _, settled) in enumerate(children):
+                if not settled:
+                    numbers[index] = table.get(key, numbers[index])
+                child_phi, child_delta = numbers[index]
+                delta += child_phi
+                if child_delta < phi:
+                    second_delta, phi = phi, child_delta
+                    best, best_phi = index, child_phi
+                elif child_delta < second_delta:
+                    second_delta = child_delta
+            delta = min(delta, INFINITY)
+            if depth == 0:
+                self.root_numbers = (phi, delta)
+            if phi >= phi_threshold or delta >= delta_threshold:
+                self.frames.pop()
+                self.store(min(keys), phi, delta)
+                return phi, delta
+
+            # the best child is searched until it stops being the cheapest to settle, or
+            # until it alone makes this position's delta reach its threshold
+            _, child_keys, child_mover, child_other, _ = children[best]
+            numbers[best] = self.mid(
+                child_mover,
+                child_other,
+                child_keys,
+                1 - mover_mark,
+                not attacker_to_move,
+                min(delta_threshold - delta + best_phi, INFINITY),
+                min(phi_threshold, second_delta + 1),
+                depth + 1,
+            )
+
+    def children(
+        self, mover: int, other: int, keys: tuple[int, ...], mover_mark: int, attacker_to_move: bool
+    ) -> list[tuple[int, tuple[int, ...], int, int, tuple[int, int] | None]]:
+        """Return the table key, keys, marks and, for finished games, the numbers of every child."""
+        taken = mover | other
+        cells = [cell for cell in range(self.cells) if not taken >> cell & 1]
+        for cell in cells:
+            after = mover | 1 << cell
+            if any(after & line == line for line in self.cell_lines[cell]):
+                # the player who just moved won, so the player to move has failed, and as
+                # it is settled, it is never looked up and needs no keys
+                return [(0, keys, other, after, (INFINITY, 0))]
+
+        # any move but a block against a line the opponent is about to fill loses at once,
+        # which fails the goal of either side, so only the blocks need searching
+        threats = self.threats(other, mover)
+        if threats:
+            cells = [cell for cell in cells if threats >> cell & 1]
+
+        children = []
+        for cell in cells:
+            after = mover | 1 << cell
+            defender = other if attacker_to_move else after
+            settled = None
+            # a draw, or a board where the defender blocks every line, is a failure for the
+            # attacker and a success for the defender
+            if after | other == self.full or all(line & defender for line in self.lines):
+                settled = (0, INFINITY) if attacker_to_move else (INFINITY, 0)
+            if self.symmetric:
+                child_keys = zobrist.play(keys, self.numbers[cell][mover_mark])
+                key = min(child_keys)
+            else:
+                key = keys[0] ^ self.numbers[cell][mover_mark][0]
+                child_keys = (key,)
+            children.append((key, child_keys, other, after, settled))
+        return children
+
+    def threats(self, marks: int, blockers: int) -> int:
+        """Return the empty cells that would complete a line of the given marks."""
+        threats = 0
+        for line in self.lines:
+            if not line & blockers and (line & marks).bit_count() == self.k - 1:
+                threats |= line & ~marks
+        return threats
+
+    def store(self, key: int, phi: int, delta: int) -> None:
+        table = self.table
+        # storing moves an entry to the end, so the table runs from least to most recent
+        table.pop(key, None)
+        table[key] = (phi, delta)
+        if len(table) > self.max_nodes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop the least recently stored half of the entries of unsettled positions.
+
+        The positions on the path being searched were stored last, so they stay, and so do
+        settled positions, whose numbers never change.
+        """
+        self.evictions += 1
+        table = self.table
+        unsettled = [key for key, numbers in table.items() if 0 not in numbers]
+        for key in unsettled[:max(len(unsettled) // 2, len(table) - self.max_nodes)]:
+            del table[key]
+
+    def visit(self) -> None:
+        self.nodes += 1
+        if self.report and self.nodes % self.report_every == 0:
+            self.report(self.progress())
+        if (
+            self.checkpoint_path
+            and self.nodes % CHECKPOINT_CHECK_NODES == 0
+            and time.perf_counter() >= self.next_checkpoint
+        ):
+            self.save_checkpoint()
+
+    def save_checkpoint(self) -> int:
+        """Write the search so far to the checkpoint file, returning the entries written."""
+        table = dict(self.table)
+        # children still being searched may have been evicted, their numbers are in the frames
+        for children, numbers in self.frames:
+            for (key, _, _, _, settled), child_numbers in zip(children, numbers):
+                if not settled and key not in table:
+                    table[key] = child_numbers
+        written = write_checkpoint(
+            self.checkpoint_path,
+            ProofCheckpoint(
+                self.width,
+                self.height,
+                self.k,
+                self.root,
+                PHASES.index(self.phase),
+                self.nodes,
+                self.evictions,
+                time.perf_counter() - self.start,
+                self.symmetric,
+                table,
+            ),
+            self.checkpoint_bytes,
+        )
+        self.next_checkpoint = time.perf_counter() + self.checkpoint_every
+        return written
+
+    def resume(self, checkpoint: ProofCheckpoint) -> dict[int, tuple[int, int]]:
+        """Take the phase and statistics of a checkpoint, returning its table to prove with."""
+        if (checkpoint.width, checkpoint.height, checkpoint.k) != (self.width, self.height, self.k):
+            raise ValueError("The checkpoint is of another board")
+        if checkpoint.symmetric != self.symmetric:
+            raise ValueError("The checkpoint was saved with the other kind of keys")
+        self.phase = PHASES[checkpoint.phase]
+        self.nodes = checkpoint.nodes
+        self.evictions = checkpoint.evictions
+        self.start = time.perf_counter() - checkpoint.seconds
+        self.next_checkpoint = time.perf_counter() + self.checkpoint_every
+        return checkpoint.table
+
+    def progress(self) -> ProofProgress:
+        phi, delta = self.root_numbers
+        # the numbers are the root's proof and disproof numbers when the attacker is to move
+        if self.phase != PHASES[0]:
+            phi, delta = delta, phi
+        return ProofProgress(
+            self.phase, phi, delta, self.nodes, time.perf_counter() - self.start, len(self.table)
+        )
+
+def prove(
+    game_state: MNKState,
+    max_nodes: int = 2_000_000,
+    report: Callable[[ProofProgress], None] | None = None,
+    report_every: int = 100_000,
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_every: float = 300.0,
+    checkpoint_bytes: int = 1 << 30,
+    resume: bool = False,
+    symmetric: bool = False,
+) -> ProofResult:
+    """Prove whether the player to move wins, loses or draws with best play from both sides.
+
+    With a checkpoint path, the search is checkpointed every ``checkpoint_every`` seconds
+    and when it is interrupted with KeyboardInterrupt, and ``resume`` carries on from the
+    checkpoint there is, if any. ``symmetric`` proves mirror images of a position once.
+    """
+    if game_state.game_over:
+        value = DRAW if game_state.tie else (WIN if game_state.winner is game_state.current_mark else LOSS)
+        return ProofResult(value, 0, 0.0)
+
+    search = ProofNumberSearch(
+        game_state.width,
+        game_state.height,
+        game_state.k,
+        max_nodes,
+        report,
+        report_every,
+        checkpoint_path,
+        checkpoint_every,
+        checkpoint_bytes,
+        symmetric,
+    )
+
+    table = None
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        checkpoint = read_checkpoint(checkpoint_path)
+        table = search.resume(checkpoint)
+        if checkpoint.root != min(search.keys(game_state)):
+            raise ValueError("The checkpoint is of another position")
+
+    try:
+        phi = INFINITY
+        if search.phase == "win":
+            phi, _ = search.prove(game_state, True, table)
+            table = None
+        if phi == 0:
+            value = WIN
+        else:
+            # the player to move defends against the opponent's win
+            search.phase = "loss"
+            phi, _ = search.prove(game_state, False, table)
+            value = DRAW if phi == 0 else LOSS
+    except KeyboardInterrupt:
+        # the table and the frames of the path are still as they were when it stopped
+        if checkpoint_path:
+            search.save_checkpoint()
+        raise
+    return ProofResult(value, search.nodes, time.perf_counter() - search.start, search.evictions)
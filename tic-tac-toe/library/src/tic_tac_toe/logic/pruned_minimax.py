@@ -1,24 +1,59 @@
-from functools import partial
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Mark, Move
+from tic_tac_toe.logic.tactics import scan, verdict_score
 
-from tic_tac_toe.logic.models import GameState, Mark, Move
-
-def find_best_move(game_state: GameState) -> Move | None:
+def find_best_move(
+    game_state: GameState, mate_distance: bool = False, tactics: bool = False
+) -> Move | None:
     maximizer: Mark = game_state.current_mark
-    bound_minimax = partial(pruned_minimax, maximizer=maximizer)
-    return max(game_state.possible_moves, key=bound_minimax)
+    win = game_state.score_bounds(maximizer)[1] if mate_distance else 1
+    best_move, best_score = None, -SCORE_BOUND
+    # the moves a threat forces are the only ones that can be best
+    moves = scan(game_state).moves if tactics else game_state.possible_moves
+    for move in moves:
+        # share the best score so far with the next root move and stop on a proven win
+        score = pruned_minimax(
+            move, maximizer, alpha=best_score, mate_distance=mate_distance, tactics=tactics
+        )
+        if score > best_score:
+            best_move, best_score = move, score
+            if best_score == win:
+                break
+    return best_move
 
 def pruned_minimax(
-    move: Move, maximizer: Mark, alpha: int = -2, beta: int = 2, choose_highest_score: bool = False
+    move: Move,
+    maximizer: Mark,
+    alpha: int = -SCORE_BOUND,
+    beta: int = SCORE_BOUND,
+    choose_highest_score: bool = False,
+    mate_distance: bool = False,
+    tactics: bool = False,
 ) -> int:
     # base case, return score if a terminal node has been reached
     if move.after_state.game_over:
-        return move.after_state.evaluate_score(maximizer)
+        return move.after_state.evaluate_score(maximizer, mate_distance)
+
+    # narrow the window to the scores still possible, see minimax.pruned_minimax
+    if mate_distance:
+        lowest, highest = move.after_state.score_bounds(maximizer)
+        if highest <= alpha:
+            return highest
+        if lowest >= beta:
+            return lowest
+        alpha, beta = max(alpha, lowest), min(beta, highest)
+
+    # settle the position by its threats, see minimax.pruned_minimax
+    moves = move.after_state.possible_moves
+    if tactics:
+        verdict, moves = scan(move.after_state)
+        if verdict is not None:
+            return verdict_score(move.after_state, verdict, maximizer, mate_distance)
     
     #recursive case, maximizer's turn
     if move.after_state.current_mark is maximizer:
-        best_score = -2
-        for possible_move in move.after_state.possible_moves:
-            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score)
+        best_score = -SCORE_BOUND
+        for possible_move in moves:
+            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score, mate_distance, tactics)
             best_score = max(score, best_score)
             alpha = max(alpha, best_score)
             if beta <= alpha:
@@ -27,9 +62,9 @@ def pruned_minimax(
     
     #recursive case, not maximizer's turn
     else:            
-        best_score = 2
-        for possible_move in move.after_state.possible_moves:
-            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score)
+        best_score = SCORE_BOUND
+        for possible_move in moves:
+            score = pruned_minimax(possible_move, maximizer, alpha, beta, not choose_highest_score, mate_distance, tactics)
             best_score = min(score, best_score)
             beta = min(beta, best_score)
             if beta <= alpha:
@@ -0,0 +1,62 @@
+"""Principal variation search, alpha-beta with null windows.
+
+The first move of a position is searched with the full window, since with good ordering it
+is most likely the best. Every other move only has to be shown to be no better, which a
+null window ``(alpha, alpha + 1)`` proves with far fewer cutoffs to wait for. A move that
+does beat it is searched again with the window it now needs. Game values are integers, so
+the null window is exact, and without mate distance they are only -1, 0 or 1.
+
+It is written negamax style, scoring every position for the player to move.
+"""
+
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Move
+
+def find_best_move(game_state: GameState, mate_distance: bool = False) -> Move | None:
+    # nothing beats a proven win, or with mate distance, a win on this move
+    win = game_state.score_bounds(game_state.current_mark)[1] if mate_distance else 1
+    best_move, best_score = None, -SCORE_BOUND
+    for move in game_state.possible_moves:
+        if best_move is None:
+            score = -principal_variation(move.after_state, -SCORE_BOUND, SCORE_BOUND, mate_distance)
+        else:
+            # prove the move no better than the best so far, and only score it if it is
+            score = -principal_variation(move.after_state, -best_score - 1, -best_score, mate_distance)
+            if score > best_score:
+                score = -principal_variation(move.after_state, -SCORE_BOUND, -score, mate_distance)
+        if score > best_score:
+            best_move, best_score = move, score
+            if best_score == win:
+                break
+    return best_move
+
+def principal_variation(
+    game_state: GameState, alpha: int, beta: int, mate_distance: bool = False
+) -> int:
+    """Return the score of a position for the player to move, within the window."""
+    mover = game_state.current_mark
+    if game_state.game_over:
+        return game_state.evaluate_score(mover, mate_distance)
+
+    # narrow the window to the scores still possible, see minimax.pruned_minimax
+    if mate_distance:
+        lowest, highest = game_state.score_bounds(mover)
+        if highest <= alpha:
+            return highest
+        if lowest >= beta:
+            return lowest
+        alpha, beta = max(alpha, lowest), min(beta, highest)
+
+    best_score = -SCORE_BOUND
+    for move in game_state.possible_moves:
+        if best_score == -SCORE_BOUND:
+            score = -principal_variation(move.after_state, -beta, -alpha, mate_distance)
+        else:
+            score = -principal_variation(move.after_state, -alpha - 1, -alpha, mate_distance)
+            # the null window failed high, so search again for the move's real score
+            if alpha < score < beta:
+                score = -principal_variation(move.after_state, -beta, -score, mate_distance)
+        best_score = max(best_score, score)
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            break
+    return best_score
@@ -0,0 +1,144 @@
+"""Retention policies for the possible moves cached on game states.
+
+Every ``Move`` holds its ``after_state``, which caches its own possible moves, so by
+default a single search from the empty board keeps the whole game tree alive for as
+long as the root state lives. The policy chosen here bounds what is kept:
+
+- ``FULL`` caches the moves on every state, which is the fastest and the default
+- ``NONE`` caches nothing and builds the moves again on every access
+- ``WEAK`` keeps the moves only while something else still references them
+- ``BUDGET`` caches the moves of states up to ``max_depth`` marks deep, and keeps at
+  most ``max_nodes`` of them at once, dropping the least recently used ones first
+"""
+
+from __future__ import annotations
+
+import enum
+import gc
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, NamedTuple
+
+from tic_tac_toe.logic import tables
+
+if TYPE_CHECKING:
+    from tic_tac_toe.logic.models import GameState, Move
+
+class Retention(str, enum.Enum):
+    FULL = "full"
+    NONE = "none"
+    WEAK = "weak"
+    BUDGET = "budget"
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    retention: Retention = Retention.FULL
+    max_depth: int | None = None
+    max_nodes: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_nodes is not None and self.max_nodes < 1:
+            raise ValueError("The node budget must be at least 1")
+
+class MoveList(list):
+    """A list of moves that can be referenced weakly."""
+
+class MemoryReport(NamedTuple):
+    nodes: int
+    moves: int
+    bytes: int
+
+_policy = RetentionPolicy()
+_budget: OrderedDict[GameState, MoveList] = OrderedDict()
+_budget_lock = threading.Lock()
+
+def get_retention_policy() -> RetentionPolicy:
+    return _policy
+
+def set_retention_policy(policy: RetentionPolicy) -> None:
+    global _policy
+    _policy = policy
+    _budget.clear()
+
+@contextmanager
+def retention_policy(policy: RetentionPolicy) -> Iterator[RetentionPolicy]:
+    """Apply a retention policy for the duration of a with block."""
+    previous = get_retention_policy()
+    set_retention_policy(policy)
+    try:
+        yield policy
+    finally:
+        set_retention_policy(previous)
+
+def retained_moves(
+    game_state: GameState, generate: Callable[[GameState], list[Move]]
+) -> list[Move]:
+    """Return the possible moves of a state, caching them as the policy allows."""
+    if (moves := getattr(game_state, "_moves", None)) is not None:
+        return moves
+
+    retention = _policy.retention
+    if retention is Retention.FULL:
+        # threads racing to cache the same moves store equal lists, so either one will do
+        moves = generate(game_state)
+        object.__setattr__(game_state, "_moves", moves)
+    elif retention is Retention.WEAK:
+        reference = getattr(game_state, "_weak_moves", None)
+        if reference and (moves := reference()) is not None:
+            return moves
+        moves = MoveList(generate(game_state))
+        object.__setattr__(game_state, "_weak_moves", weakref.ref(moves))
+    elif retention is Retention.BUDGET:
+        moves = _budget_moves(game_state, generate)
+    else:
+        moves = generate(game_state)
+    return moves
+
+def _budget_moves(
+    game_state: GameState, generate: Callable[[GameState], list[Move]]
+) -> list[Move]:
+    max_depth, max_nodes = _policy.max_depth, _policy.max_nodes
+    if max_depth is not None and tables.CELLS - game_state.grid.empty_count > max_depth:
+        return generate(game_state)
+    if max_nodes is None:
+        moves = generate(game_state)
+        object.__setattr__(game_state, "_moves", moves)
+        return moves
+    # the budget is shared by every thread searching, and reordering it is not atomic
+    with _budget_lock:
+        if (moves := _budget.get(game_state)) is not None:
+            _budget.move_to_end(game_state)
+            return moves
+    moves = MoveList(generate(game_state))
+    with _budget_lock:
+        _budget[game_state] = moves
+        if len(_budget) > max_nodes:
+            _budget.popitem(last=False)
+    return moves
+
+def memory_report() -> MemoryReport:
+    """Count the game states and moves alive in the process and the bytes they hold."""
+    from tic_tac_toe.logic.models import GameState, Move
+
+    nodes = moves = size = 0
+    for obj in gc.get_objects():
+        if isinstance(obj, GameState):
+            nodes += 1
+            size += _deep_size(obj) + _deep_size(obj.grid) + sys.getsizeof(obj.grid.cells)
+        elif isinstance(obj, Move):
+            moves += 1
+            size += _deep_size(obj)
+        elif isinstance(obj, list) and obj and isinstance(obj[0], Move):
+            size += sys.getsizeof(obj)
+    return MemoryReport(nodes, moves, size)
+
+def _deep_size(obj: object) -> int:
+    # the object itself plus its instance dictionary, if it has one
+    size = sys.getsizeof(obj)
+    if (instance_dict := getattr(obj, "__dict__", None)) is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Mark, Move
+
+@dataclass
+class SearchResult:
+
+    """What a search has learned about a position, scored for the maximizer."""
+
+    lower: int = -SCORE_BOUND
+    upper: int = SCORE_BOUND
+    best_move: int | None = None
+
+    @property
+    def exact(self) -> bool:
+        return self.lower == self.upper
+
+class SearchTree:
+
+    """Search results kept across turns, rooted at the current position of a game.
+
+    Every position searched keeps its score bounds and best move, so a later turn only has
+    to search what the previous turns have not already proven. When the root advances along
+    the moves actually played, positions that can no longer be reached are dropped.
+
+    With ``mate_distance``, wins score by how soon they come, see GameState.evaluate_score.
+    Those scores still depend on nothing but the position, so stored bounds stay valid.
+    """
+
+    def __init__(self, maximizer: Mark, pruned: bool = True, mate_distance: bool = False) -> None:
+        self.maximizer = maximizer
+        self.pruned = pruned
+        self.mate_distance = mate_distance
+        self.root: GameState | None = None
+        self.results: dict[GameState, SearchResult] = {}
+
+        # number of nodes visited by each call to find_best_move
+        self.node_counts: list[int] = []
+        self._nodes = 0
+
+    def advance(self, game_state: GameState) -> None:
+        """Move the root to the given position and prune the unreachable branches."""
+        if game_state == self.root:
+            return
+        self.root = game_state
+        self.results = {
+            state: result
+            for state, result in self.results.items()
+            if is_reachable(game_state, state)
+        }
+
+    def find_best_move(self, game_state: GameState) -> Move | None:
+        self.advance(game_state)
+        self._nodes = 0
+
+        # the best score so far bounds the search of the next root move, so a move is only
+        # searched far enough to prove it can't beat the best one, and ties keep the first move
+        win = game_state.score_bounds(self.maximizer)[1] if self.mate_distance else 1
+        best_move, best_score = None, -SCORE_BOUND
+        for move in game_state.possible_moves:
+            score = self.search(move.after_state, best_score, SCORE_BOUND)
+            if score > best_score:
+                best_move, best_score = move, score
+                # nothing beats a proven win, or with mate distance, a win on this move
+                if best_score == win:
+                    break
+
+        if best_move is not None:
+            self.results[game_state] = SearchResult(
+                best_score, best_score, best_move.cell_index
+            )
+        self.node_counts.append(self._nodes)
+        return best_move
+
+    def search(self, game_state: GameState, alpha: int, beta: int) -> int:
+        self._nodes += 1
+        if not self.pruned:
+            # plain minimax never narrows the window, so every stored score is exact
+            alpha, beta = -SCORE_BOUND, SCORE_BOUND
+
+        # base case, return score if a terminal node has been reached
+        if game_state.game_over:
+            return game_state.evaluate_score(self.maximizer, self.mate_distance)
+
+        # mate-distance pruning, see minimax.pruned_minimax
+        if self.pruned and self.mate_distance:
+            lowest, highest = game_state.score_bounds(self.maximizer)
+            if highest <= alpha:
+                return highest
+            if lowest >= beta:
+                return lowest
+            alpha, beta = max(alpha, lowest), min(beta, highest)
+
+        # reuse what is already known about this position
+        result = self.results.get(game_state)
+        if result is None:
+            result = self.results[game_state] = SearchResult()
+        elif result.exact or result.lower >= beta:
+            return result.lower
+        elif result.upper <= alpha:
+            return result.upper
+        alpha = window_alpha = max(alpha, result.lower)
+        beta = window_beta = min(beta, result.upper)
+
+        maximizing = game_state.current_mark is self.maximizer
+        best_score = -SCORE_BOUND if maximizing else SCORE_BOUND
+        best_move = result.best_move
+        for move in self.ordered_moves(game_state, best_move):
+            score = self.search(move.after_state, alpha, beta)
+            if maximizing:
+                if score > best_score:
+                    best_score, best_move = score, move.cell_index
+                alpha = max(alpha, best_score)
+            else:
+                if score < best_score:
+                    best_score, best_move = score, move.cell_index
+                beta = min(beta, best_score)
+            if self.pruned and beta <= alpha:
+                break
+
+        # a score outside the window searched is only a bound on the true score
+        if best_score < window_beta:
+            result.upper = min(result.upper, best_score)
+        if best_score > window_alpha:
+            result.lower = max(result.lower, best_score)
+        result.best_move = best_move
+        return best_score
+
+    def ordered_moves(self, game_state: GameState, best_move: int | None) -> list[Move]:
+        # search the best move found on an earlier turn first, it is the most likely to cut off
+        moves = game_state.possible_moves
+        if best_move is None:
+            return moves
+        return sorted(moves, key=lambda move: move.cell_index != best_move)
+
+def is_reachable(root: GameState, game_state: GameState) -> bool:
+    """Return True if the position can still arise from the root position."""
+    return root.starting_mark is game_state.starting_mark and all(
+        cell == " " or cell == other
+        for cell, other in zip(root.grid.cells, game_state.grid.cells)
+    )
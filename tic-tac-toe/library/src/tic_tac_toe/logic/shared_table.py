@@ -0,0 +1,131 @@
+"""A fixed-size transposition table in shared memory, for searches split across processes.
+
+A dict is private to the process that fills it, so workers of a process pool each solve the
+positions the others have already solved. This table lives in one block of
+``multiprocessing.shared_memory`` that every worker attaches to, and it stands in for the
+dict of ConnectFourSearch: ``get(key)`` and ``table[key] = entry`` with the same
+``(depth, flag, value, best_move)`` entries.
+
+Entries are two 64-bit words, no locks are taken:
+
+- the data word packs the depth, bound type, value, best move and the writer's process
+- the check word is the key XOR the data, so an entry torn by two writers racing on the same
+  slot doesn't check out against any key, and is read as a miss rather than a wrong entry
+
+Keys hash to buckets of two slots. The first keeps the deepest entry, since deep results
+save the most work, and the second always takes the newest, so recent positions are found
+even when the first slot holds something deeper.
+"""
+
+from __future__ import annotations
+
+import os
+from multiprocessing import shared_memory
+
+SLOTS_PER_BUCKET = 2
+WORDS_PER_SLOT = 2
+WORD_BYTES = 8
+SLOT_MASK = (1 << 64) - 1
+
+# bit layout of the data word, which always has its lowest bit set so it is never 0
+DEPTH_SHIFT, FLAG_SHIFT, MOVE_SHIFT, VALUE_SHIFT, WRITER_SHIFT = 1, 8, 10, 14, 30
+VALUE_OFFSET = 1 << 15
+
+# a 64-bit odd constant that spreads keys over the buckets
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+class SharedTable:
+
+    """A transposition table in shared memory, created by one process and attached by others."""
+
+    def __init__(self, buckets: int = 1 << 18, name: str | None = None) -> None:
+        if buckets < 1 or buckets & (buckets - 1):
+            raise ValueError("The number of buckets must be a power of two")
+        self.buckets = buckets
+        size = buckets * SLOTS_PER_BUCKET * WORDS_PER_SLOT * WORD_BYTES
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            # only the creator unlinks the block, the pool's workers share its resource tracker
+            self.owner = False
+        self.words = self.memory.buf.cast("Q")
+        self.shift = 64 - buckets.bit_length() + 1
+        self.writer = os.getpid() & 0xFFFF
+
+        # lookups made through this process's handle
+        self.probes = 0
+        self.hits = 0
+        # hits on entries another process wrote
+        self.shared_hits = 0
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def get(self, key: int) -> tuple[int, int, int, int] | None:
+        self.probes += 1
+        words = self.words
+        first = self.bucket(key)
+        for slot in range(first, first + SLOTS_PER_BUCKET * WORDS_PER_SLOT, WORDS_PER_SLOT):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                self.hits += 1
+                if data >> WRITER_SHIFT != self.writer:
+                    self.shared_hits += 1
+                return unpack(data)
+        return None
+
+    def __setitem__(self, key: int, entry: tuple[int, int, int, int]) -> None:
+        depth = entry[0]
+        data = pack(entry, self.writer)
+        words = self.words
+        deepest = self.bucket(key)
+        stored = words[deepest + 1]
+        # the deepest slot is only given up to an entry at least as deep, or for the same key
+        if not stored or words[deepest] ^ stored == key or depth >= unpack(stored)[0]:
+            slot = deepest
+        else:
+            slot = deepest + WORDS_PER_SLOT
+        words[slot] = key ^ data
+        words[slot + 1] = data
+
+    def bucket(self, key: int) -> int:
+        """Return the index of the first word of the bucket a key hashes to."""
+        index = ((key * HASH_MULTIPLIER) & SLOT_MASK) >> self.shift
+        return index * SLOTS_PER_BUCKET * WORDS_PER_SLOT
+
+    def clear(self) -> None:
+        self.memory.buf[:] = bytes(len(self.memory.buf))
+
+    def close(self) -> None:
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self) -> SharedTable:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def pack(entry: tuple[int, int, int, int], writer: int) -> int:
+    depth, flag, value, best_move = entry
+    return (
+        1
+        | depth << DEPTH_SHIFT
+        | flag << FLAG_SHIFT
+        | (best_move + 1) << MOVE_SHIFT
+        | (value + VALUE_OFFSET) << VALUE_SHIFT
+        | writer << WRITER_SHIFT
+    )
+
+def unpack(data: int) -> tuple[int, int, int, int]:
+    return (
+        data >> DEPTH_SHIFT & 0x7F,
+        data >> FLAG_SHIFT & 0x3,
+        (data >> VALUE_SHIFT & 0xFFFF) - VALUE_OFFSET,
+        (data >> MOVE_SHIFT & 0xF) - 1,
+    )
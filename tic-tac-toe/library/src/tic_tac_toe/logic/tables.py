@@ -0,0 +1,240 @@
+"""Dense lookup tables indexed by a base-3 encoding of every possible grid.
+
+A grid of 9 cells, each empty, X or O, maps to a unique integer in
+[0, 3 ** 9) by treating cell ``i`` as the base-3 digit of weight ``3 ** i``
+(empty = 0, X = 1, O = 2). Derived facts about every one of the 19,683
+grids are precomputed once, on first use, into compact ``array`` blobs so
+that game state queries become a single index operation.
+
+Building the tables takes longer than starting the rest of the game, so they are
+also saved to a cache file, ``tables-<version>-<byte order>.bin`` in the
+directory named by ``TIC_TAC_TOE_CACHE``, by default ``~/.cache/tic-tac-toe``.
+Later runs read the arrays back from it instead. Setting the variable to an empty
+string turns the cache off.
+"""
+
+import os
+import sys
+from array import array
+from functools import lru_cache
+from itertools import product
+from typing import NamedTuple
+
+CELLS = 9
+GRID_COUNT = 3**CELLS
+POWERS = tuple(3**cell for cell in range(CELLS))
+
+EMPTY, CROSS, NAUGHT = 0, 1, 2
+DIGITS = {" ": EMPTY, "X": CROSS, "O": NAUGHT}
+SYMBOLS = " XO"
+
+# cell indices of the win lines, in the same order as WINNING_PATTERNS
+WIN_LINES = (
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),
+    (0, 4, 8),
+    (2, 4, 6),
+)
+NO_LINE = -1
+
+# legality codes, one per starting mark, matching the validators' checks
+LEGAL = 0
+WRONG_NUMBER_OF_MARKS = 1
+WRONG_STARTING_MARK = 2
+WRONG_NUMBER_OF_XS = 3
+WRONG_NUMBER_OF_OS = 4
+
+CACHE_ENVIRONMENT_VARIABLE = "TIC_TAC_TOE_CACHE"
+# bump whenever the contents of the tables change, so stale cache files aren't read
+CACHE_VERSION = 1
+
+class Tables(NamedTuple):
+    # index of every grid string, so encoding is a single dictionary lookup
+    indices: dict[str, int]
+    x_count: array
+    o_count: array
+    winner: array
+    winning_line: array
+    tie: array
+    # legality for X starting at [index], for O starting at [GRID_COUNT + index]
+    legality: array
+    # digit of the mark to move, laid out like legality
+    current_mark: array
+    # empty cells that would complete a line, one bit per cell, for X at [index] and for O
+    # at [GRID_COUNT + index]
+    threats: array
+
+def encode(cells: str) -> int:
+    """Return the base-3 index of a 9-cell grid string."""
+    indices = tables().indices
+    try:
+        return indices[cells]
+    except (KeyError, TypeError):
+        raise ValueError("Must contain 9 cells of: X, O, or space") from None
+
+def decode(index: int) -> str:
+    """Return the grid string encoded by a base-3 index."""
+    if not 0 <= index < GRID_COUNT:
+        raise ValueError(f"Grid index must be in [0, {GRID_COUNT})")
+    cells = []
+    for _ in range(CELLS):
+        index, digit = divmod(index, 3)
+        cells.append(SYMBOLS[digit])
+    return "".join(cells)
+
+def digit_at(index: int, cell: int) -> int:
+    """Return the digit (EMPTY, CROSS or NAUGHT) of one cell of an encoded grid."""
+    return index // POWERS[cell] % 3
+
+def child_index(index: int, cell: int, mark_digit: int) -> int:
+    """Return the index of the grid reached by placing a mark on an empty cell."""
+    return index + POWERS[cell] * mark_digit
+
+def empty_cells(index: int) -> list[int]:
+    """Return the empty cells of an encoded grid in ascending order."""
+    cells = []
+    for cell in range(CELLS):
+        index, digit = divmod(index, 3)
+        if digit == EMPTY:
+            cells.append(cell)
+    return cells
+
+def threat_cells(index: int, digit: int) -> list[int]:
+    """Return the empty cells where a mark, given by its digit, would complete a line."""
+    threats = tables().threats[offset(digit) + index]
+    return [cell for cell in range(CELLS) if threats >> cell & 1]
+
+def mark_digit(mark: str) -> int:
+    return DIGITS[mark]
+
+@lru_cache(maxsize=None)
+def tables() -> Tables:
+    """Load the lookup tables on first use, building them if there is no cache, and reuse them."""
+    path = cache_path()
+    lookup = read_cache(path) if path else None
+    if lookup is None:
+        lookup = build_tables()
+        if path:
+            write_cache(path, lookup)
+    return lookup
+
+def cache_path() -> str | None:
+    directory = os.environ.get(CACHE_ENVIRONMENT_VARIABLE)
+    if directory is None:
+        directory = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tic-tac-toe"
+        )
+    if not directory:
+        return None
+    return os.path.join(directory, f"tables-{CACHE_VERSION}-{sys.byteorder}.bin")
+
+def read_cache(path: str) -> Tables | None:
+    """Return the tables saved in a cache file, or None if it is missing or doesn't fit."""
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    layout = [(array(typecode), length) for typecode, length in _cached_arrays()]
+    if len(data) != sum(values.itemsize * length for values, length in layout):
+        return None
+    arrays = []
+    start = 0
+    for values, length in layout:
+        end = start + length * values.itemsize
+        values.frombytes(data[start:end])
+        arrays.append(values)
+        start = end
+    # the cell strings in index order, cell 0 being the least significant digit
+    indices = {
+        "".join(digits)[::-1]: index
+        for index, digits in enumerate(product(SYMBOLS, repeat=CELLS))
+    }
+    return Tables(indices, *arrays)
+
+def write_cache(path: str, lookup: Tables) -> None:
+    # the cache only saves time, so a directory that can't be written is no error
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            for values in lookup[1:]:
+                values.tofile(file)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+def _cached_arrays() -> list[tuple[str, int]]:
+    """Return the typecode and length of every array of the tables, in the order they are saved."""
+    return [("b", GRID_COUNT)] * 5 + [("b", 2 * GRID_COUNT)] * 2 + [("H", 2 * GRID_COUNT)]
+
+def build_tables() -> Tables:
+    """Compute every lookup table from scratch."""
+    indices = {}
+    x_count = array("b", bytes(GRID_COUNT))
+    o_count = array("b", bytes(GRID_COUNT))
+    winner = array("b", bytes(GRID_COUNT))
+    winning_line = array("b", [NO_LINE]) * GRID_COUNT
+    tie = array("b", bytes(GRID_COUNT))
+    legality = array("b", bytes(2 * GRID_COUNT))
+    current_mark = array("b", bytes(2 * GRID_COUNT))
+    threats = array("H", bytes(2 * 2 * GRID_COUNT))
+
+    for index in range(GRID_COUNT):
+        digits = [index // power % 3 for power in POWERS]
+        indices["".join(SYMBOLS[digit] for digit in digits)] = index
+        xs = digits.count(CROSS)
+        os = digits.count(NAUGHT)
+        x_count[index] = xs
+        o_count[index] = os
+
+        # the first matching line wins, checking X before O on each line,
+        # exactly as the regex scan over WINNING_PATTERNS does
+        for line_number, line in enumerate(WIN_LINES):
+            first = digits[line[0]]
+            if first != EMPTY and first == digits[line[1]] == digits[line[2]]:
+                winner[index] = first
+                winning_line[index] = line_number
+                break
+        tie[index] = winner[index] == EMPTY and xs + os == CELLS
+
+        for line in WIN_LINES:
+            marks = [digits[cell] for cell in line]
+            if marks.count(EMPTY) == 1:
+                mark = max(marks)
+                if marks.count(mark) == 2:
+                    mark_offset = 0 if mark == CROSS else GRID_COUNT
+                    threats[mark_offset + index] |= 1 << line[marks.index(EMPTY)]
+
+        for offset, starting in ((0, CROSS), (GRID_COUNT, NAUGHT)):
+            other = NAUGHT if starting == CROSS else CROSS
+            current_mark[offset + index] = starting if xs == os else other
+            legality[offset + index] = _legality(
+                xs, os, starting, winner[index]
+            )
+
+    return Tables(
+        indices,
+        x_count, o_count, winner, winning_line, tie, legality, current_mark, threats
+    )
+
+def _legality(xs: int, os: int, starting: int, winner: int) -> int:
+    if abs(xs - os) > 1:
+        return WRONG_NUMBER_OF_MARKS
+    if xs > os and starting != CROSS or os > xs and starting != NAUGHT:
+        return WRONG_STARTING_MARK
+    if winner == CROSS:
+        if starting == CROSS and xs <= os or starting == NAUGHT and xs != os:
+            return WRONG_NUMBER_OF_XS
+    elif winner == NAUGHT:
+        if starting == NAUGHT and os <= xs or starting == CROSS and os != xs:
+            return WRONG_NUMBER_OF_OS
+    return LEGAL
+
+def offset(starting_digit: int) -> int:
+    """Return the offset into the per-starting-mark tables."""
+    return 0 if starting_digit == CROSS else GRID_COUNT
@@ -0,0 +1,51 @@
+"""A cheap tactical scan that settles or narrows a search at each node.
+
+Before recursing into every possible move, a search can look at the threats on the win
+lines, precomputed in the lookup tables:
+
+- if the side to move can complete a line, that win is the best move there is
+- if the opponent threatens to complete two lines at once, only one can be blocked, so the
+  position is lost whatever is played
+- if the opponent threatens exactly one line, every move but the block loses at once, so
+  the block is the only move worth searching
+
+None of these change the score of the position, so searches stay exact.
+"""
+
+from typing import NamedTuple
+
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.models import GameState, Mark, Move
+
+WIN, LOSS = 1, -1
+
+class Tactic(NamedTuple):
+    # WIN or LOSS when the scan proves the outcome for the side to move, otherwise None
+    verdict: int | None
+    moves: list[Move]
+
+def scan(game_state: GameState) -> Tactic:
+    """Return the verdict of the threat scan and the moves still worth searching."""
+    moves = game_state.possible_moves
+    mover = tables.mark_digit(game_state.current_mark)
+    index = game_state.grid.index
+    if wins := tables.threat_cells(index, mover):
+        return Tactic(WIN, forced(moves, wins[:1]))
+    blocks = tables.threat_cells(index, tables.NAUGHT if mover == tables.CROSS else tables.CROSS)
+    if len(blocks) > 1:
+        return Tactic(LOSS, forced(moves, blocks))
+    if blocks:
+        return Tactic(None, forced(moves, blocks))
+    return Tactic(None, moves)
+
+def forced(moves: list[Move], cells: list[int]) -> list[Move]:
+    return [move for move in moves if move.cell_index in cells]
+
+def verdict_score(
+    game_state: GameState, verdict: int, mark: Mark, mate_distance: bool = False
+) -> int:
+    """Return the score for a mark of a position whose outcome the scan has proven."""
+    # a win comes with this move and a loss with the next one, see GameState.evaluate_score
+    empty = game_state.grid.empty_count
+    score = (empty if verdict == WIN else empty - 1) if mate_distance else 1
+    return verdict * score if game_state.current_mark is mark else -verdict * score
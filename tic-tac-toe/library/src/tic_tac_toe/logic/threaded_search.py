@@ -0,0 +1,115 @@
+"""Tic-tac-toe search split by root move over a pool of threads.
+
+Threads share the game states and one transposition table without pickling anything,
+which is what makes them worth having over a process pool, but only if everything they
+share is safe to use at the same time. Without the GIL of the free-threaded build that
+takes explicit care:
+
+- table entries are immutable tuples of score bounds, read without a lock and merged under
+  one of several striped locks, so two threads storing the same position can't lose bounds
+- the best root score so far is shared under a lock and used as the lower bound of the
+  window of the root moves searched after it
+- GameState keeps its derived values in slots filled before the state is shared, and two
+  threads caching the same possible moves can only store equal lists, see retention.py
+- the lookup tables are built before any thread starts
+
+On the standard interpreter the GIL still runs one thread at a time, so the threads share
+the table but don't add speed. ``python3 -m console threads`` reports the scaling of either.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Move
+
+LOCK_STRIPES = 64
+
+class ThreadSafeTable:
+
+    """Score bounds of positions, for the player to move, shared by the threads of a search."""
+
+    def __init__(self, stripes: int = LOCK_STRIPES) -> None:
+        self.entries: dict[GameState, tuple[int, int]] = {}
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def get(self, game_state: GameState) -> tuple[int, int]:
+        # entries are replaced whole, never changed in place, so a read needs no lock
+        return self.entries.get(game_state, (-SCORE_BOUND, SCORE_BOUND))
+
+    def store(self, game_state: GameState, lower: int, upper: int) -> None:
+        """Narrow the bounds of a position, keeping what other threads have proven."""
+        with self.locks[hash(game_state) % len(self.locks)]:
+            stored_lower, stored_upper = self.get(game_state)
+            self.entries[game_state] = max(lower, stored_lower), min(upper, stored_upper)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+class ThreadedSearch:
+
+    """Scores the root moves in a thread pool, sharing a table kept between the moves of a game."""
+
+    def __init__(self, workers: int = 4, mate_distance: bool = False) -> None:
+        self.workers = workers
+        self.mate_distance = mate_distance
+        self.table = ThreadSafeTable()
+        self._lock = threading.Lock()
+        self._best: tuple[int, int] = (-SCORE_BOUND, -1)
+
+    def find_best_move(self, game_state: GameState) -> Move | None:
+        moves = game_state.possible_moves
+        if not moves:
+            return None
+        tables.tables()
+        self._best = (-SCORE_BOUND, -1)
+        with ThreadPoolExecutor(self.workers) as pool:
+            list(pool.map(self.search_root_move, range(len(moves)), moves))
+        return moves[self._best[1]]
+
+    def search_root_move(self, index: int, move: Move) -> None:
+        alpha = self._best[0]
+        score = -alpha_beta(move.after_state, -SCORE_BOUND, -alpha, self.table, self.mate_distance)
+        with self._lock:
+            # a move that failed low scored at most the best score when it started, so only
+            # an exact score can be higher, and of equal scores the first one found is kept
+            if score > self._best[0]:
+                self._best = (score, index)
+
+def alpha_beta(
+    game_state: GameState,
+    alpha: int,
+    beta: int,
+    table: ThreadSafeTable,
+    mate_distance: bool = False,
+) -> int:
+    """Fail-soft alpha-beta for the player to move, reading and storing the shared table."""
+    if game_state.game_over:
+        return game_state.evaluate_score(game_state.current_mark, mate_distance)
+
+    lower, upper = table.get(game_state)
+    if lower >= beta:
+        return lower
+    if upper <= alpha:
+        return upper
+    alpha, beta = max(alpha, lower), min(beta, upper)
+
+    best_score = -SCORE_BOUND
+    window_alpha = alpha
+    for move in game_state.possible_moves:
+        score = -alpha_beta(move.after_state, -beta, -window_alpha, table, mate_distance)
+        best_score = max(best_score, score)
+        window_alpha = max(window_alpha, score)
+        if best_score >= beta:
+            break
+
+    # a score outside the window only bounds the value, one inside it is exact
+    if best_score <= alpha:
+        table.store(game_state, -SCORE_BOUND, best_score)
+    elif best_score >= beta:
+        table.store(game_state, best_score, SCORE_BOUND)
+    else:
+        table.store(game_state, best_score, best_score)
+    return best_score
@@ -0,0 +1,260 @@
+"""Opt-in trace of every node minimax.pruned_minimax visits, streamed to a compact file.
+
+Nothing here runs unless it is enabled for a block of code::
+
+    with tracing.tracing("search.trace", sample=0.1, max_depth=4):
+        minimax.pruned_find_best_move(game_state)
+    with tracing.TraceReader("search.trace") as trace:
+        cutoff_rates = {depth: stats.cutoff_rate for depth, stats in trace.depths().items()}
+
+Like instrumentation.py, enabling wraps ``pruned_minimax`` where the module looks it up, so
+the recursive calls go through the tracer too, and disabling puts the original back.
+
+A trace file starts with an 8 byte header followed by fixed-size 11 byte records, one per
+node, written when the node returns, so children come before their parent::
+
+    bytes 0-1   GameState.index of the position, the grid index offset by the starting mark
+    byte 2      depth, 1 for the moves of the position searched
+    bytes 3-5   alpha and beta on entry and the returned score, signed
+    byte 6      bit 0 cutoff, bit 1 terminal position, bit 2 the maximizer was to move
+    bytes 7-10  nodes in the subtree of the node, itself included
+
+Sampling and the depth limit only decide which nodes are written. Every node is still
+counted, so the subtree sizes of the written nodes are exact.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from typing import BinaryIO, Callable, Iterator, NamedTuple
+
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.models import SCORE_BOUND, GameState, Grid, Mark, Move
+
+MAGIC = b"TTTS"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+RECORD = struct.Struct("<HBbbbBI")
+
+CUTOFF, TERMINAL, MAXIMIZING = 1, 2, 4
+
+class TraceNode(NamedTuple):
+    index: int
+    depth: int
+    alpha: int
+    beta: int
+    score: int
+    flags: int
+    nodes: int
+
+    @property
+    def cutoff(self) -> bool:
+        return bool(self.flags & CUTOFF)
+
+    @property
+    def terminal(self) -> bool:
+        return bool(self.flags & TERMINAL)
+
+    @property
+    def position(self) -> GameState:
+        return position(self.index)
+
+@dataclass
+class DepthStats:
+    nodes: int = 0
+    # nodes with moves to search, the only ones that can be cut off
+    interior: int = 0
+    cutoffs: int = 0
+
+    @property
+    def cutoff_rate(self) -> float:
+        return self.cutoffs / self.interior if self.interior else 0.0
+
+class Tracer:
+
+    """Counts the nodes of a search and writes the sampled ones to a trace file."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        sample: float = 1.0,
+        max_depth: int | None = None,
+        seed: int = 0,
+        buffer_size: int = 64 * 1024,
+    ) -> None:
+        if not 0.0 < sample <= 1.0:
+            raise ValueError("The sample rate must be in (0, 1]")
+        self.sample = sample
+        self.max_depth = max_depth
+        self.random = random.Random(seed)
+        self.depth = 0
+        self.nodes = 0
+        # the children searched so far by each node on the path to the current one
+        self._children: list[int] = []
+        self.written = 0
+        self._file: BinaryIO = open(path, "wb", buffering=buffer_size)
+        self._file.write(HEADER)
+
+    def traced(self, function: Callable[..., int]) -> Callable[..., int]:
+        @wraps(function)
+        def wrapper(
+            move: Move,
+            maximizer: Mark,
+            alpha: int = -SCORE_BOUND,
+            beta: int = SCORE_BOUND,
+            *args,
+            **kwargs,
+        ) -> int:
+            self.depth += 1
+            first = self.nodes
+            self.nodes += 1
+            if self._children:
+                self._children[-1] += 1
+            self._children.append(0)
+            try:
+                score = function(move, maximizer, alpha, beta, *args, **kwargs)
+            finally:
+                self.depth -= 1
+                children = self._children.pop()
+            self.record(move.after_state, maximizer, alpha, beta, score, self.nodes - first, children)
+            return score
+        return wrapper
+
+    def record(
+        self,
+        game_state: GameState,
+        maximizer: Mark,
+        alpha: int,
+        beta: int,
+        score: int,
+        nodes: int,
+        children: int,
+    ) -> None:
+        depth = self.depth + 1
+        if self.max_depth is not None and depth > self.max_depth:
+            return
+        if self.sample < 1.0 and self.random.random() >= self.sample:
+            return
+        if game_state.game_over:
+            flags = TERMINAL
+        else:
+            maximizing = game_state.current_mark is maximizer
+            # a cutoff is a node whose score fell outside the window on the side of its player
+            # before all of its moves were searched, so a failing last move prunes nothing
+            failed = score >= beta if maximizing else score <= alpha
+            cutoff = failed and children < len(game_state.possible_moves)
+            flags = (MAXIMIZING if maximizing else 0) | (CUTOFF if cutoff else 0)
+        self._file.write(RECORD.pack(game_state.index, depth, alpha, beta, score, flags, nodes))
+        self.written += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+_active: Tracer | None = None
+_originals: list[tuple[object, str, Callable]] = []
+
+def enable(
+    path: str | os.PathLike,
+    sample: float = 1.0,
+    max_depth: int | None = None,
+    seed: int = 0,
+) -> Tracer:
+    """Start tracing to a file, wrapping pruned_minimax in place."""
+    global _active
+    from tic_tac_toe.logic import minimax
+
+    if _active is not None:
+        return _active
+    _active = tracer = Tracer(path, sample, max_depth, seed)
+    _originals.append((minimax, "pruned_minimax", minimax.pruned_minimax))
+    minimax.pruned_minimax = tracer.traced(minimax.pruned_minimax)
+    return tracer
+
+def disable() -> Tracer | None:
+    """Stop tracing, flush the trace file and restore pruned_minimax."""
+    global _active
+    tracer, _active = _active, None
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+    if tracer:
+        tracer.close()
+    return tracer
+
+@contextmanager
+def tracing(
+    path: str | os.PathLike,
+    sample: float = 1.0,
+    max_depth: int | None = None,
+    seed: int = 0,
+) -> Iterator[Tracer]:
+    tracer = enable(path, sample, max_depth, seed)
+    try:
+        yield tracer
+    finally:
+        disable()
+
+def position(index: int) -> GameState:
+    """Return the game state of a GameState.index, as written to trace files."""
+    starting_mark = Mark.NAUGHT if index >= tables.GRID_COUNT else Mark.CROSS
+    return GameState(Grid(tables.decode(index % tables.GRID_COUNT)), starting_mark)
+
+class TraceReader:
+
+    """Memory-mapped reader that iterates and aggregates the nodes of a trace file."""
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        with open(path, "rb") as trace_file:
+            if trace_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a search trace file")
+            trace_file.seek(0, os.SEEK_END)
+            size = trace_file.tell()
+            self._map = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = (size - len(HEADER)) // RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[TraceNode]:
+        for fields in RECORD.iter_unpack(self._map[len(HEADER) : len(HEADER) + self._count * RECORD.size]):
+            yield TraceNode(*fields)
+
+    def depths(self) -> dict[int, DepthStats]:
+        """Return the nodes and cutoffs at every depth."""
+        stats: dict[int, DepthStats] = {}
+        for node in self:
+            depth = stats.setdefault(node.depth, DepthStats())
+            depth.nodes += 1
+            if not node.terminal:
+                depth.interior += 1
+                depth.cutoffs += node.cutoff
+        return dict(sorted(stats.items()))
+
+    def heaviest(self, top: int = 10) -> list[tuple[int, int, int]]:
+        """Return the positions whose subtrees took the most nodes over all their visits.
+
+        Each is the position's GameState.index, its number of visits and the nodes of all
+        its subtrees. A position searched again by another path counts every search.
+        """
+        visits: Counter[int] = Counter()
+        nodes: Counter[int] = Counter()
+        for node in self:
+            visits[node.index] += 1
+            nodes[node.index] += node.nodes
+        return [(index, visits[index], total) for index, total in nodes.most_common(top)]
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> TraceReader:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,162 @@
+"""Ultimate tic-tac-toe: a meta-board of nine tic-tac-toe grids.
+
+Each sub-board is stored as its base-3 grid index from the lookup tables, so a whole
+position is nine small integers and the win logic of every sub-board is a table lookup,
+exactly as it is for GameState. The cell played in a sub-board picks the sub-board the
+opponent must play in next, unless that one is already decided, in which case they may
+play in any open sub-board. Winning a sub-board claims its cell on the meta-board, and
+three claimed sub-boards in a row win the game.
+
+Moves are numbered board by board: cell ``board * 9 + cell`` is cell ``cell`` of sub-board
+``board``, both counted row by row from the top left.
+"""
+
+from dataclasses import dataclass
+
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.exceptions import InvalidGameState, InvalidMove, UnknownGameScore
+from tic_tac_toe.logic.models import MARKS, Mark, Move, derived, set_slot
+
+BOARDS = tables.CELLS
+CELLS = BOARDS * tables.CELLS
+EMPTY_BOARDS = (0,) * BOARDS
+
+# the active board when the player to move may play in any open sub-board
+ANY_BOARD = -1
+
+def board_outcome(index: int) -> tuple[int, bool]:
+    """Return the winner digit of a sub-board, or EMPTY, and whether it is decided."""
+    lookup = tables.tables()
+    winner = lookup.winner[index]
+    return winner, winner != tables.EMPTY or bool(lookup.tie[index])
+
+def meta_index(boards: tuple[int, ...]) -> tuple[int, int]:
+    """Return the grid index of the meta-board and a bitmask of the decided sub-boards.
+
+    A drawn sub-board stays empty on the meta-board, since neither player can claim it.
+    """
+    index = closed = 0
+    for board, board_index in enumerate(boards):
+        winner, decided = board_outcome(board_index)
+        index += tables.POWERS[board] * winner
+        closed |= decided << board
+    return index, closed
+
+@dataclass(frozen=True, slots=True)
+class UltimateState:
+
+    """An ultimate tic-tac-toe position, playing the role GameState plays for tic-tac-toe."""
+
+    boards: tuple[int, ...] = EMPTY_BOARDS
+    active: int = ANY_BOARD
+    starting_mark: Mark = Mark("X")
+
+    meta: int = derived()
+    closed: int = derived()
+    move_count: int = derived()
+    current_mark: Mark = derived()
+    winner: Mark | None = derived()
+    tie: bool = derived()
+    game_over: bool = derived()
+
+    def __post_init__(self) -> None:
+        validate_ultimate_state(self)
+        lookup = tables.tables()
+        meta, closed = meta_index(self.boards)
+        set_slot(self, "meta", meta)
+        set_slot(self, "closed", closed)
+        x_count = sum(lookup.x_count[board] for board in self.boards)
+        o_count = sum(lookup.o_count[board] for board in self.boards)
+        set_slot(self, "move_count", x_count + o_count)
+        set_slot(
+            self,
+            "current_mark",
+            self.starting_mark if x_count == o_count else self.starting_mark.other,
+        )
+        set_slot(self, "winner", MARKS[lookup.winner[meta]])
+        set_slot(
+            self, "tie", self.winner is None and closed == (1 << BOARDS) - 1
+        )
+        set_slot(self, "game_over", self.winner is not None or self.tie)
+
+    @property
+    def game_not_started(self) -> bool:
+        return self.move_count == 0
+
+    @property
+    def cells(self) -> str:
+        """The 81 cells of X, O or space, sub-board by sub-board."""
+        return "".join(tables.decode(board) for board in self.boards)
+
+    @property
+    def winning_cells(self) -> list[int]:
+        """The cells of the sub-boards on the winning line of the meta-board."""
+        line = tables.tables().winning_line[self.meta]
+        if line == tables.NO_LINE:
+            return []
+        return [
+            board * tables.CELLS + cell
+            for board in tables.WIN_LINES[line]
+            for cell in range(tables.CELLS)
+        ]
+
+    def playable_boards(self) -> list[int]:
+        if self.game_over:
+            return []
+        if self.active != ANY_BOARD:
+            return [self.active]
+        return [board for board in range(BOARDS) if not self.closed >> board & 1]
+
+    @property
+    def possible_moves(self) -> list[Move]:
+        return [
+            self.make_move_to(board * tables.CELLS + cell)
+            for board in self.playable_boards()
+            for cell in tables.empty_cells(self.boards[board])
+        ]
+
+    def make_move_to(self, index: int) -> Move:
+        board, cell = divmod(index, tables.CELLS)
+        if board not in self.playable_boards():
+            raise InvalidMove("Sub-board is not in play")
+        if tables.digit_at(self.boards[board], cell) != tables.EMPTY:
+            raise InvalidMove("Cell is not empty")
+        boards = list(self.boards)
+        boards[board] = tables.child_index(
+            boards[board], cell, tables.mark_digit(self.current_mark)
+        )
+        # the cell played sends the opponent to the sub-board in the same position
+        _, decided = board_outcome(boards[cell])
+        return Move(
+            mark=self.current_mark,
+            cell_index=index,
+            before_state=self,
+            after_state=UltimateState(
+                tuple(boards), ANY_BOARD if decided else cell, self.starting_mark
+            ),
+        )
+
+    def evaluate_score(self, mark: Mark) -> int:
+        # perform static evaluation of scores for terminal game states
+        if self.game_over:
+            if self.tie:
+                return 0
+            return 1 if self.winner is mark else -1
+        raise UnknownGameScore("Game is not over yet")
+
+def validate_ultimate_state(game_state: UltimateState) -> None:
+    boards = game_state.boards
+    if len(boards) != BOARDS or not all(0 <= board < tables.GRID_COUNT for board in boards):
+        raise InvalidGameState("Must contain 9 sub-boards")
+    lookup = tables.tables()
+    x_count = sum(lookup.x_count[board] for board in boards)
+    o_count = sum(lookup.o_count[board] for board in boards)
+    if abs(x_count - o_count) > 1:
+        raise InvalidGameState("Wrong number of Xs and Os")
+    if x_count > o_count and game_state.starting_mark != "X":
+        raise InvalidGameState("Wrong starting mark")
+    if o_count > x_count and game_state.starting_mark != "O":
+        raise InvalidGameState("Wrong starting mark")
+    if game_state.active != ANY_BOARD:
+        if not 0 <= game_state.active < BOARDS or board_outcome(boards[game_state.active])[1]:
+            raise InvalidGameState("The active sub-board must be open")
@@ -0,0 +1,267 @@
+"""Real-time alpha-beta search for ultimate tic-tac-toe.
+
+The game tree of ultimate tic-tac-toe is far too big for minimax to reach the end of, so
+this search deepens iteratively within a time budget, like the Connect Four search, and
+scores the positions past its horizon with a heuristic:
+
+- sub-boards won, with the center sub-board worth more
+- lines of the meta-board each player can still complete, by the sub-boards won on them
+- two-in-a-rows on the open sub-boards, straight from the lookup tables' threat masks
+
+It works on a mutable list of the nine sub-board grid indices, making and unmaking moves in
+place, and keeps a transposition table of bounds and best moves between the moves of a game.
+"""
+
+from array import array
+from functools import lru_cache
+
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.budget import Deadline, SearchStats, SearchTimeout
+from tic_tac_toe.logic.ultimate import ANY_BOARD, BOARDS, CELLS, UltimateState
+
+# wins score above any heuristic score, and sooner wins score higher; a win is scored by the
+# number of moves played in the game when it comes, not by its distance from the search root,
+# so the scores the table keeps between turns stay right once more moves have been played
+WIN_SCORE = 100_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+ALL_CLOSED = (1 << BOARDS) - 1
+CENTER = 4
+
+SUB_BOARD_WON = 100
+CENTER_BOARD_WON = 150
+# weights of a meta-board line holding only one player's sub-boards, by how many they hold
+META_LINE_WEIGHTS = (0, 20, 200)
+THREAT = 8
+CENTER_CELL = 3
+
+class UltimateSearch:
+
+    """Alpha-beta search with a transposition table, kept between the moves of a game."""
+
+    def __init__(self, time_budget: float = 1.0, max_table_size: int = 1_000_000) -> None:
+        self.time_budget = time_budget
+        self.max_table_size = max_table_size
+        self.table: dict[tuple, tuple[int, int, int, int]] = {}
+        self.stats = SearchStats()
+        self._deadline = Deadline(0.0, self.stats)
+
+    def find_best_move_to(self, game_state: UltimateState) -> int | None:
+        """Return the cell to play, as passed to UltimateState.make_move_to."""
+        moves = [move.cell_index for move in game_state.possible_moves]
+        if not moves:
+            return None
+
+        self.stats = SearchStats()
+        self._deadline = Deadline(self.time_budget, self.stats)
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+
+        boards = list(game_state.boards)
+        mover = tables.mark_digit(game_state.current_mark)
+        best_move = moves[0]
+        try:
+            for depth in range(1, CELLS - game_state.move_count + 1):
+                score, best_move = self.search_root(
+                    boards,
+                    game_state.meta,
+                    game_state.closed,
+                    mover,
+                    game_state.move_count,
+                    depth,
+                    moves,
+                    best_move,
+                )
+                self.stats.depth, self.stats.score = depth, score
+                # a proven result can't change with more depth
+                if abs(score) > WIN_SCORE // 2:
+                    break
+        except SearchTimeout:
+            pass
+        self._deadline.stop()
+        return best_move
+
+    def search_root(
+        self,
+        boards: list[int],
+        meta: int,
+        closed: int,
+        mover: int,
+        move_count: int,
+        depth: int,
+        moves: list[int],
+        best_move: int,
+    ) -> tuple[int, int]:
+        # the best move of the previous iteration is searched first
+        moves = [best_move] + [move for move in moves if move != best_move]
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        for move in moves:
+            score = self.try_move(boards, meta, closed, mover, move, depth, alpha, beta, move_count)
+            if score > alpha:
+                alpha, best_move = score, move
+        return alpha, best_move
+
+    def try_move(
+        self,
+        boards: list[int],
+        meta: int,
+        closed: int,
+        mover: int,
+        move: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+        moves: int,
+    ) -> int:
+        """Play a move in place, score it for the mover and take it back.
+
+        ``moves`` is the number of moves played in the game before this one.
+        """
+        lookup = tables.tables()
+        board, cell = divmod(move, tables.CELLS)
+        before = boards[board]
+        after = boards[board] = before + tables.POWERS[cell] * mover
+        try:
+            if lookup.winner[after]:
+                meta += tables.POWERS[board] * mover
+                closed |= 1 << board
+                if lookup.winner[meta] == mover:
+                    return WIN_SCORE - moves - 1
+            elif lookup.tie[after]:
+                closed |= 1 << board
+            if closed == ALL_CLOSED:
+                return 0
+            active = ANY_BOARD if closed >> cell & 1 else cell
+            return -self.negamax(
+                boards, meta, closed, active, 3 - mover, depth - 1, -beta, -alpha, moves + 1
+            )
+        finally:
+            boards[board] = before
+
+    def negamax(
+        self,
+        boards: list[int],
+        meta: int,
+        closed: int,
+        active: int,
+        mover: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+        moves: int,
+    ) -> int:
+        self._deadline.visit()
+        if depth == 0:
+            return evaluate(boards, meta, closed, mover)
+
+        alpha_before = alpha
+        key = (*boards, active, mover)
+        best_move = -1
+        entry = self.table.get(key)
+        if entry:
+            entry_depth, flag, value, best_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_score = -WIN_SCORE * 2
+        for move in ordered_moves(boards, closed, active, mover, best_move):
+            score = self.try_move(boards, meta, closed, mover, move, depth, alpha, beta, moves)
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_before:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, flag, best_score, best_move)
+        return best_score
+
+def ordered_moves(
+    boards: list[int], closed: int, active: int, mover: int, best_move: int
+) -> list[int]:
+    """Return the moves with the best known one first, then those winning a sub-board."""
+    playable = [active] if active != ANY_BOARD else [
+        board for board in range(BOARDS) if not closed >> board & 1
+    ]
+    threats = tables.tables().threats
+    offset = tables.offset(mover)
+    first, rest = [], []
+    for board in playable:
+        index = boards[board]
+        wins = threats[offset + index]
+        base = board * tables.CELLS
+        for cell in empty_cells(index):
+            (first if wins >> cell & 1 else rest).append(base + cell)
+    moves = first + rest
+    if best_move in moves:
+        moves.remove(best_move)
+        moves.insert(0, best_move)
+    return moves
+
+def evaluate(boards: list[int], meta: int, closed: int, mover: int) -> int:
+    """Score a position for the player to move."""
+    lookup = tables.tables()
+    scores = board_scores()
+    score = 0
+    for board, index in enumerate(boards):
+        if closed >> board & 1:
+            continue
+        score += scores[index]
+    for line in tables.WIN_LINES:
+        crosses = noughts = 0
+        for board in line:
+            winner = lookup.winner[boards[board]]
+            if winner == tables.CROSS:
+                crosses += 1
+            elif winner == tables.NAUGHT:
+                noughts += 1
+            elif closed >> board & 1:
+                # a drawn sub-board blocks the line for both players
+                crosses = noughts = 3
+                break
+        if not noughts:
+            score += META_LINE_WEIGHTS[crosses]
+        elif not crosses:
+            score -= META_LINE_WEIGHTS[noughts]
+    for board in range(BOARDS):
+        winner = lookup.winner[boards[board]]
+        if winner:
+            won = CENTER_BOARD_WON if board == CENTER else SUB_BOARD_WON
+            score += won if winner == tables.CROSS else -won
+    # the scores above are for X
+    return score if mover == tables.CROSS else -score
+
+@lru_cache(maxsize=None)
+def board_scores() -> array:
+    """Score every open sub-board for X by its two-in-a-rows and its center cell."""
+    lookup = tables.tables()
+    scores = array("h", bytes(2 * tables.GRID_COUNT))
+    for index in range(tables.GRID_COUNT):
+        score = THREAT * (
+            lookup.threats[index].bit_count()
+            - lookup.threats[tables.GRID_COUNT + index].bit_count()
+        )
+        center = tables.digit_at(index, CENTER)
+        if center == tables.CROSS:
+            score += CENTER_CELL
+        elif center == tables.NAUGHT:
+            score -= CENTER_CELL
+        scores[index] = score
+    return scores
+
+@lru_cache(maxsize=tables.GRID_COUNT)
+def empty_cells(index: int) -> tuple[int, ...]:
+    return tuple(tables.empty_cells(index))
@@ -6,20 +6,26 @@ if TYPE_CHECKING:
     from tic_tac_toe.game.players import Player
     from tic_tac_toe.logic.models import GameState, Grid, Mark
 
-import re
-
+from tic_tac_toe.logic import tables
 from tic_tac_toe.logic.exceptions import InvalidGameState
 
-def validate_grid(grid: Grid) -> None:
-    if not re.match(r"^[\sXO]{9}$", grid.cells):
-        raise ValueError("Must contain 9 cells of: X, O, or space")
+LEGALITY_ERRORS = {
+    tables.WRONG_NUMBER_OF_MARKS: "Wrong number of Xs and Os",
+    tables.WRONG_STARTING_MARK: "Wrong starting mark",
+    tables.WRONG_NUMBER_OF_XS: "Wrong number of Xs",
+    tables.WRONG_NUMBER_OF_OS: "Wrong number of Os",
+}
+
+def validate_grid(grid: Grid) -> int:
+    # encoding the grid rejects anything but 9 cells of X, O or space, and its index is kept
+    return tables.encode(grid.cells)
 
 def validate_game_state(game_state: GameState) -> None:
-    validate_number_of_marks(game_state.grid)
-    validate_starting_mark(game_state.grid, game_state.starting_mark)
-    validate_winner(
-        game_state.grid, game_state.starting_mark, game_state.winner
-    )
+    # a single lookup replaces validate_number_of_marks, validate_starting_mark
+    # and validate_winner, which the legality table was built from
+    legality = tables.tables().legality[game_state.index]
+    if legality != tables.LEGAL:
+        raise InvalidGameState(LEGALITY_ERRORS[legality])
 
 def validate_number_of_marks(grid: Grid) -> None:
     if abs(grid.x_count - grid.o_count) > 1:
@@ -0,0 +1,107 @@
+"""64-bit Zobrist keys of m,n,k-game positions on boards of any size.
+
+Every cell has a random 64-bit number for each mark, and the key of a position is the XOR of
+the numbers of its marks, and of one more number when O started. XOR undoes itself, so a move
+updates the key with one XOR of the number of the mark it places, however big the board is,
+and a dict keyed on the key hashes a single int instead of the whole position. The numbers
+come from a fixed seed, so keys are the same in every run and can be saved, and the numbers
+of the first cells are the same for every board size.
+
+Distinct positions share a key about once in 2 ** 64 pairs, so a table of n positions expects
+n * n / 2 ** 65 collisions, about one in a billion for a table of 200,000 positions.
+
+Symmetric positions have the same value, so a table keyed on symmetric keys stores them once.
+A position has one key for each symmetry of the board, the key of the position the symmetry
+maps it to: 8 on square boards, 4 on the others. Each is updated by its own XOR, of the number
+of the cell the symmetry moves the mark to, and the least of them is the symmetric key.
+"""
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+
+SEED = 0x5A0B_215D
+
+# the numbers of X and of O on each cell, indexed by the mark's digit less one
+CROSS, NAUGHT = 0, 1
+
+# the number of O starting, drawn first so every board size shares it
+NAUGHT_STARTS = random.Random(SEED).getrandbits(64)
+
+@lru_cache(maxsize=None)
+def cell_keys(cells: int) -> tuple[tuple[int, int], ...]:
+    """Return the numbers of an X and of an O on every cell of a board."""
+    generator = random.Random(SEED)
+    # skip the number of O starting
+    generator.getrandbits(64)
+    return tuple((generator.getrandbits(64), generator.getrandbits(64)) for _ in range(cells))
+
+def board_key(cells: int, crosses: int, naughts: int, naught_starts: bool = False) -> int:
+    """Compute the key of a position from scratch, from the bitboards of its marks."""
+    keys = cell_keys(cells)
+    key = NAUGHT_STARTS if naught_starts else 0
+    for cell in range(cells):
+        if crosses >> cell & 1:
+            key ^= keys[cell][CROSS]
+        elif naughts >> cell & 1:
+            key ^= keys[cell][NAUGHT]
+    return key
+
+@lru_cache(maxsize=None)
+def symmetries(width: int, height: int) -> tuple[tuple[int, ...], ...]:
+    """Return the cell every cell is moved to by each symmetry of a board, the identity first."""
+    last_column, last_row = width - 1, height - 1
+    maps = [
+        lambda column, row: (column, row),
+        lambda column, row: (last_column - column, row),
+        lambda column, row: (column, last_row - row),
+        lambda column, row: (last_column - column, last_row - row),
+    ]
+    if width == height:
+        # the diagonal reflections and quarter turns only keep square boards in place
+        maps += [
+            lambda column, row: (row, column),
+            lambda column, row: (last_row - row, column),
+            lambda column, row: (row, last_column - column),
+            lambda column, row: (last_row - row, last_column - column),
+        ]
+    permutations = []
+    for mapping in maps:
+        permutation = []
+        for cell in range(width * height):
+            column, row = mapping(cell % width, cell // width)
+            permutation.append(row * width + column)
+        permutations.append(tuple(permutation))
+    return tuple(permutations)
+
+@lru_cache(maxsize=None)
+def symmetric_cell_keys(width: int, height: int) -> tuple[tuple[tuple[int, ...], tuple[int, ...]], ...]:
+    """Return, for every cell, the numbers of an X and of an O under each symmetry of a board."""
+    keys = cell_keys(width * height)
+    permutations = symmetries(width, height)
+    return tuple(
+        (
+            tuple(keys[permutation[cell]][CROSS] for permutation in permutations),
+            tuple(keys[permutation[cell]][NAUGHT] for permutation in permutations),
+        )
+        for cell in range(width * height)
+    )
+
+def symmetric_keys(
+    width: int, height: int, crosses: int, naughts: int, naught_starts: bool = False
+) -> tuple[int, ...]:
+    """Compute the key of a position under every symmetry of its board from scratch."""
+    keys = symmetric_cell_keys(width, height)
+    start = NAUGHT_STARTS if naught_starts else 0
+    result = [start] * len(symmetries(width, height))
+    for cell in range(width * height):
+        if crosses >> cell & 1:
+            result = [key ^ number for key, number in zip(result, keys[cell][CROSS])]
+        elif naughts >> cell & 1:
+            result = [key ^ number for key, number in zip(result, keys[cell][NAUGHT])]
+    return tuple(result)
+
+def play(keys: tuple[int, ...], numbers: tuple[int, ...]) -> tuple[int, ...]:
+    """Update the keys under every symmetry by the numbers of the mark a move places."""
+    return tuple(key ^ number for key, number in zip(keys, numbers))
@@ -0,0 +1,34 @@
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+import copy
+import pickle
+import unittest
+
+class GameStateTest(unittest.TestCase):
+    def test_pickle_and_copy_round_trip(self):
+        game_state = GameState(Grid("X   O    "), Mark.CROSS)
+        for copied in (
+            pickle.loads(pickle.dumps(game_state)),
+            copy.copy(game_state),
+            copy.deepcopy(game_state),
+        ):
+            assert copied == game_state
+            assert copied.grid.cells == "X   O    "
+            assert copied.starting_mark is Mark.CROSS
+            assert copied.current_mark is Mark.CROSS
+            assert copied.index == game_state.index
+            assert not copied.game_over
+
+    def test_copies_leave_out_the_cached_moves(self):
+        game_state = GameState(Grid(), Mark.NAUGHT)
+        moves = game_state.possible_moves
+        assert len(moves) == 9
+
+        # a pickle of the root alone is as small as one of a state that never searched
+        assert len(pickle.dumps(game_state)) == len(pickle.dumps(GameState(Grid(), Mark.NAUGHT)))
+        copied = copy.deepcopy(game_state)
+        assert copied._moves is None
+        assert [move.cell_index for move in copied.possible_moves] == list(range(9))
+        assert copied.possible_moves[0].after_state.grid.cells == "O        "
+
+if __name__ == '__main__':
+    unittest.main()
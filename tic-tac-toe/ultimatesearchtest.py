@@ -0,0 +1,64 @@
+from tic_tac_toe.logic import tables
+from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.ultimate import ANY_BOARD, UltimateState
+from tic_tac_toe.logic.ultimate_search import WIN_SCORE, UltimateSearch
+import unittest
+
+def position(boards: dict[int, str], active: int = ANY_BOARD) -> UltimateState:
+    # sub-boards not given are empty
+    return UltimateState(
+        tuple(tables.encode(boards.get(board, " " * 9)) for board in range(9)), active, Mark.CROSS
+    )
+
+# X has won the top left and top middle sub-boards and can win the top right one at its cell 2.
+# The middle right sub-board has one empty cell left, cell 2, which sends the player to the top
+# right sub-board, and filling it doesn't win it for O.
+WON_TOP = {
+    0: "XXXOO    ",
+    1: "XXXOO    ",
+    2: "XX OO    ",
+    5: "XO OXXXXO",
+    6: "OO       ",
+    7: "OO       ",
+}
+
+class UltimateSearchTest(unittest.TestCase):
+    def test_no_move_once_the_game_is_over(self):
+        game_state = position({0: "XXXOO    ", 1: "XXXOO    ", 2: "XXXOO    ", 3: "OO       "})
+        assert game_state.game_over
+        assert UltimateSearch(0.1).find_best_move_to(game_state) is None
+
+    def test_first_move_is_legal(self):
+        game_state = UltimateState()
+        cell = UltimateSearch(0.1).find_best_move_to(game_state)
+        assert cell in [move.cell_index for move in game_state.possible_moves]
+
+    def test_takes_an_immediate_win(self):
+        game_state = position(WON_TOP, active=2)
+        search = UltimateSearch(5.0)
+        assert search.find_best_move_to(game_state) == 2 * 9 + 2
+        # the win comes with the next move of the game
+        assert search.stats.score == WIN_SCORE - game_state.move_count - 1
+
+    def test_forces_a_win_in_three_moves(self):
+        # X sends O to the middle right sub-board, whose only move sends X to the top right one
+        game_state = position(WON_TOP, active=3)
+        search = UltimateSearch(5.0)
+        assert search.find_best_move_to(game_state) == 3 * 9 + 5
+        assert search.stats.score == WIN_SCORE - game_state.move_count - 3
+
+    def test_win_scores_kept_between_turns_match_a_fresh_search(self):
+        # from the bottom right sub-board X forces the win in five moves
+        game_state = position({**WON_TOP, 7: "O        ", 8: "     O   "}, active=8)
+        search = UltimateSearch(5.0)
+        search.find_best_move_to(game_state)
+        assert search.stats.score == WIN_SCORE - game_state.move_count - 5
+
+        # two moves later, the table still holds the scores of the first search
+        later = game_state.make_move_to(8 * 9 + 6).after_state.make_move_to(6 * 9 + 3).after_state
+        fresh = UltimateSearch(5.0)
+        assert search.find_best_move_to(later) == fresh.find_best_move_to(later) == 3 * 9 + 5
+        assert search.stats.score == fresh.stats.score == WIN_SCORE - later.move_count - 3
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+from tic_tac_toe.logic import zobrist
+from tic_tac_toe.logic.mnk import MNKState
+from tic_tac_toe.logic.models import Mark
+import random
+import sys
+import unittest
+
+BOARDS = [(7, 7), (10, 10), (7, 10)]
+
+def random_positions(width: int, height: int, games: int, generator: random.Random) -> list[MNKState]:
+    # k is the longest side, so random games rarely end before the board is full
+    positions = []
+    for _ in range(games):
+        game_state = MNKState(
+            width, height, max(width, height), starting_mark=generator.choice([Mark.CROSS, Mark.NAUGHT])
+        )
+        cells = list(range(game_state.cell_count))
+        generator.shuffle(cells)
+        for cell in cells[:generator.randrange(1, len(cells) + 1)]:
+            game_state = game_state.make_move_to(cell).after_state
+            positions.append(game_state)
+    return positions
+
+def mirror_images(game_state: MNKState) -> list[MNKState]:
+    images = []
+    for permutation in zobrist.symmetries(game_state.width, game_state.height):
+        crosses = naughts = 0
+        for cell in range(game_state.cell_count):
+            crosses |= (game_state.crosses >> cell & 1) << permutation[cell]
+            naughts |= (game_state.naughts >> cell & 1) << permutation[cell]
+        images.append(MNKState(
+            game_state.width, game_state.height, game_state.k, crosses, naughts, game_state.starting_mark
+        ))
+    return images
+
+class ZobristTest(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(0)
+        self.positions = {
+            (width, height): random_positions(width, height, 40, generator) for width, height in BOARDS
+        }
+
+    def test_played_keys_match_keys_computed_from_scratch(self):
+        for positions in self.positions.values():
+            for game_state in positions:
+                assert game_state.zobrist == zobrist.board_key(
+                    game_state.cell_count,
+                    game_state.crosses,
+                    game_state.naughts,
+                    game_state.starting_mark is Mark.NAUGHT,
+                )
+                # and from the constructor, which computes the key itself
+                assert game_state.zobrist == MNKState(
+                    game_state.width,
+                    game_state.height,
+                    game_state.k,
+                    game_state.crosses,
+                    game_state.naughts,
+                    game_state.starting_mark,
+                ).zobrist
+
+    def test_distinct_positions_have_distinct_keys(self):
+        for positions in self.positions.values():
+            keys: dict[int, tuple[int, int, Mark]] = {}
+            for game_state in positions:
+                position = (game_state.crosses, game_state.naughts, game_state.starting_mark)
+                assert keys.setdefault(game_state.zobrist, position) == position
+
+    def test_mirror_images_share_their_symmetric_key(self):
+        for (width, height), positions in self.positions.items():
+            for game_state in positions[::10]:
+                images = mirror_images(game_state)
+                assert len(images) == (8 if width == height else 4)
+                assert {image.symmetric_zobrist for image in images} == {game_state.symmetric_zobrist}
+
+    def test_distinct_symmetry_classes_have_distinct_keys(self):
+        for positions in self.positions.values():
+            keys: dict[int, tuple[int, int, Mark]] = {}
+            for game_state in positions:
+                # the least of the class's images stands for the class
+                position = min(
+                    (image.crosses, image.naughts, image.starting_mark) for image in mirror_images(game_state)
+                )
+                assert keys.setdefault(game_state.symmetric_zobrist, position) == position
+
+    def test_positions_hash_to_their_key(self):
+        # timing lookups is left to the console hashing benchmark
+        for positions in self.positions.values():
+            for game_state in positions:
+                # keys too big for a machine word are hashed again, like any int
+                key = game_state.zobrist
+                assert hash(game_state) == (key if key <= sys.maxsize else hash(key))
+
+if __name__ == '__main__':
+    unittest.main()